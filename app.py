@@ -1,28 +1,78 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+import contextlib
+import math
+from typing import TYPE_CHECKING
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette import status
 
 from src.api.auth.routes import auth_router
 from src.api.health.routes import health_router
+from src.api.responses import CompressionMiddleware
 from src.api.v1_2.action_creator.routes import action_creator_router_v1_2
 from src.api.v1_3.action_creator.routes import action_creator_router_v1_3
 from src.core.settings import current_settings
+from src.services.ades.submissions import submission_pipeline_factory
+from src.services.admission import AdmissionRejectedError, submission_admission_factory
+from src.services.circuit_breaker import CircuitOpenError, circuit_breaker_registry_factory
+from src.services.session_pool import client_session_pool_factory
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
 
 settings = current_settings()
 
 
+@contextlib.asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Upstream connections are pooled for the lifetime of the application
+    session_pool = client_session_pool_factory()
+    # Report upstream circuits and submission queues on the health endpoint from the start
+    circuit_breaker_registry_factory()
+    submission_admission_factory()
+    submission_pipeline = submission_pipeline_factory()
+    try:
+        yield
+    finally:
+        await submission_pipeline.close()
+        await session_pool.close()
+
+
+def upstream_unavailable_handler(_: Request, exc: Exception) -> JSONResponse:
+    retry_after = exc.retry_after if isinstance(exc, CircuitOpenError) else 0
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(retry_after))},
+    )
+
+
+def too_many_submissions_handler(_: Request, exc: Exception) -> JSONResponse:
+    retry_after = exc.retry_after if isinstance(exc, AdmissionRejectedError) else 0
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(retry_after))},
+    )
+
+
 def register_api_v1_2(app: FastAPI) -> FastAPI:
     sub_app = FastAPI(
         title="EOPro Action Creator API",
         version="1.2.0",
         description="API for Action Creator.",
+        default_response_class=ORJSONResponse,
         debug=settings.environment.lower() in {"local", "dev"},
         openapi_url=None if settings.environment.lower() == "prod" else "/openapi.json",
     )
     sub_app.include_router(health_router)
     sub_app.include_router(auth_router)
     sub_app.include_router(action_creator_router_v1_2)
+    sub_app.add_exception_handler(CircuitOpenError, upstream_unavailable_handler)
+    sub_app.add_exception_handler(AdmissionRejectedError, too_many_submissions_handler)
     app.mount("/api/v1.2", sub_app)
     return sub_app
 
@@ -32,12 +82,15 @@ def register_api_v1_3(app: FastAPI) -> FastAPI:
         title="EOPro Action Creator API",
         version="1.3.0",
         description="API for Action Creator.",
+        default_response_class=ORJSONResponse,
         debug=settings.environment.lower() in {"local", "dev"},
         openapi_url=None if settings.environment.lower() == "prod" else "/openapi.json",
     )
     sub_app.include_router(health_router)
     sub_app.include_router(auth_router)
     sub_app.include_router(action_creator_router_v1_3)
+    sub_app.add_exception_handler(CircuitOpenError, upstream_unavailable_handler)
+    sub_app.add_exception_handler(AdmissionRejectedError, too_many_submissions_handler)
     app.mount("/api/v1.3", sub_app)
     return sub_app
 
@@ -48,6 +101,7 @@ app = FastAPI(
     description="Mockup of an API for Action Creator.",
     docs_url=None,
     debug=True,
+    lifespan=lifespan,
 )
 
 app_v1_2 = register_api_v1_2(app)
@@ -56,6 +110,12 @@ app.mount("/api/latest", app_v1_3)
 app.mount("/api/v1.0", app_v1_3)
 app.mount("/api/v1.1", app_v1_3)
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression.minimum_size,
+    gzip_level=settings.compression.gzip_level,
+    brotli_quality=settings.compression.brotli_quality,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins="*",
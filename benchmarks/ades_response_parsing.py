@@ -0,0 +1,92 @@
+"""Compares the ADES response parsing modes on a large job list.
+
+Run with `python -m benchmarks.ades_response_parsing [--jobs 10000] [--repeat 20]`.
+
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from typing import TYPE_CHECKING, Any
+
+from src.services.ades.parsing import parse_collection
+from src.services.ades.schemas import JobList
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+JOB = {
+    "processID": "raster-calculate",
+    "type": "process",
+    "status": "successful",
+    "message": "ZOO-Kernel successfully run your service!",
+    "created": "2024-10-04T11:42:09.000Z",
+    "started": "2024-10-04T11:42:09.000Z",
+    "finished": "2024-10-04T11:53:58.000Z",
+    "updated": "2024-10-04T11:53:57.000Z",
+    "links": [
+        {
+            "title": "Status location",
+            "rel": "status",
+            "type": "application/json",
+            "href": "https://ades.test/workspace/ogc-api/jobs/{job_id}",
+        },
+        {
+            "title": "Result location",
+            "rel": "http://www.opengis.net/def/rel/ogc/1.0/results",
+            "type": "application/json",
+            "href": "https://ades.test/workspace/ogc-api/jobs/{job_id}/results",
+        },
+    ],
+}
+
+
+def job_list_payload(n_jobs: int) -> bytes:
+    jobs = [{**JOB, "jobID": f"job-{i}"} for i in range(n_jobs)]
+    return json.dumps({"jobs": jobs, "links": [], "numberTotal": n_jobs}).encode()
+
+
+def _read(job_list: JobList) -> Any:
+    return [(job.job_id, job.status, job.created) for job in job_list.jobs]
+
+
+def scenarios(body: bytes) -> dict[str, Callable[[], Any]]:
+    return {
+        "dict unpacking (previous)": lambda: _read(JobList(**json.loads(body))),
+        "validated": lambda: _read(parse_collection(JobList, body, "jobs")),
+        "trusted": lambda: _read(parse_collection(JobList, body, "jobs", trusted=True)),
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> list[float]:
+    fn()  # Warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=10_000, help="Number of jobs in the payload")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of measured runs per scenario")
+    args = parser.parse_args()
+
+    body = job_list_payload(args.jobs)
+    print(f"Job list with {args.jobs} jobs, {len(body) / 2**20:.1f} MiB, {args.repeat} runs per scenario\n")
+    print(f"{'scenario':<30}{'median ms':>12}{'min ms':>12}{'speed-up':>12}")
+    baseline = None
+    for name, fn in scenarios(body).items():
+        timings = measure(fn, args.repeat)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{name:<30}{median * 1000:>12.1f}{min(timings) * 1000:>12.1f}{baseline / median:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""Load tests the API against the simulated upstream services.
+
+Run with `python -m benchmarks.load_test [--concurrency 20] [--requests 200] [--output results.json]`.
+
+The API app is driven in-process through its ASGI interface, the upstream services are simulated by
+`benchmarks.simulator` in a separate process. Simulator latency and faults are configured with `SIMULATOR__`
+environment variables. Each scenario reports latency percentiles, throughput and the peak RSS of the process as JSON.
+Pass the results of a previous run as `--baseline` to fail on regressions.
+
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import importlib
+import json
+import logging
+import math
+import os
+import pathlib
+import resource
+import socket
+import sys
+import time
+from collections import Counter
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from benchmarks.simulator import token_url, upstream_env
+from src.api.v1_3.action_creator.schemas.presets import (
+    LAND_COVER_CHANGE_DETECTION_WORKFLOW_SPEC,
+    NDVI_WORKFLOW_SPEC,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from fastapi import FastAPI
+
+API_PATH = "/api/v1.3/action-creator"
+
+# Scenarios in the order they run - statuses are polled for the submitted workflows, batch delete runs last
+SCENARIOS = ("validation", "submission", "status", "history", "batch_delete")
+
+# Settings required by the API, but not used with the simulator. A single load test user submits far more workflows
+# than the admission control lets a real workspace submit
+_API_DEFAULTS = {
+    "ADMISSION__RATE": "1000",
+    "ADMISSION__BURST": "1000",
+    "ADMISSION__MAX_QUEUED_PER_WORKSPACE": "1000",
+    "EODH__USERNAME": "load-test",
+    "EODH__PASSWORD": "load-test",
+    "EODH__CLIENT_ID": "load-test",
+    "EODH__CEDA_STAC_CATALOG_PATH": "ceda",
+    "SENTINEL_HUB__CLIENT_ID": "load-test",
+    "SENTINEL_HUB__CLIENT_SECRET": "load-test",
+}
+
+
+def latency_percentiles(latencies: list[float]) -> dict[str, float]:
+    """Returns the nearest-rank percentiles, mean and maximum of the latencies in milliseconds."""
+    if not latencies:
+        return {}
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)] * 1000
+
+    return {
+        "p50": percentile(50),
+        "p95": percentile(95),
+        "p99": percentile(99),
+        "mean": sum(ordered) / len(ordered) * 1000,
+        "max": ordered[-1] * 1000,
+    }
+
+
+@dataclasses.dataclass
+class ScenarioResult:
+    name: str
+    duration: float
+    latencies: list[float]
+    status_codes: Counter[str]
+    errors: int
+    rejected: int
+    peak_rss_mb: float
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "requests": len(self.latencies),
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "status_codes": dict(self.status_codes),
+            "duration_s": self.duration,
+            "throughput_rps": len(self.latencies) / self.duration if self.duration else 0,
+            "latency_ms": latency_percentiles(self.latencies),
+            "peak_rss_mb": self.peak_rss_mb,
+        }
+
+
+def find_regressions(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    tolerance: float = 0.2,
+) -> list[str]:
+    """Compares scenario summaries with the baseline ones.
+
+    Args:
+        results: The scenario summaries of the current run.
+        baseline: The scenario summaries of the baseline run.
+        tolerance: The relative change tolerated before it is reported.
+
+    Returns:
+        Descriptions of p95 and p99 latencies, throughput and peak RSS worse than the baseline by more than the
+        tolerance.
+
+    """
+    regressions = []
+    for name, result in results.items():
+        if (base := baseline.get(name)) is None:
+            continue
+        checks = [
+            (f"{p} latency", result["latency_ms"].get(p), base["latency_ms"].get(p), 1) for p in ("p95", "p99")
+        ] + [
+            ("throughput", result["throughput_rps"], base["throughput_rps"], -1),
+            ("peak RSS", result["peak_rss_mb"], base["peak_rss_mb"], 1),
+        ]
+        for metric, value, base_value, direction in checks:
+            if not value or not base_value:
+                continue
+            change = (value - base_value) / base_value * direction
+            if change > tolerance:
+                regressions.append(f"{name}: {metric} {base_value:.2f} -> {value:.2f} ({change:+.0%} worse)")
+    return regressions
+
+
+def _is_error(status_code: str) -> bool:
+    # Transport errors are recorded by their name. Requests rejected by the admission control are reported apart
+    if not status_code.isdigit():
+        return True
+    code = int(status_code)
+    return httpx.codes.is_error(code) and code != httpx.codes.TOO_MANY_REQUESTS
+
+
+def _peak_rss_mb() -> float:
+    # Linux reports the maximum resident set size in kilobytes, macOS in bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+class LoadTest:
+    """Sends the requests of each scenario to the API, with at most `concurrency` requests in flight.
+
+    Args:
+        client: The client of the API.
+        token: The access token of the load test user.
+        concurrency: The number of concurrent requests.
+        requests: The number of requests per scenario.
+
+    """
+
+    def __init__(self, client: httpx.AsyncClient, token: str, concurrency: int, requests: int) -> None:
+        self.client = client
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.concurrency = concurrency
+        self.requests = requests
+        self.submission_ids: list[str] = []
+
+    def _validation(self, _: int) -> Awaitable[httpx.Response]:
+        return self.client.post(f"{API_PATH}/workflow-validation", json=NDVI_WORKFLOW_SPEC, headers=self.headers)
+
+    async def _submission(self, _: int) -> httpx.Response:
+        response = await self.client.post(
+            f"{API_PATH}/workflow-submissions",
+            json=LAND_COVER_CHANGE_DETECTION_WORKFLOW_SPEC,
+            headers=self.headers,
+        )
+        if response.status_code == httpx.codes.ACCEPTED:
+            self.submission_ids.append(response.json()["job_id"])
+        return response
+
+    def _status(self, i: int) -> Awaitable[httpx.Response]:
+        if not self.submission_ids:
+            msg = "Status polling needs the submission scenario to run first"
+            raise RuntimeError(msg)
+        submission_id = self.submission_ids[i % len(self.submission_ids)]
+        return self.client.get(f"{API_PATH}/workflow-submissions/{submission_id}", headers=self.headers)
+
+    def _history(self, i: int) -> Awaitable[httpx.Response]:
+        return self.client.get(
+            f"{API_PATH}/workflow-submissions",
+            params={"page": i % 20 + 1, "per_page": 25, "order_direction": "desc"},
+            headers=self.headers,
+        )
+
+    def _batch_delete(self, _: int) -> Awaitable[httpx.Response]:
+        return self.client.request(
+            "DELETE",
+            f"{API_PATH}/workflow-submissions",
+            json={"remove_statuses": ["failed"], "max_jobs_to_process": 100},
+            headers=self.headers,
+        )
+
+    async def run(self, scenario: str) -> ScenarioResult:
+        send: Callable[[int], Awaitable[httpx.Response]] = getattr(self, f"_{scenario}")
+        latencies: list[float] = []
+        status_codes: Counter[str] = Counter()
+        pending = iter(range(self.requests))
+
+        async def worker() -> None:
+            for i in pending:
+                t0 = time.perf_counter()
+                try:
+                    status_code = str((await send(i)).status_code)
+                except httpx.HTTPError as ex:
+                    status_code = type(ex).__name__
+                latencies.append(time.perf_counter() - t0)
+                status_codes[status_code] += 1
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return ScenarioResult(
+            name=scenario,
+            duration=time.perf_counter() - t0,
+            latencies=latencies,
+            status_codes=status_codes,
+            errors=sum(n for code, n in status_codes.items() if _is_error(code)),
+            rejected=status_codes[str(httpx.codes.TOO_MANY_REQUESTS)],
+            peak_rss_mb=_peak_rss_mb(),
+        )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@contextlib.asynccontextmanager
+async def _simulator(url: str | None) -> AsyncIterator[str]:
+    """Yields the URL of the simulator, started in a subprocess unless the URL of a running one is provided."""
+    if url is not None:
+        yield url
+        return
+
+    port = _free_port()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "benchmarks.simulator",
+        "--port",
+        str(port),
+        stdout=asyncio.subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient() as client:
+            for _ in range(100):
+                with contextlib.suppress(httpx.TransportError):
+                    await client.get(f"{url}/_simulator/stats")
+                    break
+                await asyncio.sleep(0.1)
+            else:
+                msg = "The simulator did not start"
+                raise RuntimeError(msg)
+        yield url
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+def _load_app(simulator_url: str) -> FastAPI:
+    # Settings are read when the app is imported
+    os.environ.update(upstream_env(simulator_url))
+    for name, value in _API_DEFAULTS.items():
+        os.environ.setdefault(name, value)
+    return importlib.import_module("app").app  # type: ignore[no-any-return]
+
+
+async def run_load_test(
+    scenarios: list[str],
+    *,
+    concurrency: int,
+    requests: int,
+    simulator_url: str | None = None,
+) -> dict[str, Any]:
+    """Runs the scenarios against the API and returns the run report."""
+    started_at = datetime.now(UTC)
+    async with _simulator(simulator_url) as url:
+        app = _load_app(url)
+        async with httpx.AsyncClient() as client:
+            response = await client.post(token_url(url), data={"grant_type": "password", "username": "load-test"})
+            token = response.raise_for_status().json()["access_token"]
+
+        results: dict[str, dict[str, Any]] = {}
+        transport = httpx.ASGITransport(app=app)
+        async with (
+            app.router.lifespan_context(app),
+            httpx.AsyncClient(transport=transport, base_url="http://api", timeout=120) as client,
+        ):
+            load_test = LoadTest(client, token, concurrency, requests)
+            for scenario in SCENARIOS:
+                if scenario in scenarios:
+                    results[scenario] = (await load_test.run(scenario)).summary()
+
+        async with httpx.AsyncClient() as client:
+            simulator_stats = (await client.get(f"{url}/_simulator/stats")).json()
+
+    return {
+        "started_at": started_at.isoformat(),
+        "python": sys.version.split()[0],
+        "concurrency": concurrency,
+        "requests": requests,
+        "results": results,
+        "peak_rss_mb": _peak_rss_mb(),
+        "simulator": simulator_stats["upstreams"],
+    }
+
+
+def _print_summary(report: dict[str, Any]) -> None:
+    columns = ("requests", "errors", "rejected", "rps", "p50 ms", "p95 ms", "p99 ms", "RSS MB")
+    print(f"{'scenario':<14}" + "".join(f"{column:>9}" for column in columns), file=sys.stderr)
+    for name, result in report["results"].items():
+        latency = result["latency_ms"]
+        print(
+            f"{name:<14}{result['requests']:>9}{result['errors']:>9}{result['rejected']:>9}"
+            f"{result['throughput_rps']:>9.1f}"
+            f"{latency.get('p50', 0):>9.1f}{latency.get('p95', 0):>9.1f}{latency.get('p99', 0):>9.1f}"
+            f"{result['peak_rss_mb']:>9.1f}",
+            file=sys.stderr,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200, help="Number of requests per scenario")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scenario to run, all by default")
+    parser.add_argument("--simulator-url", help="URL of a running simulator, a new one is started by default")
+    parser.add_argument("--output", help="File to write the JSON report to, stdout by default")
+    parser.add_argument("--baseline", help="JSON report of a previous run to compare the results with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Relative regression tolerated")
+    parser.add_argument("--verbose", action="store_true", help="Keep the API logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    report = asyncio.run(
+        run_load_test(
+            args.scenario or list(SCENARIOS),
+            concurrency=args.concurrency,
+            requests=args.requests,
+            simulator_url=args.simulator_url,
+        )
+    )
+    if args.baseline:
+        baseline = json.loads(pathlib.Path(args.baseline).read_text(encoding="utf-8"))
+        report["regressions"] = find_regressions(report["results"], baseline["results"], args.tolerance)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        pathlib.Path(args.output).write_text(output, encoding="utf-8")
+    else:
+        print(output)
+    _print_summary(report)
+
+    for regression in report.get("regressions", []):
+        print(f"Regression: {regression}", file=sys.stderr)
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from benchmarks.simulator.app import Simulator, create_app, token_url, upstream_env
+from benchmarks.simulator.settings import DatasetSettings, SimulatorSettings, UpstreamProfile
+from benchmarks.simulator.tokens import TokenIssuer
+
+__all__ = [
+    "DatasetSettings",
+    "Simulator",
+    "SimulatorSettings",
+    "TokenIssuer",
+    "UpstreamProfile",
+    "create_app",
+    "token_url",
+    "upstream_env",
+]
@@ -0,0 +1,31 @@
+"""Serves the simulated upstream services.
+
+Run with `python -m benchmarks.simulator [--host 127.0.0.1] [--port 8001]` and start the API with the printed
+environment variables. Latency, faults and dataset sizes are configured with `SIMULATOR__` environment variables, e.g.
+`SIMULATOR__ADES__ERROR_RATE=0.05 SIMULATOR__STAC__THROTTLE_INTERVAL=30 SIMULATOR__DATASET__JOBS_PER_WORKSPACE=10000`.
+
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import uvicorn
+
+from benchmarks.simulator.app import create_app, upstream_env
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--realm", default="eodhp")
+    args = parser.parse_args()
+
+    for name, value in upstream_env(f"http://{args.host}:{args.port}", args.realm).items():
+        print(f"{name}={value}")
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Annotated, Any
+
+import jwt.exceptions
+import orjson
+import yaml
+from fastapi import FastAPI, Form, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette import status
+
+from benchmarks.simulator.faults import FaultInjectionMiddleware, FaultInjector
+from benchmarks.simulator.settings import SimulatorSettings
+from benchmarks.simulator.tokens import TokenIssuer
+from benchmarks.simulator.upstreams import ADESWorkspace, STACCatalog
+
+# Path prefixes of the simulated upstreams
+KEYCLOAK_PREFIX = "/keycloak"
+WORKSPACES_PREFIX = "/workspaces"
+ADES_PREFIX = "/ades"
+STAC_PREFIX = "/stac"
+
+_OIDC_PATH = KEYCLOAK_PREFIX + "/realms/{realm}/protocol/openid-connect"
+_PROCESSES_PATH = ADES_PREFIX + "/{workspace}/ogc-api/processes"
+_JOBS_PATH = ADES_PREFIX + "/{workspace}/ogc-api/jobs"
+
+
+def token_url(base_url: str, realm: str = "eodhp") -> str:
+    """Returns the URL of the simulated Keycloak token endpoint."""
+    return base_url.rstrip("/") + _OIDC_PATH.format(realm=realm) + "/token"
+
+
+def upstream_env(base_url: str, realm: str = "eodhp") -> dict[str, str]:
+    """Returns the API environment variables pointing every upstream at the simulator served on `base_url`."""
+    base_url = base_url.rstrip("/")
+    return {
+        "EODH__BASE_URL": base_url,
+        "EODH__REALM": realm,
+        "EODH__STAC_API_ENDPOINT": base_url + STAC_PREFIX,
+        "EODH__WORKSPACE_SERVICES_ENDPOINT": base_url + WORKSPACES_PREFIX,
+        "ADES__URL": base_url + ADES_PREFIX,
+        "SENTINEL_HUB__STAC_API_ENDPOINT": base_url + STAC_PREFIX + "/sentinel-hub",
+        "SENTINEL_HUB__TOKEN_URL": token_url(base_url, realm),
+    }
+
+
+def _forbidden() -> JSONResponse:
+    # ADES answers requests for unknown jobs and processes with 403
+    return JSONResponse(status_code=status.HTTP_403_FORBIDDEN, content={"detail": "Forbidden"})
+
+
+def _expiry(seconds: int) -> str:
+    return (datetime.now(UTC) + timedelta(seconds=seconds)).isoformat()
+
+
+class Simulator:
+    """In-memory state and request handlers of the simulated upstream services.
+
+    Args:
+        settings: The simulator settings.
+
+    """
+
+    def __init__(self, settings: SimulatorSettings) -> None:
+        self.settings = settings
+        self._rng = random.Random(settings.dataset.seed)  # noqa: S311
+        self.issuer = TokenIssuer(settings.dataset.token_lifetime, settings.dataset.refresh_token_lifetime)
+        self.catalog = STACCatalog(settings.dataset, self._rng)
+        self.workspaces: dict[str, ADESWorkspace] = {}
+        self.injectors = {
+            prefix: FaultInjector(profile, random.Random(self._rng.random()))  # noqa: S311
+            for prefix, profile in (
+                (KEYCLOAK_PREFIX, settings.keycloak),
+                (WORKSPACES_PREFIX, settings.workspaces),
+                (ADES_PREFIX, settings.ades),
+                (STAC_PREFIX, settings.stac),
+            )
+        }
+
+    def _claims(self, request: Request) -> dict[str, Any]:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        try:
+            if scheme.lower() != "bearer":
+                raise jwt.exceptions.InvalidTokenError
+            return self.issuer.verify(token)
+        except jwt.exceptions.PyJWTError as ex:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from ex
+
+    def _workspace(self, request: Request, workspace: str) -> ADESWorkspace:
+        self._claims(request)
+        if (state := self.workspaces.get(workspace)) is None:
+            url = f"{str(request.base_url).rstrip('/')}{ADES_PREFIX}/{workspace}/ogc-api"
+            state = self.workspaces[workspace] = ADESWorkspace.generate(url, self.settings.dataset, self._rng)
+        return state
+
+    # Keycloak
+
+    def certs(self, realm: str) -> Any:  # noqa: ARG002
+        return self.issuer.jwks()
+
+    def token(
+        self,
+        realm: str,  # noqa: ARG002
+        grant_type: Annotated[str, Form()],
+        client_id: Annotated[str, Form()] = "simulator",
+        username: Annotated[str | None, Form()] = None,
+        refresh_token: Annotated[str | None, Form()] = None,
+    ) -> Any:
+        match grant_type:
+            case "password" if username:
+                return self.issuer.token_response(username, client_id)
+            case "client_credentials":
+                return self.issuer.token_response(client_id, client_id, workspaces=[])
+            case "refresh_token" if refresh_token:
+                try:
+                    claims = self.issuer.verify(refresh_token)
+                except jwt.exceptions.PyJWTError as ex:
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_grant") from ex
+                return self.issuer.token_response(claims["sub"], claims.get("azp", client_id))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="unsupported_grant_type")
+
+    def introspect(self, realm: str, token: Annotated[str, Form()]) -> Any:  # noqa: ARG002
+        try:
+            return {**self.issuer.verify(token), "active": True}
+        except jwt.exceptions.PyJWTError:
+            return {"active": False}
+
+    # Workspace services
+
+    def create_session(self, request: Request, workspace: str, user: str) -> Any:
+        claims = self._claims(request)
+        username = claims.get("preferred_username", claims["sub"]) if user == "me" else user
+        response = self.issuer.token_response(username, claims.get("azp", "simulator"), workspaces=[workspace])
+        return {
+            "access": response["access_token"],
+            "accessExpiry": _expiry(response["expires_in"]),
+            "refresh": response["refresh_token"],
+            "refreshExpiry": _expiry(response["refresh_expires_in"]),
+            "scope": "offline_access openid",
+        }
+
+    # ADES
+
+    def list_processes(self, request: Request, workspace: str) -> Any:
+        state = self._workspace(request, workspace)
+        return {"processes": list(state.processes.values()), "links": [{"href": f"{state.url}/processes"}]}
+
+    async def register_process(self, request: Request, workspace: str) -> Any:
+        state = self._workspace(request, workspace)
+        try:
+            cwl = yaml.safe_load(await request.body())
+            process_id = next(obj["id"] for obj in cwl["$graph"] if obj["class"] == "Workflow")
+        except (yaml.YAMLError, KeyError, TypeError, StopIteration) as ex:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid CWL") from ex
+        if process_id in state.processes:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Process already exists")
+        return ORJSONResponse(state.add_process(process_id), status_code=status.HTTP_201_CREATED)
+
+    def get_process(self, request: Request, workspace: str, process_id: str) -> Any:
+        if (summary := self._workspace(request, workspace).processes.get(process_id)) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Process not found")
+        return {**summary, "inputs": {}, "outputs": {}}
+
+    def unregister_process(self, request: Request, workspace: str, process_id: str) -> Any:
+        if self._workspace(request, workspace).processes.pop(process_id, None) is None:
+            return _forbidden()
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    def execute_process(self, request: Request, workspace: str, process_id: str) -> Any:
+        state = self._workspace(request, workspace)
+        if process_id not in state.processes:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Process not found")
+        return ORJSONResponse(state.execute(process_id), status_code=status.HTTP_201_CREATED)
+
+    def list_jobs(self, request: Request, workspace: str, limit: int = 100, skip: int = 0) -> Any:
+        state = self._workspace(request, workspace)
+        return {
+            "jobs": state.list_jobs(limit, skip),
+            "links": [{"href": f"{state.url}/jobs?limit={limit}&skip={skip}", "rel": "self"}],
+            "numberTotal": len(state.jobs),
+        }
+
+    def get_job(self, request: Request, workspace: str, job_id: str) -> Any:
+        return self._workspace(request, workspace).job(job_id) or _forbidden()
+
+    def get_job_results(self, request: Request, workspace: str, job_id: str) -> Any:
+        if (job := self._workspace(request, workspace).job(job_id)) is None:
+            return _forbidden()
+        if job["status"] != "successful":
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Results not ready")
+        return {"StacCatalogUri": f"s3://workspaces/{workspace}/processing-results/{job_id}/catalog.json"}
+
+    def dismiss_job(self, request: Request, workspace: str, job_id: str) -> Any:
+        return self._workspace(request, workspace).remove_job(job_id) or _forbidden()
+
+    # STAC
+
+    async def search(self, request: Request, path: str) -> Any:  # noqa: ARG002
+        body = await request.body()
+        return self.catalog.search(str(request.url), orjson.loads(body) if body else {})
+
+    def stats(self) -> Any:
+        return {
+            "upstreams": {prefix: dict(injector.counts) for prefix, injector in self.injectors.items()},
+            "workspaces": {name: len(state.jobs) for name, state in self.workspaces.items()},
+        }
+
+
+def create_app(settings: SimulatorSettings | None = None) -> FastAPI:
+    """Creates the simulator of the upstream services used by the API.
+
+    The simulator serves the Keycloak token and JWKS endpoints, workspace session tokens, the ADES OGC API processes
+    and jobs endpoints, and STAC searches, each under its own path prefix and each with its own latency and fault
+    profile. Request and fault counts are reported on `/_simulator/stats`.
+
+    Args:
+        settings: The simulator settings, read from the environment if not provided.
+
+    Returns:
+        The simulator application, its `Simulator` is available as `app.state.simulator`.
+
+    """
+    simulator = Simulator(settings or SimulatorSettings())
+    app = FastAPI(title="EODH upstream simulator", default_response_class=ORJSONResponse, openapi_url=None)
+    app.add_middleware(FaultInjectionMiddleware, injectors=simulator.injectors)
+    app.state.simulator = simulator
+
+    routes = (
+        ("GET", _OIDC_PATH + "/certs", simulator.certs),
+        ("POST", _OIDC_PATH + "/token", simulator.token),
+        ("POST", _OIDC_PATH + "/token/introspect", simulator.introspect),
+        ("POST", WORKSPACES_PREFIX + "/{workspace}/{user}/sessions", simulator.create_session),
+        ("GET", _PROCESSES_PATH, simulator.list_processes),
+        ("POST", _PROCESSES_PATH, simulator.register_process),
+        ("GET", _PROCESSES_PATH + "/{process_id}", simulator.get_process),
+        ("DELETE", _PROCESSES_PATH + "/{process_id}", simulator.unregister_process),
+        ("POST", _PROCESSES_PATH + "/{process_id}/execution", simulator.execute_process),
+        ("GET", _JOBS_PATH, simulator.list_jobs),
+        ("GET", _JOBS_PATH + "/{job_id}", simulator.get_job),
+        ("GET", _JOBS_PATH + "/{job_id}/results", simulator.get_job_results),
+        ("DELETE", _JOBS_PATH + "/{job_id}", simulator.dismiss_job),
+        ("POST", STAC_PREFIX + "/{path:path}/search", simulator.search),
+        ("GET", "/_simulator/stats", simulator.stats),
+    )
+    for method, path, endpoint in routes:
+        app.add_api_route(path, endpoint, methods=[method])
+    return app
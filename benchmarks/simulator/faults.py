@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import orjson
+
+if TYPE_CHECKING:
+    import random
+    from collections.abc import Callable
+
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+    from benchmarks.simulator.settings import UpstreamProfile
+
+
+class FaultInjector:
+    """Decides the latency and the fault of each request to a simulated upstream.
+
+    Args:
+        profile: The latency and fault profile of the upstream.
+        rng: The random number generator, seeded for reproducible runs.
+        timer: The clock the throttling bursts are scheduled with.
+
+    """
+
+    def __init__(
+        self,
+        profile: UpstreamProfile,
+        rng: random.Random,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.profile = profile
+        self._rng = rng
+        self._timer = timer
+        self._started_at = timer()
+        self.counts: Counter[str] = Counter()
+
+    def latency(self) -> float:
+        p = self.profile
+        match p.latency_distribution:
+            case "constant":
+                value = p.latency
+            case "uniform":
+                value = self._rng.uniform(p.latency * (1 - p.latency_spread), p.latency * (1 + p.latency_spread))
+            case "exponential":
+                # Median of the exponential distribution is ln(2) / lambda
+                value = self._rng.expovariate(math.log(2) / p.latency) if p.latency > 0 else 0
+            case "lognormal":
+                value = self._rng.lognormvariate(math.log(p.latency), p.latency_spread) if p.latency > 0 else 0
+        return min(max(value, 0), p.max_latency)
+
+    def throttled(self) -> bool:
+        p = self.profile
+        return (
+            p.throttle_interval > 0 and (self._timer() - self._started_at) % p.throttle_interval < p.throttle_duration
+        )
+
+    def stalled(self) -> bool:
+        return self._rng.random() < self.profile.stall_rate
+
+    def error_status(self) -> int | None:
+        if self._rng.random() < self.profile.error_rate:
+            return self._rng.choice(self.profile.error_statuses)
+        return None
+
+
+class FaultInjectionMiddleware:
+    """Delays the requests to simulated upstreams and fails some of them, as configured per upstream.
+
+    Args:
+        app: The wrapped application.
+        injectors: The fault injectors keyed by the path prefix of the upstream.
+
+    """
+
+    def __init__(self, app: ASGIApp, injectors: dict[str, FaultInjector]) -> None:
+        self.app = app
+        self.injectors = injectors
+
+    def _injector(self, path: str) -> FaultInjector | None:
+        return next((i for prefix, i in self.injectors.items() if path.startswith(prefix)), None)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (injector := self._injector(scope["path"])) is None:
+            await self.app(scope, receive, send)
+            return
+
+        injector.counts["requests"] += 1
+        if injector.throttled():
+            injector.counts["throttled"] += 1
+            await _send_error(
+                send,
+                429,
+                "Too many requests",
+                headers=((b"retry-after", str(injector.profile.throttle_retry_after).encode()),),
+            )
+            return
+
+        delay = injector.latency()
+        if injector.stalled():
+            injector.counts["stalled"] += 1
+            delay = injector.profile.stall_duration
+        await asyncio.sleep(delay)
+
+        if (error_status := injector.error_status()) is not None:
+            injector.counts["errors"] += 1
+            await _send_error(send, error_status, "Injected failure")
+            return
+        await self.app(scope, receive, send)
+
+
+async def _send_error(send: Send, status_code: int, detail: str, headers: tuple[tuple[bytes, bytes], ...] = ()) -> None:
+    body = orjson.dumps({"detail": detail})
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
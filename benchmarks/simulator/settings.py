@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class UpstreamProfile(BaseModel):
+    """Latency and faults injected into the responses of a single simulated upstream.
+
+    Latency is drawn from `latency_distribution` around the `latency` median, `latency_spread` being the log-normal
+    sigma or the relative half-width of the uniform distribution. Throttling bursts answer every request with 429 for
+    `throttle_duration` seconds out of every `throttle_interval` seconds.
+
+    """
+
+    latency: float = 0.05
+    latency_distribution: Literal["constant", "uniform", "exponential", "lognormal"] = "lognormal"
+    latency_spread: float = 0.5
+    max_latency: float = 30
+    error_rate: float = 0
+    error_statuses: list[int] = [500, 502, 503]
+    stall_rate: float = 0
+    stall_duration: float = 60
+    throttle_interval: float = 0
+    throttle_duration: float = 5
+    throttle_retry_after: int = 1
+
+
+class DatasetSettings(BaseModel):
+    seed: int = 0
+    jobs_per_workspace: int = 10_000
+    processes_per_workspace: int = 50
+    stac_items: int = 10_000
+    stac_max_page_size: int = 10_000
+    stac_assets_per_item: int = 10
+    job_start_delay: float = 5
+    job_duration: float = 60
+    token_lifetime: int = 300
+    refresh_token_lifetime: int = 1_800
+
+
+class SimulatorSettings(BaseSettings):
+    """Simulator settings, read from `SIMULATOR__` prefixed environment variables, e.g. `SIMULATOR__ADES__LATENCY`."""
+
+    ades: UpstreamProfile = UpstreamProfile()
+    stac: UpstreamProfile = UpstreamProfile(latency=0.2)
+    workspaces: UpstreamProfile = UpstreamProfile()
+    keycloak: UpstreamProfile = UpstreamProfile(latency=0.02)
+    dataset: DatasetSettings = DatasetSettings()
+
+    model_config = SettingsConfigDict(env_prefix="SIMULATOR__", env_nested_delimiter="__", extra="ignore")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+import uuid
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+# Audiences accepted by the API when verifying access tokens
+AUDIENCE = ["oauth2-proxy-workspaces", "oauth2-proxy", "account"]
+
+
+class TokenIssuer:
+    """Issues RS256 signed tokens and publishes the public key as a JWKS, like the Keycloak realm the API trusts.
+
+    A new key pair is generated for every issuer, tokens do not survive simulator restarts.
+
+    Args:
+        lifetime: The lifetime of access tokens in seconds.
+        refresh_lifetime: The lifetime of refresh tokens in seconds.
+
+    """
+
+    def __init__(self, lifetime: int = 300, refresh_lifetime: int = 1_800) -> None:
+        self.lifetime = lifetime
+        self.refresh_lifetime = refresh_lifetime
+        self.kid = uuid.uuid4().hex
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def jwks(self) -> dict[str, Any]:
+        jwk = RSAAlgorithm.to_jwk(self._private_key.public_key(), as_dict=True)
+        return {"keys": [{**jwk, "kid": self.kid, "use": "sig", "alg": "RS256"}]}
+
+    def issue(self, subject: str, *, lifetime: int | None = None, **claims: Any) -> str:
+        """Returns a token for the subject, e.g. the user name, with the extra claims."""
+        now = int(time.time())
+        payload = {
+            "sub": subject,
+            "iat": now,
+            "exp": now + (self.lifetime if lifetime is None else lifetime),
+            "jti": uuid.uuid4().hex,
+            "aud": AUDIENCE,
+            **claims,
+        }
+        return jwt.encode(payload, self._private_key, algorithm="RS256", headers={"kid": self.kid})
+
+    def user_token(self, username: str, client_id: str = "simulator", workspaces: list[str] | None = None) -> str:
+        """Returns an access token for the user, the user's own workspace being the default."""
+        return self.issue(
+            username,
+            preferred_username=username,
+            workspaces=workspaces if workspaces is not None else [username],
+            azp=client_id,
+            typ="Bearer",
+            scope="openid",
+        )
+
+    def token_response(self, username: str, client_id: str, workspaces: list[str] | None = None) -> dict[str, Any]:
+        """Returns the response of the OpenID Connect token endpoint."""
+        return {
+            "access_token": self.user_token(username, client_id, workspaces),
+            "expires_in": self.lifetime,
+            "refresh_token": self.issue(username, lifetime=self.refresh_lifetime, azp=client_id, typ="Refresh"),
+            "refresh_expires_in": self.refresh_lifetime,
+            "token_type": "Bearer",
+            "not-before-policy": 0,
+            "session_state": str(uuid.uuid4()),
+            "scope": "openid",
+        }
+
+    def verify(self, token: str) -> dict[str, Any]:
+        """Returns the claims of a token issued by this issuer.
+
+        Raises:
+            jwt.exceptions.PyJWTError: If the token is invalid or expired.
+
+        """
+        return jwt.decode(token, self._private_key.public_key(), algorithms=["RS256"], audience=AUDIENCE)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import dataclasses
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import random
+
+    from benchmarks.simulator.settings import DatasetSettings
+
+# Statuses of the synthetic job history and their weights
+_HISTORY_STATUSES = ("successful", "failed", "dismissed")
+_HISTORY_WEIGHTS = (0.8, 0.15, 0.05)
+
+_EPOCH = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat().replace("+00:00", "Z")
+
+
+@dataclasses.dataclass
+class ADESWorkspace:
+    """Processes and jobs of a single simulated ADES workspace.
+
+    The workspace starts with a synthetic job history, newest jobs first. Jobs created by executing processes move
+    from `accepted` to `running` after `job_start_delay` seconds and succeed after `job_duration` seconds.
+
+    """
+
+    url: str
+    config: DatasetSettings
+    processes: dict[str, dict[str, Any]] = dataclasses.field(default_factory=dict)
+    jobs: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+    _jobs_by_id: dict[str, dict[str, Any]] = dataclasses.field(default_factory=dict)
+    _started_at: dict[str, float] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def generate(cls, url: str, config: DatasetSettings, rng: random.Random) -> ADESWorkspace:
+        workspace = cls(url, config)
+        for i in range(config.processes_per_workspace):
+            workspace.add_process(f"workflow-{i}")
+
+        process_ids = list(workspace.processes) or ["workflow"]
+        statuses = rng.choices(_HISTORY_STATUSES, _HISTORY_WEIGHTS, k=config.jobs_per_workspace)
+        for i, job_status in enumerate(statuses):
+            created = _EPOCH - timedelta(minutes=10 * i)
+            job = workspace._job(process_ids[i % len(process_ids)], job_status, created)
+            job["finished"] = job["updated"] = _iso(created + timedelta(seconds=rng.randint(30, 3_600)))
+            workspace.jobs.append(job)
+            workspace._jobs_by_id[job["jobID"]] = job
+        return workspace
+
+    def add_process(self, process_id: str) -> dict[str, Any]:
+        self.processes[process_id] = summary = {
+            "id": process_id,
+            "title": f"Simulated {process_id}",
+            "description": "Simulated workflow",
+            "version": "1.0.0",
+            "jobControlOptions": ["async-execute", "dismiss"],
+            "outputTransmission": ["value", "reference"],
+            "links": [
+                {
+                    "href": f"{self.url}/processes/{process_id}",
+                    "rel": "self",
+                    "type": "application/json",
+                    "title": "Process Description",
+                }
+            ],
+        }
+        return summary
+
+    def _job(self, process_id: str, job_status: str, created: datetime) -> dict[str, Any]:
+        job_id = str(uuid.uuid4())
+        return {
+            "processID": process_id,
+            "type": "process",
+            "jobID": job_id,
+            "status": job_status,
+            "message": f"Simulated job is {job_status}",
+            "created": _iso(created),
+            "started": _iso(created),
+            "finished": None,
+            "updated": _iso(created),
+            "progress": 100 if job_status != "accepted" else 0,
+            "links": [
+                {
+                    "href": f"{self.url}/jobs/{job_id}",
+                    "rel": "self",
+                    "type": "application/json",
+                    "title": "get Status",
+                }
+            ],
+        }
+
+    def execute(self, process_id: str) -> dict[str, Any]:
+        job = self._job(process_id, "accepted", datetime.now(UTC))
+        self.jobs.insert(0, job)
+        self._jobs_by_id[job["jobID"]] = job
+        self._started_at[job["jobID"]] = time.monotonic()
+        return job
+
+    def job(self, job_id: str) -> dict[str, Any] | None:
+        if (job := self._jobs_by_id.get(job_id)) is not None:
+            self._advance(job)
+        return job
+
+    def list_jobs(self, limit: int, skip: int) -> list[dict[str, Any]]:
+        page = self.jobs[skip : skip + limit]
+        for job in page:
+            self._advance(job)
+        return page
+
+    def remove_job(self, job_id: str) -> dict[str, Any] | None:
+        if (job := self._jobs_by_id.pop(job_id, None)) is None:
+            return None
+        self.jobs.remove(job)
+        self._started_at.pop(job_id, None)
+        return {**job, "status": "dismissed", "message": "Job dismissed"}
+
+    def _advance(self, job: dict[str, Any]) -> None:
+        if (started_at := self._started_at.get(job["jobID"])) is None:
+            return
+        elapsed = time.monotonic() - started_at
+        now = _iso(datetime.now(UTC))
+        if elapsed >= self.config.job_duration:
+            job.update(status="successful", progress=100, finished=now, updated=now)
+            del self._started_at[job["jobID"]]
+        elif elapsed >= self.config.job_start_delay:
+            job.update(status="running", progress=int(100 * elapsed / self.config.job_duration), updated=now)
+
+
+class STACCatalog:
+    """Synthetic STAC items, shared by all simulated collections and generated once.
+
+    Args:
+        config: The dataset settings.
+        rng: The random number generator, seeded for reproducible datasets.
+
+    """
+
+    def __init__(self, config: DatasetSettings, rng: random.Random) -> None:
+        self.config = config
+        self._rng = rng
+        self._items: list[dict[str, Any]] | None = None
+
+    @property
+    def items(self) -> list[dict[str, Any]]:
+        if self._items is None:
+            self._items = [self._item(i) for i in range(self.config.stac_items)]
+        return self._items
+
+    def _item(self, i: int) -> dict[str, Any]:
+        lon, lat = self._rng.uniform(-10, 2), self._rng.uniform(49, 59)
+        bbox = [lon, lat, lon + 1, lat + 1]
+        item_id = f"simulated-item-{i}"
+        return {
+            "type": "Feature",
+            "stac_version": "1.0.0",
+            "id": item_id,
+            "collection": "simulated",
+            "bbox": bbox,
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[[lon, lat], [lon + 1, lat], [lon + 1, lat + 1], [lon, lat + 1], [lon, lat]]],
+            },
+            "properties": {
+                "datetime": _iso(_EPOCH - timedelta(hours=6 * i)),
+                "eo:cloud_cover": round(self._rng.uniform(0, 100), 2),
+                "grid:code": f"MGRS-{30 + i % 3}U{chr(65 + i % 26)}{chr(65 + i // 26 % 26)}",
+            },
+            "assets": {
+                f"B{band:02}": {
+                    "href": f"https://data.simulator.test/{item_id}/B{band:02}.tif",
+                    "type": "image/tiff; application=geotiff; profile=cloud-optimized",
+                    "roles": ["data"],
+                }
+                for band in range(self.config.stac_assets_per_item)
+            },
+            "links": [],
+        }
+
+    def search(self, url: str, body: dict[str, Any]) -> dict[str, Any]:
+        """Returns a page of items, continued by the token of the `next` link, like the EODH STAC API."""
+        limit = min(int(body.get("limit", 10)), self.config.stac_max_page_size)
+        offset = int(body.get("token") or 0)
+        features = self.items[offset : offset + limit]
+        links: list[dict[str, Any]] = [{"rel": "self", "type": "application/geo+json", "href": url}]
+        if offset + limit < len(self.items):
+            links.append({
+                "rel": "next",
+                "type": "application/geo+json",
+                "method": "POST",
+                "href": url,
+                "body": {**body, "token": str(offset + limit)},
+            })
+        return {
+            "type": "FeatureCollection",
+            "features": features,
+            "links": links,
+            "numberMatched": len(self.items),
+            "numberReturned": len(features),
+            "context": {"limit": limit, "matched": len(self.items), "returned": len(features)},
+        }
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import time
+from typing import TYPE_CHECKING, Annotated, Any
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.api.auth.routes import decode_token, jwt_bearer_scheme, try_get_workspace_from_token_or_request_body
+from src.services.ades.factory import ades_client_factory
+from src.services.ades.token_client import ws_token_session_auth_client_factory
+from src.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from src.services.ades.client import ADESClient
+
+_logger = get_logger(__name__)
+
+
+@dataclasses.dataclass
+class AuthContext:
+    """Authentication state of a single request.
+
+    The bearer token is verified once per request. Workspace scoped tokens and ADES clients are resolved lazily and
+    reused for the rest of the request.
+
+    """
+
+    credential: HTTPAuthorizationCredentials
+    claims: dict[str, Any]
+    timings: dict[str, float] = dataclasses.field(default_factory=dict)
+    _ades_clients: dict[str, ADESClient] = dataclasses.field(default_factory=dict)
+
+    @property
+    def token(self) -> str:
+        return self.credential.credentials  # type: ignore[no-any-return]
+
+    @contextlib.contextmanager
+    def timed(self, step: str) -> Generator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[step] = self.timings.get(step, 0.0) + time.perf_counter() - t0
+            _logger.debug("Auth step '%s' took %.4fs", step, self.timings[step])
+
+    def workspace(self, workspace_from_request_body: str | None = None) -> str:
+        return try_get_workspace_from_token_or_request_body(
+            self.claims,
+            workspace_from_request_body=workspace_from_request_body,
+        )
+
+    async def ades_client(self, workspace_from_request_body: str | None = None) -> ADESClient:
+        """Returns ADES client scoped to the workspace from request body or, if not provided, from the token.
+
+        Args:
+            workspace_from_request_body: Optional workspace name provided by the user.
+
+        Returns:
+            An ADES client authenticated with a workspace scoped token.
+
+        Raises:
+            HTTPException: If the workspace scoped token could not be obtained.
+
+        """
+        workspace = self.workspace(workspace_from_request_body)
+        if (ades := self._ades_clients.get(workspace)) is not None:
+            return ades
+
+        with self.timed("workspace_token"):
+            ws_token_client = ws_token_session_auth_client_factory(
+                token=self.token,
+                workspace=workspace,
+                identity=self.claims.get("sub"),
+            )
+            err, token_response = await ws_token_client.get_token()
+        if err:
+            raise HTTPException(status_code=err.code, detail=err.detail)
+
+        ades = ades_client_factory(
+            workspace=workspace,
+            token=token_response.access,  # type: ignore[union-attr]
+        )
+        self._ades_clients[workspace] = ades
+        return ades
+
+
+def auth_context(
+    request: Request,
+    credential: Annotated[HTTPAuthorizationCredentials, Depends(jwt_bearer_scheme)],
+) -> AuthContext:
+    ctx: AuthContext | None = getattr(request.state, "auth_context", None)
+    if ctx is not None and ctx.token == credential.credentials:
+        return ctx
+
+    timings: dict[str, float] = {}
+    t0 = time.perf_counter()
+    claims = decode_token(credential.credentials)
+    timings["decode_token"] = time.perf_counter() - t0
+
+    ctx = AuthContext(credential=credential, claims=claims, timings=timings)
+    request.state.auth_context = ctx
+    return ctx
+
+
+async def workspace_ades_client(
+    auth: Annotated[AuthContext, Depends(auth_context)],
+    workspace: str | None = None,
+) -> ADESClient:
+    return await auth.ades_client(workspace)
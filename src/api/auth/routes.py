@@ -7,10 +7,11 @@ import jwt
 import jwt.exceptions
 from fastapi import APIRouter, Depends, HTTPException, WebSocketException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jwt import PyJWKClient  # type: ignore[attr-defined]
 
 from src.api.auth.schemas import IntrospectResponse, TokenRequest, TokenResponse
 from src.core.settings import Settings, current_settings
+from src.services.auth.claims import verified_claims_cache_factory
+from src.services.auth.jwks import jwks_cache_factory
 
 _HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
 
@@ -25,12 +26,13 @@ TIMEOUT = 30
 
 
 def decode_token(token: str, *, ws: bool = False) -> dict[str, Any]:
-    optional_custom_headers = {"User-agent": "custom-user-agent"}
-    jwks_client = PyJWKClient(current_settings().eodh.certs_url, headers=optional_custom_headers)
+    claims_cache = verified_claims_cache_factory()
+    if (claims := claims_cache.get(token)) is not None:
+        return claims
 
     try:
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
-        return jwt.decode(
+        signing_key = jwks_cache_factory().get_signing_key_from_jwt(token)
+        claims = jwt.decode(
             token,
             signing_key.key,
             audience=["oauth2-proxy-workspaces", "oauth2-proxy", "account"],
@@ -49,6 +51,9 @@ def decode_token(token: str, *, ws: bool = False) -> dict[str, Any]:
             headers={"WWW-Authenticate": "Bearer"},
         ) from ex
 
+    claims_cache.set(token, claims)
+    return claims
+
 
 def validate_access_token(
     credential: Annotated[HTTPAuthorizationCredentials, Depends(jwt_bearer_scheme)],
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.api.auth.routes import validate_access_token
+from src.utils.metrics import collect_metrics
 
 health_router = APIRouter(prefix="/health", tags=["Health Check"])
 
@@ -8,3 +14,11 @@ health_router = APIRouter(prefix="/health", tags=["Health Check"])
 @health_router.get("/ping")
 async def ping() -> str:
     return "pong"
+
+
+@health_router.get("/metrics")
+async def metrics(
+    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],  # noqa: ARG001
+) -> dict[str, dict[str, Any]]:
+    """Returns aggregate metrics of the application components, without any workspace or upstream details."""
+    return collect_metrics()
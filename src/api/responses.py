@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Content codings in order of preference
+_ENCODINGS = ("br", "gzip")
+
+# Streamed responses that must reach the client as soon as they are produced
+_UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream",)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Returns the preferred content coding accepted by the client, `None` if the response must not be compressed.
+
+    Args:
+        accept_encoding: The value of the `Accept-Encoding` request header.
+
+    """
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        if (param := params.strip()).startswith("q="):
+            try:
+                quality = float(param[2:])
+            except ValueError:
+                continue
+        accepted[coding.strip().lower()] = quality
+
+    candidates = [coding for coding in _ENCODINGS if accepted.get(coding, accepted.get("*", 0)) > 0]
+    return max(candidates, key=lambda coding: accepted.get(coding, accepted.get("*", 0)), default=None)
+
+
+class _Compressor:
+    def __init__(self, encoding: str, *, gzip_level: int, brotli_quality: int) -> None:
+        self._brotli = brotli.Compressor(quality=brotli_quality) if encoding == "br" else None
+        self._gzip = None if encoding == "br" else zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        if self._brotli is not None:
+            compressed: bytes = self._brotli.process(data)
+            tail: bytes = self._brotli.finish() if final else self._brotli.flush()
+            return compressed + tail
+        assert self._gzip is not None  # noqa: S101
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """Compresses responses with brotli or gzip, whichever the client prefers.
+
+    Responses smaller than `minimum_size`, already encoded responses and event streams are sent as they are. Streamed
+    responses are compressed chunk by chunk.
+
+    Args:
+        app: The wrapped application.
+        minimum_size: The smallest response body in bytes worth compressing.
+        gzip_level: The gzip compression level.
+        brotli_quality: The brotli compression quality, low values favour speed over size.
+
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = (
+            negotiate_encoding(Headers(scope=scope).get("accept-encoding", "")) if scope["type"] == "http" else None
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(self, encoding, send))
+
+
+class _CompressingSender:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        # Held back until the first chunk of the body tells whether it is worth compressing
+        self.start_message: Message | None = None
+        self.compressor: _Compressor | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] == "http.response.body":
+            if self.start_message is not None:
+                start_message, self.start_message = self.start_message, None
+                message = self._begin(start_message, message)
+                await self.send(start_message)
+            elif self.compressor is not None:
+                message = self._compress(message)
+        await self.send(message)
+
+    def _begin(self, start_message: Message, message: Message) -> Message:
+        headers = MutableHeaders(raw=start_message["headers"])
+        more_body = message.get("more_body", False)
+        if (
+            "content-encoding" in headers
+            or headers.get("content-type", "").startswith(_UNCOMPRESSED_MEDIA_TYPES)
+            or (not more_body and len(message.get("body", b"")) < self.middleware.minimum_size)
+        ):
+            return message
+
+        self.compressor = _Compressor(
+            self.encoding,
+            gzip_level=self.middleware.gzip_level,
+            brotli_quality=self.middleware.brotli_quality,
+        )
+        message = self._compress(message)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(message["body"]))
+        return message
+
+    def _compress(self, message: Message) -> Message:
+        assert self.compressor is not None  # noqa: S101
+        final = not message.get("more_body", False)
+        return {**message, "body": self.compressor.compress(message.get("body", b""), final=final)}
@@ -8,7 +8,8 @@ from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from fastapi.security import HTTPAuthorizationCredentials
 from starlette import status
 
-from src.api.auth.routes import decode_token, try_get_workspace_from_token_or_request_body, validate_access_token
+from src.api.auth.dependencies import AuthContext, auth_context, workspace_ades_client
+from src.api.auth.routes import validate_access_token
 from src.api.v1_2.action_creator.functions import (
     FUNCTION_IDENTIFIER_TO_WORKFLOW_MAPPING,
     FUNCTIONS,
@@ -35,14 +36,17 @@ from src.api.v1_2.action_creator.schemas import (
     PresetsResponse,
 )
 from src.core.settings import current_settings
-from src.services.ades.factory import ades_client_factory
+from src.services.ades.client import ADESClient
 from src.services.ades.schemas import StatusCode
-from src.services.ades.token_client import ws_token_session_auth_client_factory
+from src.services.admission import submission_admission_factory
 from src.services.stac.client import stac_client_factory
 from src.utils.logging import get_logger
 
 _logger = get_logger(__name__)
 
+# Maps history ordering fields to the keys used by the job index
+_HISTORY_ORDER_BY_INDEX_KEYS = {"submission_id": "job_id", "function_identifier": "process_id"}
+
 TWorkflowCreationSpec = Annotated[
     ActionCreatorSubmissionRequest,
     Body(
@@ -131,7 +135,7 @@ async def get_available_presets(
 )
 async def submit_workflow(
     workflow_spec: TWorkflowCreationSpec,
-    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],
+    auth: Annotated[AuthContext, Depends(auth_context)],
 ) -> ActionCreatorJob:
     stac_client = stac_client_factory()
 
@@ -156,20 +160,7 @@ async def submit_workflow(
             ],
         )
 
-    introspected_token = decode_token(credential.credentials)
-    workspace = try_get_workspace_from_token_or_request_body(
-        introspected_token, workspace_from_request_body=workflow_spec.workspace
-    )
-
-    ws_token_client = ws_token_session_auth_client_factory(token=credential.credentials, workspace=workspace)
-    err, token_response = await ws_token_client.get_token()
-    if err:
-        raise HTTPException(status_code=err.code, detail=err.detail)
-
-    ades = ades_client_factory(
-        workspace=workspace,
-        token=token_response.access,  # type: ignore[union-attr]
-    )
+    ades = await auth.ades_client(workflow_spec.workspace)
 
     workflow_step_spec = next(iter(workflow_spec.workflow.values()))
     ogc_inputs = workflow_step_spec.inputs.as_ogc_process_inputs()
@@ -184,16 +175,18 @@ async def submit_workflow(
         wf_identifier = f"scatter-{wf_identifier}"
         ogc_inputs["areas"] = ogc_inputs.pop("aoi")
 
-    err, _ = await ades.reregister_process(
-        wf_identifier,
-        wf_registry=WORKFLOW_REGISTRY,
-        wf_id_override_lookup=WORKFLOW_ID_OVERRIDE_LOOKUP,
-    )
+    # Registration and execution are rate limited per workspace and queued fairly across workspaces
+    async with submission_admission_factory().admit(ades.workspace):
+        err, _ = await ades.reregister_process(
+            wf_identifier,
+            wf_registry=WORKFLOW_REGISTRY,
+            wf_id_override_lookup=WORKFLOW_ID_OVERRIDE_LOOKUP,
+        )
 
-    if err is not None:
-        raise HTTPException(status_code=err.code, detail=err.detail)
+        if err is not None:
+            raise HTTPException(status_code=err.code, detail=err.detail)
 
-    err, response = await ades.execute_process(process_identifier=wf_identifier, process_inputs=ogc_inputs)
+        err, response = await ades.execute_process(process_identifier=wf_identifier, process_inputs=ogc_inputs)
 
     if err is not None:  # Will happen if there are race conditions and the process was deleted or ADES is unresponsive
         raise HTTPException(status_code=err.code, detail=err.detail)
@@ -220,64 +213,46 @@ async def submit_workflow(
     status_code=status.HTTP_200_OK,
 )
 async def get_job_history(
-    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],
+    auth: Annotated[AuthContext, Depends(auth_context)],
     params: Annotated[ActionCreatorSubmissionsQueryParams, Query(...)],
 ) -> dict[str, Any]:
-    introspected_token = decode_token(credential.credentials)
-    workspace = try_get_workspace_from_token_or_request_body(
-        introspected_token,
-        workspace_from_request_body=params.workspace,
-    )
+    ades = await auth.ades_client(params.workspace)
 
-    ws_token_client = ws_token_session_auth_client_factory(token=credential.credentials, workspace=workspace)
-    err, token_response = await ws_token_client.get_token()
-    if err:
-        raise HTTPException(status_code=err.code, detail=err.detail)
-
-    ades = ades_client_factory(
-        workspace=workspace,
-        token=token_response.access,  # type: ignore[union-attr]
-    )
-
-    # Get the jobs
-    ades_jobs: dict[str, Any]
-    # FIXME: hardcoding limit and skip since ADES does not sort results... Pass user defined values once possible.
-    err, ades_jobs = await ades.list_job_submissions(limit=10000, skip=0, raw_output=True)  # type: ignore[assignment]
+    err, index = await ades.get_job_index()
 
     if err is not None:
         raise HTTPException(status_code=err.code, detail=err.detail)
 
-    if ades_jobs is None:  # Impossible case
+    if index is None:  # Impossible case
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while executing preset function",
         )
 
-    # To result schema
-    results = [
-        {
-            "submission_id": job["jobID"],
-            "function_identifier": job["processID"],
-            "status": job["status"],
-            "submitted_at": job["created"],
-            "finished_at": job.get("finished"),
-            "successful": True if job["status"] == "successful" else False if job["status"] == "failed" else None,
-        }
-        for job in ades_jobs["jobs"]
-        if (params.status and job["status"] in params.status) or not params.status
-    ]
-
-    # Order by
-    # Use tuples to handle None items - tuples are sorted item by item
-    results.sort(
-        key=lambda x: (x[params.order_by] is None, x[params.order_by]),
-        reverse=params.order_direction == "desc",
+    # Filter and order using the index - sorted views are reused between requests
+    results = index.query(
+        _HISTORY_ORDER_BY_INDEX_KEYS.get(params.order_by, params.order_by),
+        descending=params.order_direction == "desc",
+        statuses=params.status or (),
     )
 
     # Paginate
     offset = (params.page - 1) * params.per_page if params.per_page else 0
     total_pages = math.ceil(len(results) / params.per_page) if params.per_page else 1 if results else 0
-    limited_jobs = results[offset : offset + params.per_page] if params.per_page else results
+    page = results[offset : offset + params.per_page] if params.per_page else results
+
+    # To result schema
+    limited_jobs = [
+        {
+            "submission_id": job["job_id"],
+            "function_identifier": job["process_id"],
+            "status": job["status"],
+            "submitted_at": job["submitted_at"],
+            "finished_at": job["finished_at"],
+            "successful": job["successful"],
+        }
+        for job in page
+    ]
 
     return {
         "results": limited_jobs,
@@ -300,21 +275,8 @@ async def get_job_history(
 )
 async def get_job_status(
     submission_id: uuid.UUID,
-    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],
-    workspace: str | None = None,
+    ades: Annotated[ADESClient, Depends(workspace_ades_client)],
 ) -> ActionCreatorJobSummary:
-    introspected_token = decode_token(credential.credentials)
-    workspace = try_get_workspace_from_token_or_request_body(introspected_token, workspace_from_request_body=workspace)
-
-    ws_token_client = ws_token_session_auth_client_factory(token=credential.credentials, workspace=workspace)
-    err, token_response = await ws_token_client.get_token()
-    if err:
-        raise HTTPException(status_code=err.code, detail=err.detail)
-
-    ades = ades_client_factory(
-        workspace=workspace,
-        token=token_response.access,  # type: ignore[union-attr]
-    )
     err, job = await ades.get_job_details(job_id=submission_id)
 
     if err:
@@ -341,21 +303,8 @@ async def get_job_status(
 )
 async def cancel_or_delete_job(
     submission_id: uuid.UUID,
-    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],
-    workspace: str | None = None,
+    ades: Annotated[ADESClient, Depends(workspace_ades_client)],
 ) -> None:
-    introspected_token = decode_token(credential.credentials)
-    workspace = try_get_workspace_from_token_or_request_body(introspected_token, workspace_from_request_body=workspace)
-
-    ws_token_client = ws_token_session_auth_client_factory(token=credential.credentials, workspace=workspace)
-    err, token_response = await ws_token_client.get_token()
-    if err:
-        raise HTTPException(status_code=err.code, detail=err.detail)
-
-    ades = ades_client_factory(
-        workspace=workspace,
-        token=token_response.access,  # type: ignore[union-attr]
-    )
     err, _ = await ades.cancel_or_delete_job(submission_id)
     if err:
         raise HTTPException(status_code=err.code, detail=err.detail)
@@ -368,34 +317,25 @@ async def cancel_or_delete_job(
 )
 async def batch_cancel_or_delete_jobs(
     request: BatchDeleteRequest,
-    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],
+    auth: Annotated[AuthContext, Depends(auth_context)],
 ) -> BatchDeleteResponse:
     settings = current_settings()
-    introspected_token = decode_token(credential.credentials)
-    workspace = try_get_workspace_from_token_or_request_body(
-        introspected_token, workspace_from_request_body=request.workspace
-    )
+    ades = await auth.ades_client(request.workspace)
 
-    ws_token_client = ws_token_session_auth_client_factory(token=credential.credentials, workspace=workspace)
-    err, token_response = await ws_token_client.get_token()
-    if err:
-        raise HTTPException(status_code=err.code, detail=err.detail)
-
-    ades = ades_client_factory(
-        workspace=workspace,
-        token=token_response.access,  # type: ignore[union-attr]
-    )
-
-    err, removed_ids = await ades.batch_cancel_or_delete_jobs(
+    err, result = await ades.batch_cancel_or_delete_jobs(
         remove_statuses=request.remove_statuses or [],  # type: ignore[arg-type]
         remove_all_before=request.remove_all_before,
         remove_all_after=request.remove_all_after,
         max_jobs_to_process=request.max_jobs_to_process,
         stac_endpoint=settings.eodh.stac_api_endpoint,
         remove_jobs_without_results=request.remove_jobs_without_results,
+        max_concurrency=settings.ades.batch_delete_concurrency,
     )
 
     if err:
         raise HTTPException(status_code=err.code, detail=err.detail)
 
-    return BatchDeleteResponse(removed_jobs=removed_ids)
+    return BatchDeleteResponse(
+        removed_jobs=result.removed_ids,  # type: ignore[union-attr]
+        failed_jobs=result.failed_ids,  # type: ignore[union-attr]
+    )
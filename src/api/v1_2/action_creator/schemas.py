@@ -445,6 +445,7 @@ class PaginationResults[T: BaseModel](BaseModel):
 
 class BatchDeleteResponse(BaseModel):
     removed_jobs: list[str]
+    failed_jobs: list[str] = []
 
 
 class BatchDeleteRequest(BaseModel):
@@ -1,25 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import math
-import tempfile
+import time
 import uuid
-from pathlib import Path
-from typing import Annotated, Any
+from typing import TYPE_CHECKING, Annotated, Any
 
-import yaml
-from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, WebSocket, WebSocketException
 from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import ValidationError
 from starlette import status
 
-from src.api.auth.routes import decode_token, try_get_workspace_from_token_or_request_body, validate_access_token
+from src.api.auth.dependencies import AuthContext, auth_context, workspace_ades_client
+from src.api.auth.routes import validate_access_token, validate_token_from_websocket
 from src.api.v1_3.action_creator.schemas.errors import ErrorResponse
 from src.api.v1_3.action_creator.schemas.functions import FunctionsResponse
 from src.api.v1_3.action_creator.schemas.history import (
     ActionCreatorJob,
+    ActionCreatorJobStatus,
     ActionCreatorJobSummary,
     ActionCreatorSubmissionsQueryParams,
+    BulkJobStatusRequest,
+    BulkJobStatusResponse,
+    JobStatusError,
+    JobStatusSubscription,
     PaginationResults,
 )
 from src.api.v1_3.action_creator.schemas.presets import (
@@ -36,15 +42,26 @@ from src.api.v1_3.action_creator.schemas.workflow_tasks import (
 )
 from src.api.v1_3.action_creator.schemas.workflows import BatchDeleteRequest, BatchDeleteResponse, WorkflowSpec
 from src.core.settings import current_settings
-from src.services.ades.factory import ades_client_factory
-from src.services.ades.schemas import StatusCode
-from src.services.ades.token_client import ws_token_session_auth_client_factory
+from src.services.ades.client import ADESClient
+from src.services.ades.schemas import StatusCode, StatusInfo
+from src.services.ades.submissions import Submission, SubmissionPipeline, SubmissionState, submission_pipeline_factory
+from src.services.ades.watcher import JobStatusEvent, job_status_watcher_factory
 from src.services.cwl.workflow_creator import WorkflowCreator
 from src.services.stac.client import stac_client_factory
 from src.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 _logger = get_logger(__name__)
 
+# ADES statuses not used by the workflow submission API
+_WS_JOB_STATUS_LOOKUP = {StatusCode.accepted: "submitted", StatusCode.dismissed: "cancelled"}
+_ADES_JOB_STATUS_LOOKUP = {v: k for k, v in _WS_JOB_STATUS_LOOKUP.items()}
+
+# Maps history ordering fields to the keys used by the job index
+_HISTORY_ORDER_BY_INDEX_KEYS = {"workflow_identifier": "process_id"}
+
 TWorkflowSpec = Annotated[
     dict[str, Any],
     Body(
@@ -167,7 +184,7 @@ async def validate_workflow_specification(
 )
 async def submit_workflow(
     workflow_spec: TWorkflowSpec,
-    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],
+    auth: Annotated[AuthContext, Depends(auth_context)],
 ) -> ActionCreatorJob:
     try:
         wf_model = WorkflowSpec.model_validate(workflow_spec)
@@ -196,61 +213,24 @@ async def submit_workflow(
             ],
         )
 
-    introspected_token = decode_token(credential.credentials)
-    workspace = try_get_workspace_from_token_or_request_body(
-        introspected_token, workspace_from_request_body=wf_model.workspace
-    )
-
-    ws_token_client = ws_token_session_auth_client_factory(token=credential.credentials, workspace=workspace)
-    err, token_response = await ws_token_client.get_token()
-    if err:
-        raise HTTPException(status_code=err.code, detail=err.detail)
-
-    ades = ades_client_factory(
-        workspace=workspace,
-        token=token_response.access,  # type: ignore[union-attr]
-    )
+    ades = await auth.ades_client(wf_model.workspace)
 
     wf_creation_result = WorkflowCreator.cwl_from_wf_spec(workflow_spec)
-    with tempfile.TemporaryDirectory() as tmpdir:
-        cwl_fp = Path(tmpdir) / "app.cwl"
-        yaml.safe_dump(wf_creation_result.app_spec, cwl_fp.open("w", encoding="utf-8"), sort_keys=False)
-        err = await ades.unregister_process(wf_creation_result.wf_id)
-        if err is not None and err.code != status.HTTP_404_NOT_FOUND:
-            raise HTTPException(
-                status_code=err.code,
-                detail=err.detail,
-            )
-        err, _ = await ades.register_process_from_local_cwl_file(cwl_fp)
 
-    if err is not None:
-        raise HTTPException(
-            status_code=err.code,
-            detail=err.detail,
-        )
-
-    err, response = await ades.execute_process(
-        process_identifier=wf_creation_result.wf_id,
-        process_inputs=wf_creation_result.user_inputs,
+    # Registration and execution take a while - they run in the background, the submission is tracked by a local ID
+    submission = await submission_pipeline_factory().submit(
+        ades,
+        ades.workspace,
+        wf_creation_result.wf_id,
+        wf_creation_result.app_spec,
+        wf_creation_result.user_inputs,
     )
 
-    if err is not None:  # Will happen if there are race conditions and the process was deleted or ADES is unresponsive
-        raise HTTPException(
-            status_code=err.code,
-            detail=err.detail,
-        )
-
-    if response is None:  # Impossible case
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An error occurred while executing preset function",
-        )
-
     return ActionCreatorJob(
-        job_id=response.job_id,
+        job_id=submission.submission_id,
         workflow_spec=workflow_spec,
-        status=response.status.value,
-        submitted_at=response.created,
+        status=ActionCreatorJobStatus.submitted,
+        submitted_at=submission.submitted_at,
     )
 
 
@@ -262,64 +242,59 @@ async def submit_workflow(
     status_code=status.HTTP_200_OK,
 )
 async def get_job_history(
-    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],
+    auth: Annotated[AuthContext, Depends(auth_context)],
     params: Annotated[ActionCreatorSubmissionsQueryParams, Query(...)],
 ) -> dict[str, Any]:
-    introspected_token = decode_token(credential.credentials)
-    workspace = try_get_workspace_from_token_or_request_body(
-        introspected_token,
-        workspace_from_request_body=params.workspace,
-    )
-
-    ws_token_client = ws_token_session_auth_client_factory(token=credential.credentials, workspace=workspace)
-    err, token_response = await ws_token_client.get_token()
-    if err:
-        raise HTTPException(status_code=err.code, detail=err.detail)
-
-    ades = ades_client_factory(
-        workspace=workspace,
-        token=token_response.access,  # type: ignore[union-attr]
-    )
+    ades = await auth.ades_client(params.workspace)
 
-    # Get the jobs
-    ades_jobs: dict[str, Any]
-    # FIXME: hardcoding limit and skip since ADES does not sort results... Pass user defined values once possible.
-    err, ades_jobs = await ades.list_job_submissions(limit=10000, skip=0, raw_output=True)  # type: ignore[assignment]
+    err, index = await ades.get_job_index()
 
     if err is not None:
         raise HTTPException(status_code=err.code, detail=err.detail)
 
-    if ades_jobs is None:  # Impossible case
+    if index is None:  # Impossible case
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while executing preset function",
         )
 
-    # To result schema
-    results = [
-        {
-            "job_id": job["jobID"],
-            "workflow_identifier": job["processID"],
-            "status": job["status"],
-            "submitted_at": job["created"],
-            "finished_at": job.get("finished"),
-            "successful": True if job["status"] == "successful" else False if job["status"] == "failed" else None,
-        }
-        for job in ades_jobs["jobs"]
-        if (params.status and job["status"] in params.status) or not params.status
-    ]
-
-    # Order by
-    # Use tuples to handle None items - tuples are sorted item by item
-    results.sort(
-        key=lambda x: (x[params.order_by] is None, x[params.order_by]),
-        reverse=params.order_direction == "desc",
-    )
+    # Filter and order using the index - sorted views are reused between requests
+    order_by = _HISTORY_ORDER_BY_INDEX_KEYS.get(params.order_by, params.order_by)
+    descending = params.order_direction == "desc"
+    statuses = {_ADES_JOB_STATUS_LOOKUP.get(s, s) for s in params.status}
+    results = index.query(order_by, descending=descending, statuses=statuses)
+
+    # Submissions that have not reached ADES are listed too
+    pipeline = submission_pipeline_factory()
+    records = [submission.job_record() for submission in await pipeline.unresolved(ades.workspace)]
+    if unresolved := [record for record in records if not statuses or record["status"] in statuses]:
+        results = sorted(
+            [*results, *unresolved],
+            key=lambda x: (x[order_by] is None, x[order_by]),
+            reverse=descending,
+        )
 
     # Paginate
     offset = (params.page - 1) * params.per_page if params.per_page else 0
     total_pages = math.ceil(len(results) / params.per_page) if params.per_page else 1 if results else 0
-    limited_jobs = results[offset : offset + params.per_page] if params.per_page else results
+    page = results[offset : offset + params.per_page] if params.per_page else results
+
+    # Jobs created by workflow submissions are listed under the submission IDs
+    local_ids = await pipeline.local_ids([job["job_id"] for job in page], ades.workspace)
+
+    # To result schema
+    limited_jobs = [
+        {
+            "job_id": local_ids.get(job["job_id"], job["job_id"]),
+            "workflow_identifier": job["process_id"],
+            "status": _WS_JOB_STATUS_LOOKUP.get(job["status"], job["status"]),
+            "submitted_at": job["submitted_at"],
+            "finished_at": job["finished_at"],
+            "successful": job["successful"],
+            "error": job.get("error"),
+        }
+        for job in page
+    ]
 
     return {
         "results": limited_jobs,
@@ -333,6 +308,72 @@ async def get_job_history(
     }
 
 
+def _submission_summary(submission: Submission) -> ActionCreatorJobSummary:
+    record = submission.job_record()
+    return ActionCreatorJobSummary(
+        job_id=submission.submission_id,
+        workflow_identifier=submission.workflow_identifier,
+        status=ActionCreatorJobStatus(_WS_JOB_STATUS_LOOKUP.get(record["status"], record["status"])),
+        submitted_at=submission.submitted_at,
+        finished_at=submission.finished_at,
+        error=record["error"],
+    )
+
+
+def _job_summary(job: StatusInfo, job_id: str | None = None) -> ActionCreatorJobSummary:
+    return ActionCreatorJobSummary(
+        job_id=job_id or job.job_id,
+        workflow_identifier=job.process_id,
+        status=_WS_JOB_STATUS_LOOKUP.get(job.status, job.status),
+        submitted_at=job.created,
+        finished_at=job.finished,
+    )
+
+
+@action_creator_router_v1_3.post(
+    "/workflow-submissions/status",
+    response_model=BulkJobStatusResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_bulk_job_status(
+    request: BulkJobStatusRequest,
+    auth: Annotated[AuthContext, Depends(auth_context)],
+) -> BulkJobStatusResponse:
+    """Returns statuses of multiple workflow submissions, failures are reported per submission."""
+    ades = await auth.ades_client(request.workspace)
+    submission_ids = [str(submission_id) for submission_id in request.submission_ids]
+    submissions = await submission_pipeline_factory().get_many(submission_ids, ades.workspace)
+
+    results: dict[str, ActionCreatorJobSummary] = {}
+    errors: dict[str, JobStatusError] = {}
+    # Maps ADES job IDs to the requested submission IDs
+    requested_ids: dict[str, str] = {}
+    for submission_id in submission_ids:
+        if (submission := submissions.get(submission_id)) is None:
+            requested_ids[submission_id] = submission_id
+        elif submission.job_id is None:
+            results[submission_id] = _submission_summary(submission)
+        else:
+            requested_ids[submission.job_id] = submission_id
+
+    jobs = await ades.get_many_job_details(
+        requested_ids,
+        max_concurrency=current_settings().ades.bulk_status_concurrency,
+    )
+    for job_id, (err, job) in jobs.items():
+        submission_id = requested_ids[job_id]
+        if err is not None:
+            errors[submission_id] = JobStatusError(code=err.code, detail=err.detail)
+        elif job is None:  # Impossible case
+            errors[submission_id] = JobStatusError(
+                code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal Server Error",
+            )
+        else:
+            results[submission_id] = _job_summary(job, submission_id)
+    return BulkJobStatusResponse(results=results, errors=errors)
+
+
 @action_creator_router_v1_3.get(
     "/workflow-submissions/{submission_id}",
     response_model=ActionCreatorJobSummary,
@@ -342,22 +383,15 @@ async def get_job_history(
 )
 async def get_job_status(
     submission_id: uuid.UUID,
-    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],
-    workspace: str | None = None,
+    ades: Annotated[ADESClient, Depends(workspace_ades_client)],
 ) -> ActionCreatorJobSummary:
-    introspected_token = decode_token(credential.credentials)
-    workspace = try_get_workspace_from_token_or_request_body(introspected_token, workspace_from_request_body=workspace)
-
-    ws_token_client = ws_token_session_auth_client_factory(token=credential.credentials, workspace=workspace)
-    err, token_response = await ws_token_client.get_token()
-    if err:
-        raise HTTPException(status_code=err.code, detail=err.detail)
+    job_id: str | uuid.UUID = submission_id
+    if (submission := await submission_pipeline_factory().get(str(submission_id), ades.workspace)) is not None:
+        if submission.job_id is None:
+            return _submission_summary(submission)
+        job_id = submission.job_id
 
-    ades = ades_client_factory(
-        workspace=workspace,
-        token=token_response.access,  # type: ignore[union-attr]
-    )
-    err, job = await ades.get_job_details(job_id=submission_id)
+    err, job = await ades.get_job_details(job_id=job_id)
 
     if err:
         raise HTTPException(status_code=err.code, detail=err.detail)
@@ -366,13 +400,157 @@ async def get_job_status(
         # This should never happen if error was not generated
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error")
 
-    return ActionCreatorJobSummary(
-        job_id=job.job_id,
-        workflow_identifier=job.process_id,
-        status=job.status if job.status != StatusCode.dismissed else "cancelled",
-        submitted_at=job.created,
-        finished_at=job.finished,
-    )
+    return _job_summary(job, str(submission_id))
+
+
+def _job_status_message(event: JobStatusEvent, local_ids: dict[str, str] | None = None) -> dict[str, Any]:
+    if event.job is None:
+        return {"event": "error", "data": event.error.model_dump() if event.error else None}
+    job = event.job
+    return {
+        "event": "status",
+        "data": {
+            "job_id": (local_ids or {}).get(job["job_id"], job["job_id"]),
+            "workflow_identifier": job["process_id"],
+            "status": _WS_JOB_STATUS_LOOKUP.get(job["status"], job["status"]),
+            "submitted_at": job["submitted_at"],
+            "finished_at": job["finished_at"],
+            "successful": job["successful"],
+            "error": job.get("error"),
+        },
+    }
+
+
+async def _watched_jobs(
+    pipeline: SubmissionPipeline,
+    workspace: str,
+    submission_ids: list[str] | None,
+) -> tuple[list[str] | None, list[Submission]]:
+    """Maps watched submission IDs to ADES job IDs, submissions that have not reached ADES are returned apart."""
+    if submission_ids is None:
+        # Workspace wide subscriptions are sent active submissions only
+        return None, [s for s in await pipeline.unresolved(workspace) if s.state == SubmissionState.queued]
+    submissions = await pipeline.get_many(submission_ids, workspace)
+    job_ids: list[str] = []
+    unresolved: list[Submission] = []
+    for submission_id in submission_ids:
+        if (submission := submissions.get(submission_id)) is None:
+            job_ids.append(submission_id)
+        elif submission.job_id is None:
+            unresolved.append(submission)
+        else:
+            job_ids.append(submission.job_id)
+    return job_ids, unresolved
+
+
+async def _follow_submissions(
+    pipeline: SubmissionPipeline,
+    submissions: list[Submission],
+    events: asyncio.Queue[JobStatusEvent],
+    watch_jobs: Callable[[list[str]], None],
+) -> None:
+    """Pushes the statuses of submissions that have not reached ADES to `events` and follows the queued ones.
+
+    Once a queued submission reaches ADES, its job is passed to `watch_jobs`. Submissions that fail before reaching
+    ADES are pushed to `events` again.
+
+    """
+    for submission in submissions:
+        await events.put(JobStatusEvent(job=submission.job_record()))
+    poll_interval = current_settings().ades.job_watcher_poll_interval
+
+    async def follow(submission_id: str, workspace: str) -> None:
+        if (submission := await pipeline.wait(submission_id, workspace, poll_interval)) is None:
+            return
+        if submission.job_id is None:
+            await events.put(JobStatusEvent(job=submission.job_record()))
+        else:
+            watch_jobs([submission.job_id])
+
+    async with asyncio.TaskGroup() as group:
+        for submission in submissions:
+            if submission.state == SubmissionState.queued:
+                group.create_task(follow(submission.submission_id, submission.workspace))
+
+
+async def _submission_status_message(
+    pipeline: SubmissionPipeline,
+    workspace: str,
+    event: JobStatusEvent,
+) -> dict[str, Any]:
+    # Jobs created by workflow submissions are reported under the submission IDs
+    job_ids = [] if event.job is None else [event.job["job_id"]]
+    return _job_status_message(event, await pipeline.local_ids(job_ids, workspace))
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@action_creator_router_v1_3.websocket("/workflow-submissions/watch")
+async def watch_job_statuses(websocket: WebSocket) -> None:
+    """Pushes workflow submission status changes over a WebSocket.
+
+    The first message sent by the client must be a `JobStatusSubscription`. The server replies with a snapshot of the
+    watched submissions - all active ones if no IDs were given - and then pushes every status change as
+    `{"event": "status", "data": <submission summary>}`. Failures to refresh the statuses are sent as
+    `{"event": "error", "data": {"code": ..., "detail": ...}}`. ADES is polled once per workspace, no matter how many
+    clients watch it. The connection is closed when the access token expires.
+
+    """
+    await websocket.accept()
+    try:
+        subscription = JobStatusSubscription.model_validate(await websocket.receive_json())
+    except (ValidationError, ValueError) as ex:
+        raise WebSocketException(code=status.WS_1007_INVALID_FRAME_PAYLOAD_DATA, reason="Invalid subscription") from ex
+
+    token, claims = validate_token_from_websocket(subscription.token)
+    auth = AuthContext(credential=HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), claims=claims)
+    try:
+        workspace = auth.workspace(subscription.workspace)
+        # Verifies that the user can access the workspace before subscribing
+        ades = await auth.ades_client(workspace)
+    except HTTPException as ex:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=str(ex.detail)) from ex
+
+    async def ades_client() -> ADESClient:
+        # Fresh context on every poll - workspace tokens are served from the token cache
+        return await AuthContext(credential=auth.credential, claims=claims).ades_client(workspace)
+
+    pipeline = submission_pipeline_factory()
+    job_ids, unresolved = await _watched_jobs(pipeline, ades.workspace, subscription.submission_ids)
+
+    watcher = job_status_watcher_factory()
+    async with watcher.subscribe(workspace.lower(), ades_client, job_ids) as events:
+        following = asyncio.create_task(
+            _follow_submissions(
+                pipeline,
+                unresolved,
+                events,
+                functools.partial(watcher.watch_jobs, workspace.lower(), events),
+            )
+        )
+        disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+        try:
+            while True:
+                next_event = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait(
+                    {next_event, disconnected},
+                    timeout=max(claims.get("exp", math.inf) - time.time(), 0),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if next_event not in done:
+                    next_event.cancel()
+                    if disconnected not in done:
+                        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expired")
+                    return
+                await websocket.send_json(
+                    await _submission_status_message(pipeline, ades.workspace, next_event.result())
+                )
+        finally:
+            disconnected.cancel()
+            following.cancel()
 
 
 @action_creator_router_v1_3.delete(
@@ -383,22 +561,15 @@ async def get_job_status(
 )
 async def cancel_or_delete_job(
     job_id: uuid.UUID,
-    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],
-    workspace: str | None = None,
+    ades: Annotated[ADESClient, Depends(workspace_ades_client)],
 ) -> None:
-    introspected_token = decode_token(credential.credentials)
-    workspace = try_get_workspace_from_token_or_request_body(introspected_token, workspace_from_request_body=workspace)
-
-    ws_token_client = ws_token_session_auth_client_factory(token=credential.credentials, workspace=workspace)
-    err, token_response = await ws_token_client.get_token()
-    if err:
-        raise HTTPException(status_code=err.code, detail=err.detail)
+    ades_job_id: str | uuid.UUID = job_id
+    if (submission := await submission_pipeline_factory().cancel(str(job_id), ades.workspace)) is not None:
+        if submission.job_id is None:  # Never reached ADES
+            return
+        ades_job_id = submission.job_id
 
-    ades = ades_client_factory(
-        workspace=workspace,
-        token=token_response.access,  # type: ignore[union-attr]
-    )
-    err, _ = await ades.cancel_or_delete_job(job_id)
+    err, _ = await ades.cancel_or_delete_job(ades_job_id)
     if err:
         raise HTTPException(status_code=err.code, detail=err.detail)
 
@@ -410,35 +581,25 @@ async def cancel_or_delete_job(
 )
 async def batch_cancel_or_delete_jobs(
     request: BatchDeleteRequest,
-    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],
+    auth: Annotated[AuthContext, Depends(auth_context)],
 ) -> BatchDeleteResponse:
     settings = current_settings()
-    introspected_token = decode_token(credential.credentials)
-    workspace = try_get_workspace_from_token_or_request_body(
-        introspected_token,
-        workspace_from_request_body=request.workspace,
-    )
+    ades = await auth.ades_client(request.workspace)
 
-    ws_token_client = ws_token_session_auth_client_factory(token=credential.credentials, workspace=workspace)
-    err, token_response = await ws_token_client.get_token()
-    if err:
-        raise HTTPException(status_code=err.code, detail=err.detail)
-
-    ades = ades_client_factory(
-        workspace=workspace,
-        token=token_response.access,  # type: ignore[union-attr]
-    )
-
-    err, removed_ids = await ades.batch_cancel_or_delete_jobs(
+    err, result = await ades.batch_cancel_or_delete_jobs(
         remove_statuses=request.remove_statuses or [],  # type: ignore[arg-type]
         remove_all_before=request.remove_all_before,
         remove_all_after=request.remove_all_after,
         max_jobs_to_process=request.max_jobs_to_process,
         stac_endpoint=settings.eodh.stac_api_endpoint,
         remove_jobs_without_results=request.remove_jobs_without_results,
+        max_concurrency=settings.ades.batch_delete_concurrency,
     )
 
     if err:
         raise HTTPException(status_code=err.code, detail=err.detail)
 
-    return BatchDeleteResponse(removed_jobs=removed_ids)
+    return BatchDeleteResponse(
+        removed_jobs=result.removed_ids,  # type: ignore[union-attr]
+        failed_jobs=result.failed_ids,  # type: ignore[union-attr]
+    )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import uuid
 from collections.abc import Sequence
 from datetime import datetime
 from enum import StrEnum, auto
@@ -13,6 +14,7 @@ MIN_PAGE_IDX = 1
 DEFAULT_RESULTS_PER_PAGE = 25
 MIN_RESULTS_PER_PAGE = 1
 MAX_RESULTS_PER_PAGE = 100
+MAX_BULK_STATUS_SUBMISSIONS = 500
 
 
 class ActionCreatorJobStatus(StrEnum):
@@ -34,6 +36,11 @@ class ActionCreatorJob(BaseModel):
     successful: bool | None = None
 
 
+class JobStatusError(BaseModel):
+    code: int
+    detail: str | dict[str, Any] | None = None
+
+
 class ActionCreatorJobSummary(BaseModel):
     job_id: str
     status: ActionCreatorJobStatus
@@ -41,6 +48,7 @@ class ActionCreatorJobSummary(BaseModel):
     submitted_at: datetime
     finished_at: datetime | None = None
     successful: bool | None = None
+    error: JobStatusError | None = None
 
     @model_validator(mode="before")
     @classmethod
@@ -122,3 +130,25 @@ class PaginationResults[T: BaseModel](BaseModel):
     results_per_page: int | None = None
     ordered_by: str
     order_direction: OrderDirection
+
+
+class JobStatusSubscription(BaseModel):
+    token: Annotated[str, Field(description="Bearer token, e.g. `Bearer <access-token>`")]
+    workspace: Annotated[str | None, Field(None, description="Workspace to watch")]
+    submission_ids: Annotated[
+        list[str] | None,
+        Field(None, description="Submissions to watch - all workspace submissions by default"),
+    ]
+
+
+class BulkJobStatusRequest(BaseModel):
+    workspace: Annotated[str | None, Field(None, description="Workspace to query")]
+    submission_ids: Annotated[
+        list[uuid.UUID],
+        Field(min_length=1, max_length=MAX_BULK_STATUS_SUBMISSIONS, description="Submissions to get the status of"),
+    ]
+
+
+class BulkJobStatusResponse(BaseModel):
+    results: dict[str, ActionCreatorJobSummary]
+    errors: dict[str, JobStatusError] = {}
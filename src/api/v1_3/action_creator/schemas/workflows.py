@@ -255,6 +255,7 @@ class WorkflowSpec(BaseModel):
 
 class BatchDeleteResponse(BaseModel):
     removed_jobs: list[str]
+    failed_jobs: list[str] = []
 
 
 class BatchDeleteRequest(BaseModel):
@@ -14,6 +14,11 @@ class OAuth2Settings(BaseModel):
     username: str
     password: str
     client_id: str
+    jwks_cache_ttl: float = 300
+    jwks_stale_ttl: float = 3600
+    jwks_min_refresh_interval: float = 10
+    jwks_fetch_timeout: float = 5
+    claims_cache_max_size: int = 10_000
 
     @property
     def oid_url(self) -> str:
@@ -40,6 +45,21 @@ class ADESSettings(BaseModel):
     url: str
     ogc_processes_api_path: str = "ogc-api/processes"
     ogc_jobs_api_path: str = "ogc-api/jobs"
+    process_registry_cache_size: int = 1_000
+    process_registry_ttl: float = 300
+    batch_delete_concurrency: int = 10
+    job_index_cache_size: int = 1_000
+    job_index_full_sync_interval: float = 300
+    job_index_refresh_interval: float = 5
+    job_index_max_jobs: int = 10_000
+    job_index_refresh_concurrency: int = 10
+    job_watcher_poll_interval: float = 5
+    job_watcher_queue_size: int = 1_000
+    bulk_status_concurrency: int = 20
+    terminal_job_cache_size: int = 10_000
+    cwl_package_cache_size: int = 100
+    cwl_package_max_age: float = 60
+    trusted_responses: bool = False
 
 
 class OAuthClientSettings(BaseModel):
@@ -56,6 +76,10 @@ class EODHSettings(OAuth2Settings):
     stac_api_endpoint: str
     ceda_stac_catalog_path: str
     workspace_services_endpoint: str
+    workspace_token_cache_size: int = 10_000
+    workspace_token_refresh_margin: float = 60
+    workspace_token_min_validity: float = 10
+    workspace_token_max_refresh_age: float = 3600
 
     @property
     def workspace_tokens_url(self) -> str:
@@ -66,6 +90,50 @@ class EODHSettings(OAuth2Settings):
         return f"{self.workspace_services_endpoint}/{self.username}/me/sessions"
 
 
+class HttpClientSettings(BaseModel):
+    limit: int = 100
+    limit_per_host: int = 30
+    keepalive_timeout: float = 30
+    ttl_dns_cache: int = 300
+
+
+class CompressionSettings(BaseModel):
+    minimum_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 4
+
+
+class CircuitBreakerSettings(BaseModel):
+    window_size: int = 20
+    min_calls: int = 10
+    failure_rate_threshold: float = 0.5
+    slow_call_duration: float = 10
+    slow_call_rate_threshold: float = 0.8
+    open_duration: float = 30
+
+
+class HedgingSettings(BaseModel):
+    enabled: bool = False
+    percentile: float = 0.95
+    min_delay: float = 0.05
+    window_size: int = 200
+    min_samples: int = 20
+    budget: float = 0.05
+
+
+class AdmissionSettings(BaseModel):
+    rate: float = 0.5
+    burst: int = 10
+    max_concurrency: int = 20
+    max_queued_per_workspace: int = 10
+
+
+class SubmissionPipelineSettings(BaseModel):
+    database: str = str(consts.directories.DATA_DIR / "submissions.db")
+    retention: float = 604_800
+    stale_after: float = 3_600
+
+
 class Settings(BaseSettings):
     """Represents Application Settings with nested configuration sections."""
 
@@ -73,6 +141,12 @@ class Settings(BaseSettings):
     eodh: EODHSettings
     ades: ADESSettings
     sentinel_hub: SentinelHubSettings
+    http_client: HttpClientSettings = HttpClientSettings()
+    compression: CompressionSettings = CompressionSettings()
+    circuit_breaker: CircuitBreakerSettings = CircuitBreakerSettings()
+    hedging: HedgingSettings = HedgingSettings()
+    admission: AdmissionSettings = AdmissionSettings()
+    submissions: SubmissionPipelineSettings = SubmissionPipelineSettings()
 
     model_config = SettingsConfigDict(
         env_file=consts.directories.ROOT_DIR / ".env",
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
 import abc
+import contextlib
 import dataclasses
 from typing import TYPE_CHECKING, Any
 
-from aiohttp import ClientResponse, ClientSession
 from aiohttp_retry import ExponentialRetry, RetryClient
 from pydantic import BaseModel
 from starlette import status
 
+from src.services.circuit_breaker import circuit_breaker_factory
+from src.services.hedging import hedger_factory
+from src.services.session_pool import client_session_pool_factory
+from src.utils.aio import gather_with_concurrency
+
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
     from logging import Logger
     from pathlib import Path
     from uuid import UUID
 
+    from aiohttp import ClientResponse
+
+    from src.services.ades.job_index import TJobRecord, WorkspaceJobIndex
     from src.services.ades.schemas import JobList, Process, ProcessList, ProcessSummary, StatusInfo
 
 
@@ -22,18 +31,91 @@ class ErrorResponse(BaseModel):
     detail: str | dict[str, Any] | None = None
 
 
+class BatchDeleteResult(BaseModel):
+    removed_ids: list[str] = []
+    failed_ids: list[str] = []
+
+
 @dataclasses.dataclass
 class APIClient:
     url: str
     logger: Logger
 
-    def _get_retry_client(
+    @contextlib.asynccontextmanager
+    async def _request(
         self,
+        method: str,
+        url: str,
+        *,
         attempts: int = 3,
         max_timeout: float = 10,
         start_timeout: float = 2,
-    ) -> tuple[ClientSession, RetryClient]:
-        client_session = ClientSession()
+        hedge: str | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ClientResponse]:
+        """Sends a request over the shared, per-host connection pool and retries transient upstream failures.
+
+        Requests to an upstream whose circuit is open fail immediately with `CircuitOpenError`. A request probing
+        a half-open circuit is not retried. Idempotent requests may be hedged by passing the name of the operation as
+        `hedge` - a second request is sent if the first one is slower than usual for that operation.
+
+        """
+
+        def attempt() -> contextlib.AbstractAsyncContextManager[ClientResponse]:
+            return self._guarded_send(
+                method,
+                url,
+                attempts=attempts,
+                max_timeout=max_timeout,
+                start_timeout=start_timeout,
+                **kwargs,
+            )
+
+        if hedge is None:
+            async with attempt() as response:
+                yield response
+        else:
+            async with hedger_factory(url, hedge).hedged(
+                attempt, failed=lambda response: response.status >= status.HTTP_500_INTERNAL_SERVER_ERROR
+            ) as response:
+                yield response
+
+    @contextlib.asynccontextmanager
+    async def _guarded_send(
+        self,
+        method: str,
+        url: str,
+        *,
+        attempts: int,
+        max_timeout: float,
+        start_timeout: float,
+        **kwargs: Any,
+    ) -> AsyncIterator[ClientResponse]:
+        async with (
+            circuit_breaker_factory(url).guard() as outcome,
+            self._send(
+                method,
+                url,
+                attempts=1 if outcome.probe else attempts,
+                max_timeout=max_timeout,
+                start_timeout=start_timeout,
+                **kwargs,
+            ) as response,
+        ):
+            outcome.responded(failed=response.status >= status.HTTP_500_INTERNAL_SERVER_ERROR)
+            yield response
+
+    @contextlib.asynccontextmanager
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        attempts: int,
+        max_timeout: float,
+        start_timeout: float,
+        **kwargs: Any,
+    ) -> AsyncIterator[ClientResponse]:
         exp_retry = ExponentialRetry(
             attempts=attempts,
             max_timeout=max_timeout,
@@ -45,11 +127,12 @@ class APIClient:
             start_timeout=start_timeout,
         )
         retry_client = RetryClient(
-            client_session=client_session,
+            client_session=client_session_pool_factory().get(url),
             retry_options=exp_retry,
             logger=self.logger,
         )
-        return client_session, retry_client
+        async with retry_client.request(method, url, **kwargs) as response:
+            yield response
 
     async def _handle_common_errors_if_necessary(self, response: ClientResponse) -> ErrorResponse | None:
         if response.status >= status.HTTP_400_BAD_REQUEST:
@@ -100,6 +183,38 @@ class ADESClientBase(APIClient, abc.ABC):
         raw_output: bool = False,
     ) -> tuple[ErrorResponse | None, JobList | dict[str, Any] | None]: ...
 
+    async def get_many_job_details(
+        self,
+        job_ids: Iterable[str | UUID],
+        *,
+        max_concurrency: int = 10,
+    ) -> dict[str, tuple[ErrorResponse | None, StatusInfo | None]]:
+        """Fetches details of multiple jobs concurrently, duplicate IDs are fetched once.
+
+        Args:
+            job_ids: The job identifiers.
+            max_concurrency: The maximum number of concurrent ADES requests.
+
+        Returns:
+            A mapping of job ID to the result of `get_job_details` for that job.
+
+        """
+        unique_ids = list(dict.fromkeys(str(job_id) for job_id in job_ids))
+        results = await gather_with_concurrency(max_concurrency, (self.get_job_details(j) for j in unique_ids))
+        return dict(zip(unique_ids, results, strict=True))
+
+    @abc.abstractmethod
+    def stream_job_submissions(
+        self,
+        *,
+        limit: int = 100,
+        skip: int = 0,
+        statuses: Iterable[str] = (),
+    ) -> contextlib.AbstractAsyncContextManager[tuple[ErrorResponse | None, AsyncIterator[TJobRecord] | None]]: ...
+
+    @abc.abstractmethod
+    async def get_job_index(self) -> tuple[ErrorResponse | None, WorkspaceJobIndex | None]: ...
+
     @abc.abstractmethod
     async def cancel_or_delete_job(self, job_id: str | UUID) -> tuple[ErrorResponse | None, StatusInfo | None]: ...
 
@@ -117,6 +232,13 @@ class ADESClientBase(APIClient, abc.ABC):
         id_override: str | None = None,
     ) -> tuple[ErrorResponse | None, ProcessSummary | None]: ...
 
+    @abc.abstractmethod
+    async def register_process_if_changed(
+        self,
+        process_identifier: str,
+        cwl: dict[str, Any] | bytes,
+    ) -> tuple[ErrorResponse | None, ProcessSummary | None]: ...
+
     @abc.abstractmethod
     async def process_exists(self, process_identifier: str) -> tuple[ErrorResponse | None, bool | None]: ...
 
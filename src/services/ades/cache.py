@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import functools
+import hashlib
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+from src.core.settings import current_settings
+from src.services.ades.job_index import TERMINAL_STATUSES
+from src.utils.cache import TTLCache
+from src.utils.metrics import register_metrics_source
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from src.services.ades.schemas import ProcessSummary, StatusInfo
+    from src.utils.download import Validators
+
+TWorkspaceKey = tuple[str, str]
+TJobKey = tuple[str, str, str]
+
+
+def serialize_cwl(spec: dict[str, Any]) -> bytes:
+    """Serializes a parsed CWL definition in canonical JSON form.
+
+    JSON is a subset of YAML, so the result is a valid CWL document. It is much faster to emit than YAML and stable
+    enough to be fingerprinted.
+
+    Raises:
+        TypeError: If the definition contains values that have no JSON representation.
+
+    """
+    return json.dumps(
+        spec,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_yaml_timestamp,
+    ).encode("utf-8")
+
+
+def _yaml_timestamp(value: object) -> str:
+    # YAML loaders parse unquoted timestamps into dates, the only non-JSON scalars expected in CWL definitions
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    msg = f"Object of type {type(value).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+def cwl_fingerprint(cwl: dict[str, Any] | bytes) -> str:
+    """Returns a content hash of a CWL definition - parsed specs are hashed in canonical JSON form."""
+    if isinstance(cwl, dict):
+        cwl = serialize_cwl(cwl)
+    return hashlib.sha256(cwl).hexdigest()
+
+
+class ProcessRegistryCache:
+    """Per-workspace set of process identifiers registered on ADES.
+
+    Entries are populated from full process listings and expire after `ttl` seconds, which bounds how long processes
+    changed outside this application stay unnoticed. Registrations and removals made through `ADESClient` are written
+    through, so they are visible immediately. Fingerprints of definitions registered by this application are kept
+    alongside, for the same amount of time, together with the summaries ADES returned for them.
+
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._cache: TTLCache[TWorkspaceKey, set[str]] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._fingerprints: TTLCache[tuple[str, str, str], tuple[str, ProcessSummary]] = TTLCache(
+            maxsize=maxsize * 10, ttl=ttl
+        )
+
+    def contains(self, key: TWorkspaceKey, process_identifier: str) -> bool | None:
+        """Returns `None` if the workspace registry is not known yet."""
+        processes = self._cache.get(key)
+        return None if processes is None else process_identifier in processes
+
+    def reconcile(self, key: TWorkspaceKey, process_identifiers: Iterable[str]) -> None:
+        self._cache.set(key, set(process_identifiers))
+
+    def registered_summary(
+        self,
+        key: TWorkspaceKey,
+        process_identifier: str,
+        fingerprint: str,
+    ) -> ProcessSummary | None:
+        """Returns the summary of the process if this application registered it with the given definition."""
+        # A process known to be missing has been removed outside this application
+        if self.contains(key, process_identifier) is False:
+            return None
+        registered = self._fingerprints.get((*key, process_identifier))
+        return registered[1] if registered is not None and registered[0] == fingerprint else None
+
+    def add(
+        self,
+        key: TWorkspaceKey,
+        process_identifier: str,
+        fingerprint: str | None = None,
+        summary: ProcessSummary | None = None,
+    ) -> None:
+        if (processes := self._cache.get(key)) is not None:
+            processes.add(process_identifier)
+        if fingerprint is not None and summary is not None:
+            self._fingerprints.set((*key, process_identifier), (fingerprint, summary))
+        else:
+            self._fingerprints.pop((*key, process_identifier))
+
+    def discard(self, key: TWorkspaceKey, process_identifier: str) -> None:
+        if (processes := self._cache.get(key)) is not None:
+            processes.discard(process_identifier)
+        self._fingerprints.pop((*key, process_identifier))
+
+    def invalidate(self, key: TWorkspaceKey) -> None:
+        self._cache.pop(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._fingerprints.clear()
+
+    def metrics(self) -> dict[str, Any]:
+        return {"processes": self._cache.metrics(), "fingerprints": self._fingerprints.metrics()}
+
+
+class TerminalJobCache:
+    """Details and results of jobs that reached a terminal status, keyed by ADES URL, workspace and job ID.
+
+    Such jobs never change, so the entries do not expire. They are evicted only when the cache is full or dropped when
+    the job is cancelled or deleted. Cached values are shared and must not be modified.
+
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._details: TTLCache[TJobKey, StatusInfo] = TTLCache(maxsize=maxsize)
+        self._results: TTLCache[TJobKey, dict[str, Any]] = TTLCache(maxsize=maxsize)
+
+    def get_details(self, key: TJobKey) -> StatusInfo | None:
+        return self._details.get(key)
+
+    def add_details(self, key: TJobKey, status_info: StatusInfo) -> None:
+        if status_info.status in TERMINAL_STATUSES:
+            self._details.set(key, status_info)
+
+    def get_results(self, key: TJobKey) -> dict[str, Any] | None:
+        return self._results.get(key)
+
+    def add_results(self, key: TJobKey, results: dict[str, Any]) -> None:
+        self._results.set(key, results)
+
+    def discard(self, key: TJobKey) -> None:
+        self._details.pop(key)
+        self._results.pop(key)
+
+    def clear(self) -> None:
+        self._details.clear()
+        self._results.clear()
+
+    def metrics(self) -> dict[str, Any]:
+        return {"details": self._details.metrics(), "results": self._results.metrics()}
+
+
+@dataclasses.dataclass(frozen=True)
+class CWLPackage:
+    """CWL definition prepared for registration, along with what it was prepared from."""
+
+    data: bytes
+    environment: tuple[tuple[str, str], ...] = ()
+    validators: Validators | None = None
+    fetched_at: float = 0
+
+
+class CWLPackageCache:
+    """Prepared CWL definitions keyed by source URL, ID override and values of the placeholders they contain.
+
+    Packages younger than `max_age` seconds are used as is, older ones have to be revalidated against the source.
+    A package whose placeholder values no longer match the environment has to be prepared again.
+
+    """
+
+    def __init__(self, maxsize: int, max_age: float, timer: Callable[[], float] = time.monotonic) -> None:
+        self.max_age = max_age
+        self._timer = timer
+        self._cache: TTLCache[tuple[str, str | None], CWLPackage] = TTLCache(maxsize=maxsize)
+
+    def get(self, href: str, id_override: str | None) -> CWLPackage | None:
+        return self._cache.get((href, id_override))
+
+    def is_fresh(self, package: CWLPackage) -> bool:
+        return self._timer() - package.fetched_at < self.max_age
+
+    def add(self, href: str, id_override: str | None, package: CWLPackage) -> None:
+        """Stores the package as fetched or revalidated just now."""
+        self._cache.set((href, id_override), dataclasses.replace(package, fetched_at=self._timer()))
+
+    def discard(self, href: str, id_override: str | None) -> None:
+        self._cache.pop((href, id_override))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def metrics(self) -> dict[str, Any]:
+        return self._cache.metrics()
+
+
+@functools.lru_cache
+def _process_registry_cache(maxsize: int, ttl: float) -> ProcessRegistryCache:
+    cache = ProcessRegistryCache(maxsize=maxsize, ttl=ttl)
+    register_metrics_source("ades_process_registry_cache", cache.metrics)
+    return cache
+
+
+def process_registry_cache_factory() -> ProcessRegistryCache:
+    settings = current_settings()
+    return _process_registry_cache(settings.ades.process_registry_cache_size, settings.ades.process_registry_ttl)
+
+
+@functools.lru_cache
+def _terminal_job_cache(maxsize: int) -> TerminalJobCache:
+    cache = TerminalJobCache(maxsize=maxsize)
+    register_metrics_source("ades_terminal_job_cache", cache.metrics)
+    return cache
+
+
+def terminal_job_cache_factory() -> TerminalJobCache:
+    return _terminal_job_cache(current_settings().ades.terminal_job_cache_size)
+
+
+@functools.lru_cache
+def _cwl_package_cache(maxsize: int, max_age: float) -> CWLPackageCache:
+    cache = CWLPackageCache(maxsize=maxsize, max_age=max_age)
+    register_metrics_source("ades_cwl_package_cache", cache.metrics)
+    return cache
+
+
+def cwl_package_cache_factory() -> CWLPackageCache:
+    settings = current_settings()
+    return _cwl_package_cache(settings.ades.cwl_package_cache_size, settings.ades.cwl_package_max_age)
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
 import os
 import re
-from pathlib import Path
-from tempfile import TemporaryDirectory
 from typing import TYPE_CHECKING, Any
-from urllib.parse import urlparse
 
 import aiohttp
 import yaml
@@ -14,23 +13,55 @@ from dotenv import load_dotenv
 from starlette import status
 
 from src import consts
-from src.services.ades.base_client import ADESClientBase, ErrorResponse
+from src.services.ades.base_client import ADESClientBase, BatchDeleteResult, ErrorResponse
+from src.services.ades.cache import CWLPackage, cwl_fingerprint, serialize_cwl
+from src.services.ades.job_index import WorkspaceJobIndex, job_record, raw_job
+from src.services.ades.parsing import parse_collection, parse_model
 from src.services.ades.schemas import JobList, Process, ProcessList, ProcessSummary, StatusInfo
+from src.services.circuit_breaker import CircuitOpenError, circuit_breaker_factory
+from src.services.session_pool import client_session_pool_factory
+from src.utils.aio import gather_with_concurrency
+from src.utils.download import DownloadTooLargeError, Validators, read_chunks
+from src.utils.json_stream import iter_json_array
 from src.utils.logging import get_logger
 
 if TYPE_CHECKING:
     import datetime
+    from collections.abc import AsyncIterable, AsyncIterator, Iterable
     from logging import Logger
+    from pathlib import Path
     from uuid import UUID
 
+    from src.services.ades.cache import (
+        CWLPackageCache,
+        ProcessRegistryCache,
+        TerminalJobCache,
+        TJobKey,
+        TWorkspaceKey,
+    )
+    from src.services.ades.job_index import JobIndexStore, TJobRecord
+
 
 _logger = get_logger(__name__)
 
+JOB_LIST_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_MAX_SIZE = 50 * 1024 * 1024
+
+# libyaml based loader is an order of magnitude faster, if PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+PLACEHOLDER_PATTERN = re.compile(r"<<([A-Za-z\-_ ]+)>>")
+
+
+def placeholder_environment(placeholders: Iterable[str]) -> tuple[tuple[str, str], ...]:
+    """Returns the values the placeholders are currently replaced with, in a stable order."""
+    return tuple(sorted({(p, os.environ.get(p.strip(), '""')) for p in placeholders}))
+
 
 def replace_placeholders_in_text(content: str) -> str:
     load_dotenv(consts.directories.ROOT_DIR / ".env")
-    pattern = re.compile(r"<<([A-Za-z\-_ ]+)>>")
-    placeholders = re.findall(pattern=pattern, string=content)
+    placeholders = re.findall(pattern=PLACEHOLDER_PATTERN, string=content)
 
     for placeholder in placeholders:
         replacement = os.environ.get(placeholder.strip(), '""')
@@ -58,6 +89,30 @@ def override_id_in_cwl_if_necessary(file_path: Path, id_override: str | None) ->
     return file_path.read_bytes()
 
 
+def override_id_in_cwl_text(content: str, id_override: str | None) -> bytes:
+    if id_override is None:
+        return content.encode("utf-8")
+
+    data = yaml.load(content, Loader=_YAML_LOADER)  # noqa: S506
+    for obj in data["$graph"]:
+        if obj["class"] == "Workflow":
+            obj["id"] = id_override
+            break
+    return serialize_cwl(data)
+
+
+def prepare_cwl_package(content: bytes, id_override: str | None, validators: Validators | None = None) -> CWLPackage:
+    """Replaces placeholders in downloaded CWL definition and overrides its workflow ID, all in memory."""
+    text = content.decode("utf-8")
+    placeholders = PLACEHOLDER_PATTERN.findall(text)
+    text = replace_placeholders_in_text(text)
+    return CWLPackage(
+        data=override_id_in_cwl_text(text, id_override),
+        environment=placeholder_environment(placeholders),
+        validators=validators,
+    )
+
+
 class ADESClient(ADESClientBase):
     def __init__(
         self,
@@ -67,12 +122,23 @@ class ADESClient(ADESClientBase):
         workspace: str,
         token: str,
         logger: Logger,
+        process_registry: ProcessRegistryCache | None = None,
+        job_index: JobIndexStore | None = None,
+        terminal_jobs: TerminalJobCache | None = None,
+        cwl_packages: CWLPackageCache | None = None,
+        *,
+        trusted_responses: bool = False,
     ) -> None:
         super().__init__(url, logger)
         self.ogc_jobs_api_path = ogc_jobs_api_path
         self.ogc_processes_api_path = ogc_processes_api_path
         self.token = token
         self.workspace = workspace
+        self.process_registry = process_registry
+        self.job_index = job_index
+        self.terminal_jobs = terminal_jobs
+        self.cwl_packages = cwl_packages
+        self.trusted_responses = trusted_responses
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Accept": "application/json",
@@ -86,56 +152,73 @@ class ADESClient(ADESClientBase):
     def jobs_endpoint_url(self) -> str:
         return f"{self.url.strip('/')}/{self.workspace}/{self.ogc_jobs_api_path}"
 
-    async def _download_file(self, file_url: str, output_path: Path) -> tuple[ErrorResponse | None, Path | None]:
-        client_session, retry_client = self._get_retry_client()
+    @property
+    def _registry_key(self) -> TWorkspaceKey:
+        return self.url, self.workspace
+
+    def _job_key(self, job_id: str | UUID) -> TJobKey:
+        return self.url, self.workspace, str(job_id)
 
-        try:
-            async with retry_client.get(file_url) as response:
-                if err := await self._handle_common_errors_if_necessary(response):
-                    return err, None
-                parsed = urlparse(file_url)
-                fname = parsed.path.split("/")[-1]
-                fp = output_path / fname
-                fp.write_bytes(await response.content.read())
-                return None, fp
-        finally:
-            await client_session.close()
+    def _indexed_jobs(self) -> WorkspaceJobIndex | None:
+        return None if self.job_index is None else self.job_index.get(self._registry_key)
+
+    def _too_large_error(self, file_url: str, max_size: int) -> ErrorResponse:
+        self.logger.warning("File %s exceeds the maximum download size of %s bytes", file_url, max_size)
+        return ErrorResponse(
+            code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"File '{file_url}' exceeds the maximum allowed size of {max_size} bytes.",
+        )
 
     async def get_job_details(self, job_id: str | UUID) -> tuple[ErrorResponse | None, StatusInfo | None]:
-        client_session, retry_client = self._get_retry_client()
-        try:
-            async with retry_client.get(
-                url=f"{self.jobs_endpoint_url}/{job_id}",
-                headers=self.headers,
-            ) as response:
-                # ADES returns 403 when getting non-existent job
-                if response.status == status.HTTP_403_FORBIDDEN:
-                    return ErrorResponse(code=status.HTTP_404_NOT_FOUND, detail=f"Job '{job_id}' does not exist."), None
-
-                if err := await self._handle_common_errors_if_necessary(response):
-                    return err, None
-
-                return None, StatusInfo(**await response.json())
-        finally:
-            await client_session.close()
+        # Jobs in terminal status never change
+        if self.terminal_jobs is not None and (cached := self.terminal_jobs.get_details(self._job_key(job_id))):
+            return None, cached
+
+        async with self._request(
+            "GET",
+            url=f"{self.jobs_endpoint_url}/{job_id}",
+            headers=self.headers,
+            hedge="get_job_details",
+        ) as response:
+            # ADES returns 403 when getting non-existent job
+            if response.status == status.HTTP_403_FORBIDDEN:
+                return ErrorResponse(code=status.HTTP_404_NOT_FOUND, detail=f"Job '{job_id}' does not exist."), None
+
+            if err := await self._handle_common_errors_if_necessary(response):
+                return err, None
 
-    async def get_job_results(self, job_id: str | UUID) -> tuple[ErrorResponse | None, dict[str, Any] | None]:
-        client_session, retry_client = self._get_retry_client()
-        try:
-            async with retry_client.get(
-                url=f"{self.jobs_endpoint_url}/{job_id}/results",
-                headers=self.headers,
-            ) as response:
-                # ADES returns 403 when getting non-existent job
-                if response.status == status.HTTP_403_FORBIDDEN:
-                    return ErrorResponse(code=status.HTTP_404_NOT_FOUND, detail=f"Job '{job_id}' does not exist."), None
+            status_info = parse_model(StatusInfo, await response.read())
+            if (index := self._indexed_jobs()) is not None and status_info.job_id in index:
+                index.upsert(raw_job(status_info))
+            if self.terminal_jobs is not None:
+                self.terminal_jobs.add_details(self._job_key(job_id), status_info)
+            return None, status_info
 
-                if err := await self._handle_common_errors_if_necessary(response):
-                    return err, None
+    async def get_job_results(self, job_id: str | UUID) -> tuple[ErrorResponse | None, dict[str, Any] | None]:
+        key = self._job_key(job_id)
+        terminal = False
+        # Results can be cached only once the job is known to be finished, i.e. once its final status was cached
+        if self.terminal_jobs is not None and self.terminal_jobs.get_details(key) is not None:
+            if (cached := self.terminal_jobs.get_results(key)) is not None:
+                return None, cached
+            terminal = True
+
+        async with self._request(
+            "GET",
+            url=f"{self.jobs_endpoint_url}/{job_id}/results",
+            headers=self.headers,
+        ) as response:
+            # ADES returns 403 when getting non-existent job
+            if response.status == status.HTTP_403_FORBIDDEN:
+                return ErrorResponse(code=status.HTTP_404_NOT_FOUND, detail=f"Job '{job_id}' does not exist."), None
+
+            if err := await self._handle_common_errors_if_necessary(response):
+                return err, None
 
-                return None, await response.json()
-        finally:
-            await client_session.close()
+            results: dict[str, Any] = await response.json()
+            if terminal and self.terminal_jobs is not None:
+                self.terminal_jobs.add_results(key, results)
+            return None, results
 
     async def list_job_submissions(
         self,
@@ -144,90 +227,228 @@ class ADESClient(ADESClientBase):
         skip: int = 0,
         raw_output: bool = False,
     ) -> tuple[ErrorResponse | None, JobList | dict[str, Any] | None]:
-        client_session, retry_client = self._get_retry_client(max_timeout=120)
-        try:
-            async with retry_client.get(
-                url=f"{self.jobs_endpoint_url}?limit={limit}&skip={skip}",
-                headers=self.headers,
-                raise_for_status=True,
-            ) as response:
-                if err := await self._handle_common_errors_if_necessary(response):
-                    return err, None
-
-                if raw_output:
-                    return None, await response.json()
-
-                return None, JobList(**await response.json())
-        finally:
-            await client_session.close()
+        async with self._request(
+            "GET",
+            url=f"{self.jobs_endpoint_url}?limit={limit}&skip={skip}",
+            max_timeout=120,
+            headers=self.headers,
+            raise_for_status=True,
+        ) as response:
+            if err := await self._handle_common_errors_if_necessary(response):
+                return err, None
+
+            if raw_output:
+                return None, await response.json()
+
+            return None, parse_collection(JobList, await response.read(), "jobs", trusted=self.trusted_responses)
+
+    @contextlib.asynccontextmanager
+    async def stream_job_submissions(
+        self,
+        *,
+        limit: int = 100,
+        skip: int = 0,
+        statuses: Iterable[str] = (),
+    ) -> AsyncIterator[tuple[ErrorResponse | None, AsyncIterator[TJobRecord] | None]]:
+        """Streams job records without buffering the whole job list.
+
+        Jobs are parsed one by one from the response body, filtered by status and projected with `job_record`.
+        The iterator is only valid within the context.
+
+        """
+        async with self._request(
+            "GET",
+            url=f"{self.jobs_endpoint_url}?limit={limit}&skip={skip}",
+            max_timeout=120,
+            headers=self.headers,
+            raise_for_status=True,
+        ) as response:
+            if err := await self._handle_common_errors_if_necessary(response):
+                yield err, None
+                return
+
+            yield None, _job_records(response.content.iter_chunked(JOB_LIST_CHUNK_SIZE), set(statuses))
+
+    async def _sync_job_index(self) -> tuple[ErrorResponse | None, WorkspaceJobIndex | None]:
+        limit = 10000 if self.job_index is None else self.job_index.max_jobs
+        async with self.stream_job_submissions(limit=limit) as (err, records):
+            if err or records is None:
+                return err, None
+            index = WorkspaceJobIndex.from_records([record async for record in records])
+
+        if self.job_index is not None:
+            self.job_index.set(self._registry_key, index)
+        return None, index
+
+    async def _refresh_job_index(self, index: WorkspaceJobIndex) -> None:
+        pending = index.pending_job_ids()
+        concurrency = 10 if self.job_index is None else self.job_index.refresh_concurrency
+        results = await gather_with_concurrency(concurrency, (self.get_job_details(job_id) for job_id in pending))
+        for job_id, (err, status_info) in zip(pending, results, strict=True):
+            if status_info is not None:
+                index.upsert(raw_job(status_info))
+            elif err is not None and err.code == status.HTTP_404_NOT_FOUND:
+                index.remove(job_id)
+        index.mark_refreshed()
+
+    async def get_job_index(self) -> tuple[ErrorResponse | None, WorkspaceJobIndex | None]:
+        if self.job_index is None:
+            return await self._sync_job_index()
+
+        key = self._registry_key
+        if (index := self.job_index.get(key)) is None:
+            return await self.job_index.flights.do(("sync", *key), self._sync_job_index)  # type: ignore[no-any-return]
+
+        if index.needs_refresh(self.job_index.refresh_interval):
+            await self.job_index.flights.do(("refresh", *key), lambda: self._refresh_job_index(index))
+        return None, index
 
     async def cancel_or_delete_job(self, job_id: str | UUID) -> tuple[ErrorResponse | None, StatusInfo | None]:
-        client_session, retry_client = self._get_retry_client()
         try:
-            async with retry_client.delete(
-                url=f"{self.jobs_endpoint_url}/{job_id}",
-                headers=self.headers,
-            ) as response:
-                # ADES returns 403 when cancelling non-existent job
-                if response.status == status.HTTP_403_FORBIDDEN:
-                    return ErrorResponse(code=status.HTTP_404_NOT_FOUND, detail=f"Job '{job_id}' does not exist."), None
-
-                if response.status == status.HTTP_501_NOT_IMPLEMENTED:
-                    return ErrorResponse(
-                        code=status.HTTP_501_NOT_IMPLEMENTED,
-                        detail="Job cancellation is not implemented.",
-                    ), None
-
-                if err := await self._handle_common_errors_if_necessary(response):
-                    return err, None
-
-                return None, StatusInfo(**json.loads(await response.text()))
+            return await self._cancel_or_delete_job(job_id)
         finally:
-            await client_session.close()
+            # The job is gone or changed, whatever the outcome - stop serving it from cache
+            if self.terminal_jobs is not None:
+                self.terminal_jobs.discard(self._job_key(job_id))
+
+    async def _cancel_or_delete_job(self, job_id: str | UUID) -> tuple[ErrorResponse | None, StatusInfo | None]:
+        async with self._request(
+            "DELETE",
+            url=f"{self.jobs_endpoint_url}/{job_id}",
+            headers=self.headers,
+        ) as response:
+            # ADES returns 403 when cancelling non-existent job
+            if response.status == status.HTTP_403_FORBIDDEN:
+                if (index := self._indexed_jobs()) is not None:
+                    index.remove(str(job_id))
+                return ErrorResponse(code=status.HTTP_404_NOT_FOUND, detail=f"Job '{job_id}' does not exist."), None
+
+            if response.status == status.HTTP_501_NOT_IMPLEMENTED:
+                return ErrorResponse(
+                    code=status.HTTP_501_NOT_IMPLEMENTED,
+                    detail="Job cancellation is not implemented.",
+                ), None
+
+            if err := await self._handle_common_errors_if_necessary(response):
+                return err, None
+
+            if (index := self._indexed_jobs()) is not None:
+                index.remove(str(job_id))
+            return None, parse_model(StatusInfo, await response.read())
+
+    async def _download_cwl(self, cwl_href: str, id_override: str | None) -> tuple[ErrorResponse | None, bytes | None]:
+        cache = self.cwl_packages
+        package = None if cache is None else cache.get(cwl_href, id_override)
+        if package is not None and placeholder_environment(p for p, _ in package.environment) != package.environment:
+            package = None
+        if cache is not None and package is not None and cache.is_fresh(package):
+            return None, package.data
+
+        validators = None if package is None else package.validators
+        headers = {} if validators is None else validators.request_headers()
+        async with self._request("GET", cwl_href, headers=headers) as response:
+            if cache is not None and package is not None and response.status == status.HTTP_304_NOT_MODIFIED:
+                cache.add(cwl_href, id_override, package)
+                return None, package.data
+            if err := await self._handle_common_errors_if_necessary(response):
+                return err, None
+            if int(response.headers.get("Content-Length") or 0) > DOWNLOAD_MAX_SIZE:
+                return self._too_large_error(cwl_href, DOWNLOAD_MAX_SIZE), None
+            try:
+                content = await read_chunks(response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE), DOWNLOAD_MAX_SIZE)
+            except DownloadTooLargeError:
+                return self._too_large_error(cwl_href, DOWNLOAD_MAX_SIZE), None
+            validators = Validators.from_headers(response.headers)
+
+        package = prepare_cwl_package(content, id_override, validators)
+        if cache is not None:
+            cache.add(cwl_href, id_override, package)
+        return None, package.data
+
+    async def _post_process_definition(
+        self,
+        data: bytes,
+        *,
+        source: str,
+        fingerprint: str | None = None,
+    ) -> tuple[ErrorResponse | None, ProcessSummary | None]:
+        async with self._request(
+            "POST",
+            url=self.processes_endpoint_url,
+            headers=self.headers | {"Content-Type": "application/cwl+yaml"},
+            data=data,
+        ) as response:
+            if response.status == status.HTTP_400_BAD_REQUEST:
+                return ErrorResponse(
+                    code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid payload.",
+                ), None
+            if response.status == status.HTTP_409_CONFLICT:
+                return ErrorResponse(
+                    code=status.HTTP_409_CONFLICT,
+                    detail=f"Process with identical identifier as in '{source}' already exists.",
+                ), None
+            summary = parse_model(ProcessSummary, await response.read())
+            if self.process_registry is not None:
+                self.process_registry.add(self._registry_key, summary.id, fingerprint, summary)
+            return None, summary
 
     async def register_process_from_cwl_href_with_download(
         self,
         cwl_href: str,
         id_override: str | None = None,
     ) -> tuple[ErrorResponse | None, ProcessSummary | None]:
-        with TemporaryDirectory() as tmp_dir:
-            tmp_dir_path = Path(tmp_dir)
-            err, fp = await self._download_file(file_url=cwl_href, output_path=tmp_dir_path)
-            if err:
-                return err, None
-            if fp is None:
-                return ErrorResponse(code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error."), None
-            replace_placeholders_in_cwl_file(fp)
-            return await self.register_process_from_local_cwl_file(fp, id_override)
+        err, data = await self._download_cwl(cwl_href, id_override)
+        if err:
+            return err, None
+        return await self._post_process_definition(data, source=cwl_href)  # type: ignore[arg-type]
 
     async def register_process_from_local_cwl_file(
         self,
         cwl_location: Path,
         id_override: str | None = None,
     ) -> tuple[ErrorResponse | None, ProcessSummary | None]:
-        client_session, retry_client = self._get_retry_client()
-        try:
-            data = override_id_in_cwl_if_necessary(cwl_location, id_override)
-            async with retry_client.post(
-                url=self.processes_endpoint_url,
-                headers=self.headers | {"Content-Type": "application/cwl+yaml"},
-                data=data,
-            ) as response:
-                if response.status == status.HTTP_400_BAD_REQUEST:
-                    return ErrorResponse(
-                        code=status.HTTP_400_BAD_REQUEST,
-                        detail="Invalid payload.",
-                    ), None
-                if response.status == status.HTTP_409_CONFLICT:
-                    return ErrorResponse(
-                        code=status.HTTP_409_CONFLICT,
-                        detail=f"Process with identical identifier as in '{cwl_location}' already exists.",
-                    ), None
-                return None, ProcessSummary(**await response.json())
-        finally:
-            await client_session.close()
+        data = await asyncio.to_thread(override_id_in_cwl_if_necessary, cwl_location, id_override)
+        return await self._post_process_definition(data, source=str(cwl_location))
+
+    async def register_process_if_changed(
+        self,
+        process_identifier: str,
+        cwl: dict[str, Any] | bytes,
+    ) -> tuple[ErrorResponse | None, ProcessSummary | None]:
+        """Registers the CWL definition as `process_identifier`, replacing the existing process if any.
+
+        Unregister and register calls are skipped when an identical definition was already registered by this
+        service and ADES still describes the process as it did when registering it - no summary is returned in that
+        case. Processes registered by anything else are always registered again.
+
+        """
+        # Parsed specs are serialized once - the same bytes are fingerprinted and sent to ADES
+        data = cwl if isinstance(cwl, bytes) else serialize_cwl(cwl)
+        fingerprint = cwl_fingerprint(data)
+        registry = self.process_registry
+        key = self._registry_key
+        registered = None if registry is None else registry.registered_summary(key, process_identifier, fingerprint)
+        # Fingerprints are known only to this instance - the process may have been replaced or removed since.
+        # If its description cannot be fetched, the process is registered again.
+        if registered is not None:
+            _, deployed = await self.get_process_details(process_identifier)
+            if deployed is not None and _same_process(deployed, registered):
+                return None, None
+
+        if registry is None or registry.contains(key, process_identifier) is not False:
+            err = await self.unregister_process(process_identifier)
+            if err is not None and err.code != status.HTTP_404_NOT_FOUND:
+                return err, None
+
+        return await self._post_process_definition(data, source=process_identifier, fingerprint=fingerprint)
 
     async def process_exists(self, process_identifier: str) -> tuple[ErrorResponse | None, bool | None]:
+        if self.process_registry is not None and (
+            (exists := self.process_registry.contains(self._registry_key, process_identifier)) is not None
+        ):
+            return None, exists
+
         err, user_processes = await self.list_processes()
         if err:
             return err, None
@@ -257,88 +478,97 @@ class ADESClient(ADESClientBase):
         return err
 
     async def list_processes(self) -> tuple[ErrorResponse | None, ProcessList | None]:
-        client_session, retry_client = self._get_retry_client()
-        try:
-            async with retry_client.get(
-                url=self.processes_endpoint_url,
-                headers=self.headers,
-                raise_for_status=True,
-            ) as response:
-                if err := await self._handle_common_errors_if_necessary(response):
-                    return err, None
-
-                return None, ProcessList(**await response.json())
-        finally:
-            await client_session.close()
+        async with self._request(
+            "GET",
+            url=self.processes_endpoint_url,
+            headers=self.headers,
+            raise_for_status=True,
+            hedge="list_processes",
+        ) as response:
+            if err := await self._handle_common_errors_if_necessary(response):
+                return err, None
+
+            process_list = parse_collection(
+                ProcessList,
+                await response.read(),
+                "processes",
+                trusted=self.trusted_responses,
+            )
+            if self.process_registry is not None:
+                self.process_registry.reconcile(self._registry_key, (p.id for p in process_list.processes))
+            return None, process_list
 
     async def get_process_details(self, process_identifier: str) -> tuple[ErrorResponse | None, Process | None]:
-        client_session, retry_client = self._get_retry_client()
-        try:
-            async with retry_client.get(
-                url=f"{self.processes_endpoint_url}/{process_identifier}",
-                headers=self.headers,
-            ) as response:
-                if response.status == status.HTTP_404_NOT_FOUND:
-                    return ErrorResponse(
-                        code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Process '{process_identifier}' does not exist.",
-                    ), None
-                return None, Process(**await response.json())
-        finally:
-            await client_session.close()
+        async with self._request(
+            "GET",
+            url=f"{self.processes_endpoint_url}/{process_identifier}",
+            headers=self.headers,
+        ) as response:
+            if response.status == status.HTTP_404_NOT_FOUND:
+                return ErrorResponse(
+                    code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Process '{process_identifier}' does not exist.",
+                ), None
+            if err := await self._handle_common_errors_if_necessary(response):
+                return err, None
+            return None, parse_model(Process, await response.read())
 
     async def execute_process(
         self,
         process_identifier: str,
         process_inputs: dict[str, Any],
     ) -> tuple[ErrorResponse | None, StatusInfo | None]:
-        client_session, retry_client = self._get_retry_client()
-        try:
-            if "inputs" not in process_inputs:
-                process_inputs = {"inputs": process_inputs}
-
-            if "workspace" not in process_inputs["inputs"]:
-                process_inputs["inputs"]["workspace"] = self.workspace
-
-            _logger.info("Executing process: %s with inputs: %s", process_identifier, json.dumps(process_inputs))
-
-            async with retry_client.post(
-                url=f"{self.processes_endpoint_url}/{process_identifier}/execution",
-                headers=self.headers | {"Content-Type": "application/json", "Prefer": "respond-async"},
-                json=process_inputs,
-            ) as response:
-                if response.status == status.HTTP_404_NOT_FOUND:
-                    return ErrorResponse(
-                        code=status.HTTP_404_NOT_FOUND, detail=f"Process '{process_identifier}' does not exist."
-                    ), None
-
-                if err := await self._handle_common_errors_if_necessary(response):
-                    return err, None
+        if "inputs" not in process_inputs:
+            process_inputs = {"inputs": process_inputs}
+
+        if "workspace" not in process_inputs["inputs"]:
+            process_inputs["inputs"]["workspace"] = self.workspace
+
+        _logger.info("Executing process: %s with inputs: %s", process_identifier, json.dumps(process_inputs))
+
+        async with self._request(
+            "POST",
+            url=f"{self.processes_endpoint_url}/{process_identifier}/execution",
+            headers=self.headers | {"Content-Type": "application/json", "Prefer": "respond-async"},
+            json=process_inputs,
+        ) as response:
+            if response.status == status.HTTP_404_NOT_FOUND:
+                return ErrorResponse(
+                    code=status.HTTP_404_NOT_FOUND, detail=f"Process '{process_identifier}' does not exist."
+                ), None
+
+            if err := await self._handle_common_errors_if_necessary(response):
+                return err, None
 
-                return None, StatusInfo(**await response.json())
-        finally:
-            await client_session.close()
+            status_info = parse_model(StatusInfo, await response.read())
+            if (index := self._indexed_jobs()) is not None:
+                index.upsert(raw_job(status_info))
+            return None, status_info
 
     async def unregister_process(self, process_identifier: str) -> ErrorResponse | None:
-        client_session, retry_client = self._get_retry_client()
-        try:
-            async with retry_client.delete(
-                url=f"{self.processes_endpoint_url}/{process_identifier}",
-                headers=self.headers,
-            ) as response:
-                if response.status == status.HTTP_403_FORBIDDEN:
-                    # ADES returns 403 when unregistering process that does not exist
-                    return ErrorResponse(
-                        code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Process '{process_identifier}' does not exist.",
-                    )
-
-                if err := await self._handle_common_errors_if_necessary(response):
-                    return err
+        async with self._request(
+            "DELETE",
+            url=f"{self.processes_endpoint_url}/{process_identifier}",
+            headers=self.headers,
+        ) as response:
+            if response.status == status.HTTP_403_FORBIDDEN:
+                # ADES returns 403 when unregistering process that does not exist
+                if self.process_registry is not None:
+                    self.process_registry.discard(self._registry_key, process_identifier)
+                return ErrorResponse(
+                    code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Process '{process_identifier}' does not exist.",
+                )
 
-                return None
-        finally:
-            await client_session.close()
+            if err := await self._handle_common_errors_if_necessary(response):
+                # The outcome is unknown - fall back to a full listing on the next lookup
+                if self.process_registry is not None:
+                    self.process_registry.invalidate(self._registry_key)
+                return err
+
+            if self.process_registry is not None:
+                self.process_registry.discard(self._registry_key, process_identifier)
+            return None
 
     async def reregister_process(
         self,
@@ -352,11 +582,48 @@ class ADESClient(ADESClientBase):
                 detail=f"Process '{process_identifier}' does not exist in Action Creator Function Registry. "
                 f"Have you made a typo?",
             ), None
-        if await self.process_exists(process_identifier):
-            _ = await self.unregister_process(process_identifier)
         cwl_href = wf_registry[process_identifier]["cwl_href"]
         id_override = wf_id_override_lookup.get(process_identifier, process_identifier)
-        return await self.register_process_from_cwl_href_with_download(cwl_href, id_override=id_override)
+        err, data = await self._download_cwl(cwl_href, id_override)
+        if err:
+            return err, None
+        # The process is registered under the overridden identifier
+        return await self.register_process_if_changed(id_override, data)  # type: ignore[arg-type]
+
+    async def _has_results(self, stac_endpoint: str, job: dict[str, Any]) -> bool:
+        stac_search_url = (
+            f"{stac_endpoint}/catalogs/user/catalogs/{self.workspace}/catalogs/processing-results"
+            f"/catalogs/{job['processID']}/catalogs/cat_{job['jobID']}/search"
+        )
+        async with (
+            circuit_breaker_factory(stac_search_url).guard() as outcome,
+            client_session_pool_factory()
+            .get(stac_search_url)
+            .post(
+                stac_search_url,
+                headers={
+                    "Authorization": f"Bearer {self.token}",
+                    "Accept": "application/json",
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "limit": 1,
+                    "sortby": [{"field": "properties.datetime", "direction": "desc"}],
+                    "filter-lang": "cql-json",
+                    "fields": {},
+                },
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as response,
+        ):
+            outcome.responded(failed=response.status >= status.HTTP_500_INTERNAL_SERVER_ERROR)
+            if response.status == status.HTTP_200_OK:
+                return True
+            _logger.info(
+                "EODH STAC API returned: %s for job: %s - job has no results.",
+                response.status,
+                job["jobID"],
+            )
+            return False
 
     async def batch_cancel_or_delete_jobs(  # noqa: C901
         self,
@@ -367,16 +634,16 @@ class ADESClient(ADESClientBase):
         remove_all_after: datetime.datetime | None = None,
         max_jobs_to_process: int = 1000,
         remove_jobs_without_results: bool = False,
-    ) -> tuple[ErrorResponse | None, list[str] | None]:
-        if remove_statuses is None:
-            remove_statuses = []
+        max_concurrency: int = 10,
+    ) -> tuple[ErrorResponse | None, BatchDeleteResult | None]:
+        """Cancels or deletes all matching jobs, processing up to `max_concurrency` jobs at once.
 
-        removed_ids = []
+        Failures are reported per job. An error is returned only if the job listing failed or if none of the matching
+        jobs could be removed.
 
-        async def delete_job(job: dict[str, Any]) -> ErrorResponse | None:
-            err, _ = await self.cancel_or_delete_job(job["jobID"])
-            removed_ids.append(job["jobID"])
-            return err
+        """
+        if remove_statuses is None:
+            remove_statuses = []
 
         jobs: dict[str, Any] | None
         err, jobs = await self.list_job_submissions(raw_output=True, limit=max_jobs_to_process)
@@ -385,62 +652,73 @@ class ADESClient(ADESClientBase):
 
         assert jobs is not None  # noqa: S101
 
-        for job in jobs["jobs"]:
-            _logger.info("Running batch delete for job history, processing job: %s", job["jobID"])
-
+        async def should_remove(job: dict[str, Any]) -> bool:
             if job["status"] in remove_statuses:
                 _logger.info("Removing job: %s with status: %s", job["jobID"], job["status"])
-                err = await delete_job(job)
-                if err:
-                    return err, None
-                continue
+                return True
 
             if remove_all_after and job["created"] > remove_all_after.isoformat():
                 _logger.info(
                     "Removing job submission %s, because it is after cutoff date: %s", job["jobID"], job["created"]
                 )
-                err = await delete_job(job)
-                if err:
-                    return err, None
-                continue
+                return True
 
             if remove_all_before and job["created"] < remove_all_before.isoformat():
                 _logger.info(
                     "Removing job submission %s, because it is before cutoff date: %s", job["jobID"], job["created"]
                 )
-                err = await delete_job(job)
-                if err:
-                    return err, None
-                continue
+                return True
 
             if job["status"] == "successful" and remove_jobs_without_results:
-                async with (
-                    aiohttp.ClientSession() as session,
-                    session.post(
-                        f"{stac_endpoint}/catalogs/user/catalogs/{self.workspace}/catalogs/processing-results/catalogs/{job['processID']}/catalogs/cat_{job['jobID']}/search",
-                        headers={
-                            "Authorization": f"Bearer {self.token}",
-                            "Accept": "application/json",
-                            "Content-Type": "application/json",
-                        },
-                        json={
-                            "limit": 1,
-                            "sortby": [{"field": "properties.datetime", "direction": "desc"}],
-                            "filter-lang": "cql-json",
-                            "fields": {},
-                        },
-                        timeout=aiohttp.ClientTimeout(total=30),
-                    ) as response,
-                ):
-                    if response.status == status.HTTP_200_OK:
-                        continue
-                    _logger.info(
-                        "Removing job: %s - EODH STAC API returned: %s - job has no results.",
-                        job["jobID"],
-                        response.status,
-                    )
-                    err = await delete_job(job)
-                    if err:
-                        return err, None
-
-        return None, removed_ids
+                try:
+                    return not await self._has_results(stac_endpoint, job)
+                except (aiohttp.ClientError, TimeoutError, CircuitOpenError):
+                    # Never remove a job whose results could not be verified
+                    _logger.exception("Could not check results of job: %s, skipping", job["jobID"])
+
+            return False
+
+        async def process_job(job: dict[str, Any]) -> tuple[str, ErrorResponse | None] | None:
+            _logger.info("Running batch delete for job history, processing job: %s", job["jobID"])
+            if not await should_remove(job):
+                return None
+            try:
+                err, _ = await self.cancel_or_delete_job(job["jobID"])
+            except CircuitOpenError as e:
+                err = ErrorResponse(code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+            except (aiohttp.ClientError, TimeoutError) as e:
+                _logger.exception("Failed to remove job: %s", job["jobID"])
+                err = ErrorResponse(code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+            return job["jobID"], err
+
+        outcomes = await gather_with_concurrency(max_concurrency, (process_job(job) for job in jobs["jobs"]))
+
+        result = BatchDeleteResult()
+        errors: list[ErrorResponse] = []
+        for outcome in outcomes:
+            if outcome is None:
+                continue
+            job_id, err = outcome
+            # Job that no longer exists is as good as removed
+            if err is None or err.code == status.HTTP_404_NOT_FOUND:
+                result.removed_ids.append(job_id)
+            else:
+                result.failed_ids.append(job_id)
+                errors.append(err)
+
+        if errors and not result.removed_ids:
+            return errors[0], None
+
+        return None, result
+
+
+async def _job_records(chunks: AsyncIterable[bytes], statuses: set[str]) -> AsyncIterator[TJobRecord]:
+    async for job in iter_json_array(chunks, "jobs"):
+        if not statuses or job["status"] in statuses:
+            yield job_record(job)
+
+
+def _same_process(deployed: ProcessSummary, registered: ProcessSummary) -> bool:
+    """Compares process descriptions, ignoring links which differ between process summaries and descriptions."""
+    fields = set(ProcessSummary.model_fields) - {"links"}
+    return deployed.model_dump(include=fields) == registered.model_dump(include=fields)
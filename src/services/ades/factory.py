@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 from src.core.settings import current_settings
+from src.services.ades.cache import (
+    cwl_package_cache_factory,
+    process_registry_cache_factory,
+    terminal_job_cache_factory,
+)
 from src.services.ades.client import ADESClient
+from src.services.ades.job_index import job_index_store_factory
 from src.utils.logging import get_logger
 
 
@@ -15,4 +21,9 @@ def ades_client_factory(workspace: str, token: str) -> ADESClient:
         workspace=workspace,
         logger=get_logger("ades"),
         token=token,
+        process_registry=process_registry_cache_factory(),
+        job_index=job_index_store_factory(),
+        terminal_jobs=terminal_job_cache_factory(),
+        cwl_packages=cwl_package_cache_factory(),
+        trusted_responses=settings.ades.trusted_responses,
     )
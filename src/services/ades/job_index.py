@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import functools
+import time
+from typing import TYPE_CHECKING, Any
+
+from src.core.settings import current_settings
+from src.services.ades.schemas import StatusCode
+from src.utils.cache import TTLCache
+from src.utils.metrics import register_metrics_source
+from src.utils.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from src.services.ades.schemas import StatusInfo
+
+TERMINAL_STATUSES = frozenset({StatusCode.successful, StatusCode.failed, StatusCode.dismissed})
+
+TWorkspaceKey = tuple[str, str]
+TJobRecord = dict[str, Any]
+
+
+def job_record(job: dict[str, Any]) -> TJobRecord:
+    """Converts raw ADES job into a record used by the history endpoints."""
+    return {
+        "job_id": job["jobID"],
+        "process_id": job.get("processID"),
+        "status": job["status"],
+        "submitted_at": job.get("created"),
+        "finished_at": job.get("finished"),
+        "successful": True if job["status"] == "successful" else False if job["status"] == "failed" else None,
+    }
+
+
+def raw_job(status_info: StatusInfo) -> dict[str, Any]:
+    return status_info.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+class WorkspaceJobIndex:
+    """In-memory index of the jobs of a single workspace.
+
+    Sorted views are built lazily for each ordering key and direction and dropped whenever the index changes.
+
+    """
+
+    def __init__(self, jobs: Iterable[dict[str, Any]], *, timer: Callable[[], float] = time.monotonic) -> None:
+        self._timer = timer
+        self._jobs: dict[str, TJobRecord] = {job["jobID"]: job_record(job) for job in jobs}
+        self._views: dict[tuple[str, bool], list[TJobRecord]] = {}
+        self.refreshed_at = timer()
+        # Incremented on every change, lets consumers skip unchanged indexes
+        self.version = 0
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[TJobRecord],
+        *,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> WorkspaceJobIndex:
+        """Builds the index from records already projected with `job_record`."""
+        index = cls((), timer=timer)
+        index._jobs = {record["job_id"]: record for record in records}
+        return index
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def __iter__(self) -> Iterator[TJobRecord]:
+        return iter(self._jobs.values())
+
+    def pending_job_ids(self) -> list[str]:
+        return [job_id for job_id, job in self._jobs.items() if job["status"] not in TERMINAL_STATUSES]
+
+    def needs_refresh(self, interval: float) -> bool:
+        return self._timer() - self.refreshed_at >= interval and any(
+            job["status"] not in TERMINAL_STATUSES for job in self._jobs.values()
+        )
+
+    def mark_refreshed(self) -> None:
+        self.refreshed_at = self._timer()
+
+    def upsert(self, job: dict[str, Any]) -> None:
+        record = job_record(job)
+        if (existing := self._jobs.get(record["job_id"])) is not None:
+            # Keep the submission time as originally listed so that ordering stays stable
+            record["submitted_at"] = existing["submitted_at"] or record["submitted_at"]
+            if existing == record:
+                return
+        self._jobs[record["job_id"]] = record
+        self._views.clear()
+        self.version += 1
+
+    def remove(self, job_id: str) -> None:
+        if self._jobs.pop(job_id, None) is not None:
+            self._views.clear()
+            self.version += 1
+
+    def sorted(self, order_by: str, *, descending: bool = False) -> list[TJobRecord]:
+        key = (order_by, descending)
+        if (view := self._views.get(key)) is None:
+            # Use tuples to handle None items - tuples are sorted item by item
+            view = sorted(
+                self._jobs.values(),
+                key=lambda x: (x[order_by] is None, x[order_by]),
+                reverse=descending,
+            )
+            self._views[key] = view
+        return view
+
+    def query(self, order_by: str, *, descending: bool = False, statuses: Iterable[str] = ()) -> list[TJobRecord]:
+        view = self.sorted(order_by, descending=descending)
+        if statuses := set(statuses):
+            return [job for job in view if job["status"] in statuses]
+        return view
+
+
+class JobIndexStore:
+    """Process-wide job indexes, one per ADES workspace.
+
+    An index is built from a full job listing and dropped after `full_sync_interval` seconds, which picks up jobs
+    submitted or removed outside this application. Between full listings only non-terminal jobs are re-fetched, at
+    most once every `refresh_interval` seconds.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int,
+        full_sync_interval: float,
+        refresh_interval: float,
+        max_jobs: int,
+        refresh_concurrency: int,
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self.max_jobs = max_jobs
+        self.refresh_concurrency = refresh_concurrency
+        self._indexes: TTLCache[TWorkspaceKey, WorkspaceJobIndex] = TTLCache(maxsize=maxsize, ttl=full_sync_interval)
+        self.flights: SingleFlight[tuple[str, str, str], Any] = SingleFlight()
+
+    def get(self, key: TWorkspaceKey) -> WorkspaceJobIndex | None:
+        return self._indexes.get(key)
+
+    def set(self, key: TWorkspaceKey, index: WorkspaceJobIndex) -> None:
+        self._indexes.set(key, index)
+
+    def invalidate(self, key: TWorkspaceKey) -> None:
+        self._indexes.pop(key)
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+    def metrics(self) -> dict[str, Any]:
+        return {"indexes": self._indexes.metrics(), "flights": self.flights.metrics()}
+
+
+@functools.lru_cache
+def _job_index_store(
+    maxsize: int,
+    full_sync_interval: float,
+    refresh_interval: float,
+    max_jobs: int,
+    refresh_concurrency: int,
+) -> JobIndexStore:
+    store = JobIndexStore(
+        maxsize=maxsize,
+        full_sync_interval=full_sync_interval,
+        refresh_interval=refresh_interval,
+        max_jobs=max_jobs,
+        refresh_concurrency=refresh_concurrency,
+    )
+    register_metrics_source("ades_job_index", store.metrics)
+    return store
+
+
+def job_index_store_factory() -> JobIndexStore:
+    settings = current_settings().ades
+    return _job_index_store(
+        settings.job_index_cache_size,
+        settings.job_index_full_sync_interval,
+        settings.job_index_refresh_interval,
+        settings.job_index_max_jobs,
+        settings.job_index_refresh_concurrency,
+    )
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import functools
+import typing
+from typing import Any
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+
+@functools.cache
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def parse_model[M: BaseModel](model: type[M], body: bytes) -> M:
+    """Parses and validates the response body in one pass, without building intermediate Python objects."""
+    return model.model_validate_json(body)
+
+
+def parse_collection[M: BaseModel](model: type[M], body: bytes, items_field: str, *, trusted: bool = False) -> M:
+    """Parses a response listing many items, e.g. jobs or processes.
+
+    Responses from trusted upstreams are parsed with orjson and their items are validated in one batch with a cached
+    `TypeAdapter`. The other fields are small and validated as usual.
+
+    Args:
+        model: The model of the response, `items_field` must be annotated as `list` of models.
+        body: The response body.
+        items_field: The name of the field holding the items.
+        trusted: Whether the response comes from a trusted upstream.
+
+    Returns:
+        The parsed response.
+
+    """
+    if not trusted:
+        return parse_model(model, body)
+
+    field = model.model_fields[items_field]
+    (item_model,) = typing.get_args(field.annotation)
+    key = field.alias or items_field
+    data = orjson.loads(body)
+    if not isinstance(data, dict) or not isinstance(items := data.get(key), list):
+        # Malformed response - reported by the validation
+        return model.model_validate(data)
+    return model.model_validate({**data, key: _list_adapter(item_model).validate_python(items)})
@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import functools
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import UTC, datetime
+from enum import StrEnum, auto
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from starlette import status
+
+from src.core.settings import current_settings
+from src.services.ades.base_client import ErrorResponse
+from src.services.ades.schemas import StatusCode
+from src.services.admission import submission_admission_factory
+from src.services.circuit_breaker import CircuitOpenError
+from src.utils.logging import get_logger
+from src.utils.metrics import register_metrics_source
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from src.services.ades.base_client import ADESClientBase
+    from src.services.ades.job_index import TJobRecord
+    from src.services.admission import AdmissionTicket, SubmissionAdmission
+
+_logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    submission_id TEXT PRIMARY KEY,
+    workspace TEXT NOT NULL,
+    workflow_identifier TEXT NOT NULL,
+    state TEXT NOT NULL,
+    job_id TEXT,
+    error TEXT,
+    submitted_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS submissions_workspace_job_id ON submissions (workspace, job_id);
+CREATE INDEX IF NOT EXISTS submissions_submitted_at ON submissions (submitted_at);
+"""
+_COLUMNS = "submission_id, workspace, workflow_identifier, state, job_id, error, submitted_at, finished_at"
+_INSERT = f"INSERT INTO submissions ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"  # noqa: S608
+# SQLite limits the number of bound parameters
+_MAX_QUERY_PARAMS = 500
+
+
+class SubmissionState(StrEnum):
+    queued = auto()
+    submitted = auto()
+    failed = auto()
+    cancelled = auto()
+
+
+# Lets submissions that have not reached ADES be reported like ADES jobs
+_ADES_STATUS_LOOKUP = {
+    SubmissionState.queued: StatusCode.accepted,
+    SubmissionState.submitted: StatusCode.accepted,
+    SubmissionState.failed: StatusCode.failed,
+    SubmissionState.cancelled: StatusCode.dismissed,
+}
+
+
+@dataclasses.dataclass
+class Submission:
+    """A workflow submission accepted by the API, mapped to the ADES job once the workflow is executed."""
+
+    submission_id: str
+    workspace: str
+    workflow_identifier: str
+    submitted_at: datetime
+    state: SubmissionState = SubmissionState.queued
+    job_id: str | None = None
+    error: ErrorResponse | None = None
+    finished_at: datetime | None = None
+
+    def finish(self, state: SubmissionState, error: ErrorResponse | None = None) -> None:
+        self.state = state
+        self.error = error
+        self.finished_at = datetime.now(UTC)
+
+    def job_record(self) -> TJobRecord:
+        """Converts the submission into a job record, as used by the history endpoints, with the ADES status."""
+        return {
+            "job_id": self.submission_id,
+            "process_id": self.workflow_identifier,
+            "status": _ADES_STATUS_LOOKUP[self.state],
+            "submitted_at": self.submitted_at.isoformat(),
+            "finished_at": None if self.finished_at is None else self.finished_at.isoformat(),
+            "successful": False if self.state == SubmissionState.failed else None,
+            "error": None if self.error is None else self.error.model_dump(),
+        }
+
+
+def _submission_row(submission: Submission) -> tuple[Any, ...]:
+    return (
+        submission.submission_id,
+        submission.workspace,
+        submission.workflow_identifier,
+        str(submission.state),
+        submission.job_id,
+        None if submission.error is None else submission.error.model_dump_json(),
+        submission.submitted_at.timestamp(),
+        None if submission.finished_at is None else submission.finished_at.timestamp(),
+    )
+
+
+class SubmissionStore:
+    """Keeps workflow submissions in an SQLite database shared by the workers of the host and kept across restarts.
+
+    Submissions are dropped `retention` seconds after they were made. A submission still queued after `stale_after`
+    seconds was lost, most likely with the worker that accepted it, and is reported as failed.
+
+    Methods block on database access, async callers should run them in a thread.
+
+    Args:
+        database: The path of the database file, or `:memory:` for a private in-memory database.
+        retention: How long to keep submissions for, in seconds.
+        stale_after: How long a submission can wait for its turn, in seconds.
+        timer: Returns the current time as a POSIX timestamp.
+
+    """
+
+    def __init__(
+        self,
+        database: str,
+        *,
+        retention: float,
+        stale_after: float,
+        timer: Callable[[], float] = time.time,
+    ) -> None:
+        self.retention = retention
+        self.stale_after = stale_after
+        self._timer = timer
+        if database != ":memory:":
+            Path(database).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode, every statement is a transaction of its own
+        self._db = sqlite3.connect(database, timeout=10, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def _submission(self, row: tuple[Any, ...]) -> Submission:
+        submission_id, workspace, workflow_identifier, state, job_id, error, submitted_at, finished_at = row
+        submission = Submission(
+            submission_id=submission_id,
+            workspace=workspace,
+            workflow_identifier=workflow_identifier,
+            submitted_at=datetime.fromtimestamp(submitted_at, UTC),
+            state=SubmissionState(state),
+            job_id=job_id,
+            error=None if error is None else ErrorResponse.model_validate_json(error),
+            finished_at=None if finished_at is None else datetime.fromtimestamp(finished_at, UTC),
+        )
+        if submission.state == SubmissionState.queued and self._timer() - submitted_at > self.stale_after:
+            submission.finish(
+                SubmissionState.failed,
+                ErrorResponse(code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Submission was not completed"),
+            )
+        return submission
+
+    def _select(self, where: str, params: Iterable[Any]) -> list[Submission]:
+        with self._lock:
+            rows = self._db.execute(f"SELECT {_COLUMNS} FROM submissions WHERE {where}", tuple(params)).fetchall()  # noqa: S608
+        return [self._submission(row) for row in rows]
+
+    def add(self, submission: Submission) -> None:
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM submissions WHERE submitted_at < ?",
+                (self._timer() - self.retention,),
+            )
+            self._db.execute(_INSERT, _submission_row(submission))
+
+    def update(self, submission: Submission) -> None:
+        """Saves the submission, unless it was removed in the meantime."""
+        _, _, _, state, job_id, error, _, finished_at = _submission_row(submission)
+        with self._lock:
+            self._db.execute(
+                "UPDATE submissions SET state = ?, job_id = ?, error = ?, finished_at = ? WHERE submission_id = ?",
+                (state, job_id, error, finished_at, submission.submission_id),
+            )
+
+    def remove(self, submission_id: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM submissions WHERE submission_id = ?", (submission_id,))
+
+    def get_many(self, workspace: str, submission_ids: Iterable[str]) -> dict[str, Submission]:
+        """Returns the submissions made in the workspace by their IDs, unknown IDs are skipped."""
+        submission_ids = list(submission_ids)
+        submissions: dict[str, Submission] = {}
+        for start in range(0, len(submission_ids), _MAX_QUERY_PARAMS):
+            chunk = submission_ids[start : start + _MAX_QUERY_PARAMS]
+            where = f"workspace = ? AND submission_id IN ({', '.join('?' * len(chunk))})"
+            submissions.update((s.submission_id, s) for s in self._select(where, [workspace, *chunk]))
+        return submissions
+
+    def local_ids(self, workspace: str, job_ids: Iterable[str]) -> dict[str, str]:
+        """Maps the ADES job IDs of the workspace to the IDs of the submissions that created them."""
+        job_ids = list(job_ids)
+        mapping: dict[str, str] = {}
+        for start in range(0, len(job_ids), _MAX_QUERY_PARAMS):
+            chunk = job_ids[start : start + _MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT job_id, submission_id FROM submissions WHERE workspace = ? AND job_id IN ({placeholders})",  # noqa: S608
+                    (workspace, *chunk),
+                ).fetchall()
+            mapping.update(rows)
+        return mapping
+
+    def unresolved(self, workspace: str) -> list[Submission]:
+        """Returns the submissions of the workspace that have not reached ADES."""
+        return self._select("workspace = ? AND job_id IS NULL", [workspace])
+
+
+async def _register_and_execute(
+    ades: ADESClientBase,
+    workflow_identifier: str,
+    cwl: dict[str, Any],
+    inputs: dict[str, Any],
+) -> tuple[ErrorResponse | None, str | None]:
+    try:
+        err, _ = await ades.register_process_if_changed(workflow_identifier, cwl)
+        if err is not None:
+            return err, None
+        err, response = await ades.execute_process(process_identifier=workflow_identifier, process_inputs=inputs)
+    except CircuitOpenError as ex:
+        return ErrorResponse(code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(ex)), None
+    except Exception:
+        _logger.exception("Failed to submit workflow '%s'", workflow_identifier)
+        return ErrorResponse(code=status.HTTP_502_BAD_GATEWAY, detail="Failed to submit workflow"), None
+    return err, None if response is None else response.job_id
+
+
+class SubmissionPipeline:
+    """Registers and executes submitted workflows on ADES in the background.
+
+    Submissions get a local identifier right away. Registration and execution run in background tasks, admitted by
+    the submission admission controller, so slow ADES responses do not hold the API request open. Once the workflow is
+    executed, the local identifier maps to the ADES job ID. Submissions are kept in the submission store, so any
+    worker can resolve them.
+
+    Args:
+        store: The store keeping the submissions.
+        admission: The admission controller limiting the submissions sent to ADES.
+
+    """
+
+    def __init__(self, store: SubmissionStore, admission: SubmissionAdmission) -> None:
+        self.store = store
+        self.admission = admission
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._tickets: dict[str, AdmissionTicket] = {}
+        self._outcomes = dict.fromkeys(
+            (SubmissionState.submitted, SubmissionState.failed, SubmissionState.cancelled), 0
+        )
+
+    async def submit(
+        self,
+        ades: ADESClientBase,
+        workspace: str,
+        workflow_identifier: str,
+        cwl: dict[str, Any],
+        inputs: dict[str, Any],
+    ) -> Submission:
+        """Queues the workflow for registration and execution.
+
+        Args:
+            ades: The ADES client scoped to the workspace of the submission.
+            workspace: The workspace of the submission.
+            workflow_identifier: The process identifier to register the workflow as.
+            cwl: The CWL definition of the workflow.
+            inputs: The workflow inputs.
+
+        Returns:
+            The queued submission.
+
+        Raises:
+            AdmissionRejectedError: If the workspace submits too many workflows.
+
+        """
+        ticket = self.admission.reserve(workspace)
+        submission = Submission(
+            submission_id=str(uuid.uuid4()),
+            workspace=workspace,
+            workflow_identifier=workflow_identifier,
+            submitted_at=datetime.now(UTC),
+        )
+        try:
+            await asyncio.to_thread(self.store.add, submission)
+        except BaseException:
+            ticket.close()
+            raise
+        task = asyncio.create_task(self._run(submission, ticket, ades, cwl, inputs))
+        self._tasks[submission.submission_id] = task
+        self._tickets[submission.submission_id] = ticket
+        task.add_done_callback(functools.partial(self._forget_task, submission.submission_id))
+        return submission
+
+    def _forget_task(self, submission_id: str, _: asyncio.Task[None]) -> None:
+        # Tasks cancelled before they started never enter their ticket
+        self._tickets.pop(submission_id).close()
+        del self._tasks[submission_id]
+
+    async def _run(
+        self,
+        submission: Submission,
+        ticket: AdmissionTicket,
+        ades: ADESClientBase,
+        cwl: dict[str, Any],
+        inputs: dict[str, Any],
+    ) -> None:
+        try:
+            async with ticket:
+                # The submission may have been cancelled by another worker while it was waiting for its turn
+                if await self.get(submission.submission_id, submission.workspace) is None:
+                    self._outcomes[SubmissionState.cancelled] += 1
+                    return
+                err, job_id = await _register_and_execute(ades, submission.workflow_identifier, cwl, inputs)
+        except asyncio.CancelledError:
+            submission.finish(SubmissionState.cancelled)
+            await asyncio.to_thread(self.store.update, submission)
+            self._outcomes[SubmissionState.cancelled] += 1
+            raise
+
+        if err is None and job_id is not None:
+            submission.job_id = job_id
+            submission.state = SubmissionState.submitted
+        else:
+            submission.finish(SubmissionState.failed, err or ErrorResponse(code=status.HTTP_500_INTERNAL_SERVER_ERROR))
+        await asyncio.to_thread(self.store.update, submission)
+        self._outcomes[submission.state] += 1
+
+    async def get(self, submission_id: str, workspace: str) -> Submission | None:
+        """Returns the submission if it was made in the workspace."""
+        return (await self.get_many([submission_id], workspace)).get(submission_id)
+
+    async def get_many(self, submission_ids: Iterable[str], workspace: str) -> dict[str, Submission]:
+        """Returns the submissions made in the workspace by their IDs, IDs of other submissions or jobs are skipped."""
+        return await asyncio.to_thread(self.store.get_many, workspace, submission_ids)
+
+    async def local_ids(self, job_ids: Iterable[str], workspace: str) -> dict[str, str]:
+        """Maps ADES job IDs to the IDs of the submissions that created them, other jobs are skipped."""
+        return await asyncio.to_thread(self.store.local_ids, workspace, job_ids)
+
+    async def unresolved(self, workspace: str) -> list[Submission]:
+        """Returns the submissions of the workspace that have not reached ADES, queued, failed or cancelled ones."""
+        return await asyncio.to_thread(self.store.unresolved, workspace)
+
+    async def wait(self, submission_id: str, workspace: str, poll_interval: float) -> Submission | None:
+        """Waits until the submission reaches ADES or fails before reaching it.
+
+        Submissions made by other workers are polled every `poll_interval` seconds.
+
+        Returns:
+            The submission, `None` if it was removed.
+
+        """
+        while True:
+            if (task := self._tasks.get(submission_id)) is not None:
+                await asyncio.wait([task])
+            submission = await self.get(submission_id, workspace)
+            if submission is None or submission.state != SubmissionState.queued:
+                return submission
+            await asyncio.sleep(poll_interval)
+
+    async def cancel(self, submission_id: str, workspace: str) -> Submission | None:
+        """Cancels the submission if it is still waiting for its turn, otherwise waits until it reaches ADES.
+
+        Submissions that have not reached ADES are removed.
+
+        Returns:
+            The submission, `None` if there is no such submission in the workspace. The submission has a job ID if
+            the workflow was executed and the ADES job needs to be cancelled.
+
+        """
+        if (task := self._tasks.get(submission_id)) is not None:
+            if not self._tickets[submission_id].started:
+                task.cancel()
+            await asyncio.wait([task])
+        if (submission := await self.get(submission_id, workspace)) is None:
+            return None
+        if submission.job_id is None:
+            # A worker waiting to submit it skips removed submissions. One already submitting it leaves the ADES job
+            # unmapped, it is then reported under its ADES job ID.
+            await asyncio.to_thread(self.store.remove, submission_id)
+        return submission
+
+    async def close(self) -> None:
+        """Cancels the submissions still waiting for their turn and waits for the ones already sent to ADES."""
+        tasks = list(self._tasks.items())
+        for submission_id, task in tasks:
+            if not self._tickets[submission_id].started:
+                task.cancel()
+        if tasks:
+            await asyncio.wait([task for _, task in tasks])
+
+    def metrics(self) -> dict[str, Any]:
+        return {"in_progress": len(self._tasks), **{str(state): count for state, count in self._outcomes.items()}}
+
+
+@functools.lru_cache
+def _submission_pipeline() -> SubmissionPipeline:
+    settings = current_settings().submissions
+    store = SubmissionStore(settings.database, retention=settings.retention, stale_after=settings.stale_after)
+    pipeline = SubmissionPipeline(store, submission_admission_factory())
+    register_metrics_source("submission_pipeline", pipeline.metrics)
+    return pipeline
+
+
+def submission_pipeline_factory() -> SubmissionPipeline:
+    return _submission_pipeline()
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
-import datetime as dt  # noqa: TC003
-from typing import TYPE_CHECKING
+import asyncio
+import datetime as dt
+import functools
+from typing import TYPE_CHECKING, Any
 
+import jwt
 from pydantic import BaseModel, Field
+from starlette import status
 
 from src.core.settings import current_settings
 from src.services.ades.base_client import APIClient, ErrorResponse
+from src.services.auth.claims import token_cache_key
+from src.utils.cache import TTLCache
 from src.utils.logging import get_logger
+from src.utils.metrics import register_metrics_source
+from src.utils.singleflight import SingleFlight
 
 if TYPE_CHECKING:
     from logging import Logger
 
+_logger = get_logger(__name__)
+
+_REFRESH_HEADERS = {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"}
+
+TWorkspaceTokenCacheKey = tuple[str, str, str, str]
+
 
 class WorkspaceTokenResponse(BaseModel):
     access: str
@@ -19,42 +33,190 @@ class WorkspaceTokenResponse(BaseModel):
     refresh: str
     refresh_expiry: dt.datetime = Field(alias="refreshExpiry")
     scope: str
+    # When workspace services last authorized the session, carried over to tokens obtained with the refresh token
+    authorized_at: dt.datetime = Field(default_factory=lambda: dt.datetime.now(tz=dt.UTC), exclude=True)
 
     @property
     def scope_list(self) -> list[str]:
         return self.scope.split()
 
 
+TWorkspaceTokenResult = tuple[ErrorResponse | None, WorkspaceTokenResponse | None]
+
+
+@functools.lru_cache
+def _workspace_token_cache(maxsize: int) -> TTLCache[TWorkspaceTokenCacheKey, WorkspaceTokenResponse]:
+    cache: TTLCache[TWorkspaceTokenCacheKey, WorkspaceTokenResponse] = TTLCache(maxsize=maxsize)
+    register_metrics_source("workspace_token_cache", cache.metrics)
+    return cache
+
+
+def workspace_token_cache_factory() -> TTLCache[TWorkspaceTokenCacheKey, WorkspaceTokenResponse]:
+    return _workspace_token_cache(current_settings().eodh.workspace_token_cache_size)
+
+
+_refreshing: set[TWorkspaceTokenCacheKey] = set()
+_background_tasks: set[asyncio.Task[None]] = set()
+_session_flights: SingleFlight[TWorkspaceTokenCacheKey, TWorkspaceTokenResult] = SingleFlight()
+register_metrics_source("workspace_token_single_flight", _session_flights.metrics)
+
+
 class WorkspaceScopedTokenClient(APIClient):
-    def __init__(self, url: str, workspace: str, token: str, logger: Logger) -> None:
+    """Client for workspace scoped session tokens.
+
+    Issued tokens are cached per user identity and workspace and reused until shortly before they expire. Once the
+    remaining validity drops below `refresh_margin` seconds the cached token is still returned, but a new one is
+    obtained in the background using the refresh token. Tokens valid for less than `min_validity` seconds are never
+    handed out.
+
+    Refreshing does not go through workspace services, so it does not re-check the user's workspace membership. Once
+    the session was last authorized more than `max_refresh_age` seconds ago, a new session is created instead.
+
+    """
+
+    def __init__(
+        self,
+        url: str,
+        workspace: str,
+        token: str,
+        logger: Logger,
+        *,
+        identity: str | None = None,
+        refresh_url: str | None = None,
+        refresh_margin: float = 60,
+        min_validity: float = 10,
+        max_refresh_age: float = 3600,
+        cache: TTLCache[TWorkspaceTokenCacheKey, WorkspaceTokenResponse] | None = None,
+    ) -> None:
         super().__init__(url, logger)
         self.token = token
         self.workspace = workspace
+        self.identity = identity
+        self.refresh_url = refresh_url
+        self.refresh_margin = refresh_margin
+        self.min_validity = min_validity
+        self.max_refresh_age = max_refresh_age
+        self.cache = cache
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Accept": "application/json",
         }
 
-    async def get_token(self, user_id: str = "me") -> tuple[ErrorResponse | None, WorkspaceTokenResponse | None]:
-        client_session, retry_client = self._get_retry_client()
+    def _cache_key(self, user_id: str) -> TWorkspaceTokenCacheKey:
+        return self.url, self.workspace, user_id, self.identity or token_cache_key(self.token)
+
+    def _store(self, key: TWorkspaceTokenCacheKey, token_response: WorkspaceTokenResponse) -> None:
+        if self.cache is None:
+            return
+        ttl = (token_response.access_expiry - dt.datetime.now(tz=dt.UTC)).total_seconds() - self.min_validity
+        self.cache.set(key, token_response, ttl=ttl)
+
+    async def _create_session(self, user_id: str) -> tuple[ErrorResponse | None, WorkspaceTokenResponse | None]:
+        async with self._request(
+            "POST",
+            url=f"{self.url}/{self.workspace}/{user_id}/sessions",
+            headers=self.headers,
+        ) as response:
+            if err := await self._handle_common_errors_if_necessary(response):
+                return err, None
+
+            return None, WorkspaceTokenResponse(**(await response.json()))
+
+    async def _refresh_session(
+        self,
+        token_response: WorkspaceTokenResponse,
+    ) -> tuple[ErrorResponse | None, WorkspaceTokenResponse | None]:
+        if self.refresh_url is None:
+            return ErrorResponse(code=status.HTTP_400_BAD_REQUEST, detail="Token refresh is not configured."), None
+
+        # Refresh grant must be made on behalf of the client the token was issued for
+        unverified_claims = jwt.decode(token_response.refresh, options={"verify_signature": False})
+        async with self._request(
+            "POST",
+            url=self.refresh_url,
+            headers=_REFRESH_HEADERS,
+            data={
+                "grant_type": "refresh_token",
+                "client_id": unverified_claims.get("azp", ""),
+                "refresh_token": token_response.refresh,
+            },
+        ) as response:
+            if err := await self._handle_common_errors_if_necessary(response):
+                return err, None
+
+            data: dict[str, Any] = await response.json()
+
+        now = dt.datetime.now(tz=dt.UTC)
+        return None, WorkspaceTokenResponse(
+            accessExpiry=now + dt.timedelta(seconds=data["expires_in"]),
+            access=data["access_token"],
+            refreshExpiry=now + dt.timedelta(seconds=data.get("refresh_expires_in", data["expires_in"])),
+            refresh=data.get("refresh_token", token_response.refresh),
+            scope=data.get("scope", token_response.scope),
+            authorized_at=token_response.authorized_at,
+        )
+
+    async def _renew(self, key: TWorkspaceTokenCacheKey, cached: WorkspaceTokenResponse, user_id: str) -> None:
         try:
-            async with retry_client.post(
-                url=f"{self.url}/{self.workspace}/{user_id}/sessions",
-                headers=self.headers,
-            ) as response:
-                if err := await self._handle_common_errors_if_necessary(response):
-                    return err, None
-
-                return None, WorkspaceTokenResponse(**(await response.json()))
+            err: ErrorResponse | None = None
+            token_response: WorkspaceTokenResponse | None = None
+            now = dt.datetime.now(tz=dt.UTC)
+            if cached.refresh_expiry > now and (now - cached.authorized_at).total_seconds() < self.max_refresh_age:
+                err, token_response = await self._refresh_session(cached)
+            if token_response is None:
+                if err is not None:
+                    self.logger.info("Workspace token refresh failed: %s, requesting new session", err.detail)
+                err, token_response = await self._create_session(user_id)
+            if token_response is not None:
+                self._store(key, token_response)
+            elif err is not None:
+                self.logger.warning("Background workspace token renewal failed: %s", err.detail)
+        except Exception:
+            self.logger.exception("Background workspace token renewal failed")
         finally:
-            await client_session.close()
+            _refreshing.discard(key)
+
+    def _schedule_renewal(self, key: TWorkspaceTokenCacheKey, cached: WorkspaceTokenResponse, user_id: str) -> None:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+        task = asyncio.create_task(self._renew(key, cached, user_id))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _create_and_store_session(self, key: TWorkspaceTokenCacheKey, user_id: str) -> TWorkspaceTokenResult:
+        err, token_response = await self._create_session(user_id)
+        if token_response is not None:
+            self._store(key, token_response)
+        return err, token_response
+
+    async def get_token(self, user_id: str = "me") -> tuple[ErrorResponse | None, WorkspaceTokenResponse | None]:
+        key = self._cache_key(user_id)
+        if self.cache is not None and (cached := self.cache.get(key)) is not None:
+            remaining = (cached.access_expiry - dt.datetime.now(tz=dt.UTC)).total_seconds()
+            if remaining <= self.refresh_margin:
+                self._schedule_renewal(key, cached, user_id)
+            return None, cached
+
+        # Concurrent requests for the same session wait for a single upstream call
+        return await _session_flights.do(key, lambda: self._create_and_store_session(key, user_id))
 
 
-def ws_token_session_auth_client_factory(token: str, workspace: str) -> WorkspaceScopedTokenClient:
+def ws_token_session_auth_client_factory(
+    token: str,
+    workspace: str,
+    identity: str | None = None,
+) -> WorkspaceScopedTokenClient:
     settings = current_settings()
     return WorkspaceScopedTokenClient(
         url=settings.eodh.workspace_services_endpoint,
         workspace=workspace,
         token=token,
         logger=get_logger(__name__),
+        identity=identity,
+        refresh_url=settings.eodh.token_url,
+        refresh_margin=settings.eodh.workspace_token_refresh_margin,
+        min_validity=settings.eodh.workspace_token_min_validity,
+        max_refresh_age=settings.eodh.workspace_token_max_refresh_age,
+        cache=workspace_token_cache_factory(),
     )
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import functools
+from typing import TYPE_CHECKING, Any
+
+from starlette import status
+
+from src.core.settings import current_settings
+from src.services.ades.base_client import ErrorResponse
+from src.services.ades.job_index import TERMINAL_STATUSES
+from src.utils.logging import get_logger
+from src.utils.metrics import register_metrics_source
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+
+    from src.services.ades.base_client import ADESClientBase
+    from src.services.ades.job_index import TJobRecord, WorkspaceJobIndex
+
+_logger = get_logger(__name__)
+
+type TADESClientProvider = Callable[[], Awaitable[ADESClientBase]]
+
+
+@dataclasses.dataclass(frozen=True)
+class JobStatusEvent:
+    """A job whose status changed, or an error that prevented the statuses from being refreshed."""
+
+    job: TJobRecord | None = None
+    error: ErrorResponse | None = None
+
+
+@dataclasses.dataclass(eq=False)
+class _Subscriber:
+    queue: asyncio.Queue[JobStatusEvent]
+    job_ids: frozenset[str] | None
+    ades_client: TADESClientProvider
+
+    def wants(self, job: TJobRecord, *, snapshot: bool = False) -> bool:
+        if self.job_ids is not None:
+            return job["job_id"] in self.job_ids
+        # Workspace wide snapshots include only active jobs, finished ones are available from the history endpoint
+        return not snapshot or job["status"] not in TERMINAL_STATUSES
+
+    def push(self, event: JobStatusEvent) -> None:
+        if self.queue.full():
+            # Slow consumer - drop the oldest event rather than blocking the poll loop
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    def push_snapshot(self, jobs: Iterable[TJobRecord]) -> None:
+        for job in jobs:
+            if self.wants(job, snapshot=True):
+                self.push(JobStatusEvent(job=job))
+
+
+@dataclasses.dataclass(eq=False)
+class _WorkspaceWatch:
+    subscribers: list[_Subscriber] = dataclasses.field(default_factory=list)
+    known: dict[str, TJobRecord] | None = None
+    index: WorkspaceJobIndex | None = None
+    index_version: int = -1
+    task: asyncio.Task[None] | None = None
+
+    def changes(self, index: WorkspaceJobIndex) -> list[TJobRecord]:
+        if index is self.index and index.version == self.index_version:
+            return []
+        self.index, self.index_version = index, index.version
+
+        known = self.known or {}
+        changed = [job for job in index if (prev := known.get(job["job_id"])) is not job and prev != job]
+        self.known = {job["job_id"]: job for job in index}
+        return changed
+
+
+class JobStatusWatcher:
+    """Pushes job status changes to subscribers, polling ADES once per workspace regardless of subscriber count.
+
+    Each watched workspace has a single poll loop, started by the first subscriber and stopped when the last one
+    leaves. Polling goes through the shared job index, so only non-terminal jobs are re-fetched from ADES. Every
+    subscriber receives a snapshot of the jobs it watches first, followed by their status changes.
+
+    """
+
+    def __init__(self, *, poll_interval: float, queue_size: int) -> None:
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self._watches: dict[str, _WorkspaceWatch] = {}
+        self._polls = 0
+
+    @contextlib.asynccontextmanager
+    async def subscribe(
+        self,
+        workspace: str,
+        ades_client: TADESClientProvider,
+        job_ids: Iterable[str] | None = None,
+    ) -> AsyncIterator[asyncio.Queue[JobStatusEvent]]:
+        """Subscribes to job status changes in the workspace.
+
+        Args:
+            workspace: The workspace to watch. The caller is responsible for checking that the user can access it.
+            ades_client: Returns an ADES client scoped to the workspace. The poll loop uses the provider of the most
+                recent subscriber, as it holds the freshest credentials.
+            job_ids: Optional identifiers of the jobs to watch, all workspace jobs are watched by default.
+
+        Yields:
+            A queue receiving the events until the context exits.
+
+        """
+        subscriber = _Subscriber(
+            queue=asyncio.Queue(maxsize=self.queue_size),
+            job_ids=None if job_ids is None else frozenset(job_ids),
+            ades_client=ades_client,
+        )
+        watch = self._watches.setdefault(workspace, _WorkspaceWatch())
+        watch.subscribers.append(subscriber)
+        if watch.known is not None:
+            subscriber.push_snapshot(watch.known.values())
+        if watch.task is None or watch.task.done():
+            watch.task = asyncio.create_task(self._poll(watch))
+
+        try:
+            yield subscriber.queue
+        finally:
+            watch.subscribers.remove(subscriber)
+            if not watch.subscribers:
+                if self._watches.get(workspace) is watch:
+                    del self._watches[workspace]
+                if watch.task is not None:
+                    watch.task.cancel()
+
+    def watch_jobs(self, workspace: str, events: asyncio.Queue[JobStatusEvent], job_ids: Iterable[str]) -> None:
+        """Adds jobs to the subscription receiving `events`, their known statuses are pushed right away.
+
+        Workspace wide subscriptions already receive all jobs and are left as they are.
+
+        Args:
+            workspace: The watched workspace.
+            events: The queue yielded by `subscribe`.
+            job_ids: Identifiers of the jobs to watch as well.
+
+        """
+        if (watch := self._watches.get(workspace)) is None:
+            return
+        for subscriber in watch.subscribers:
+            if subscriber.queue is not events or subscriber.job_ids is None:
+                continue
+            added = frozenset(job_ids) - subscriber.job_ids
+            subscriber.job_ids |= added
+            if watch.known is not None:
+                subscriber.push_snapshot(watch.known[job_id] for job_id in added if job_id in watch.known)
+
+    async def _fetch_index(self, watch: _WorkspaceWatch) -> tuple[ErrorResponse | None, WorkspaceJobIndex | None]:
+        self._polls += 1
+        try:
+            ades = await watch.subscribers[-1].ades_client()
+            return await ades.get_job_index()
+        except Exception:
+            _logger.exception("Failed to refresh job statuses")
+            return ErrorResponse(
+                code=status.HTTP_502_BAD_GATEWAY,
+                detail="Failed to refresh job statuses",
+            ), None
+
+    async def _poll(self, watch: _WorkspaceWatch) -> None:
+        while watch.subscribers:
+            err, index = await self._fetch_index(watch)
+            if err is not None:
+                for subscriber in watch.subscribers:
+                    subscriber.push(JobStatusEvent(error=err))
+            elif index is not None:
+                first_poll = watch.known is None
+                changed = watch.changes(index)
+                for subscriber in watch.subscribers:
+                    if first_poll:
+                        subscriber.push_snapshot(changed)
+                        continue
+                    for job in changed:
+                        if subscriber.wants(job):
+                            subscriber.push(JobStatusEvent(job=job))
+            await asyncio.sleep(self.poll_interval)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "workspaces": len(self._watches),
+            "subscribers": sum(len(watch.subscribers) for watch in self._watches.values()),
+            "polls": self._polls,
+        }
+
+
+@functools.lru_cache
+def _job_status_watcher(poll_interval: float, queue_size: int) -> JobStatusWatcher:
+    watcher = JobStatusWatcher(poll_interval=poll_interval, queue_size=queue_size)
+    register_metrics_source("ades_job_watcher", watcher.metrics)
+    return watcher
+
+
+def job_status_watcher_factory() -> JobStatusWatcher:
+    settings = current_settings().ades
+    return _job_status_watcher(settings.job_watcher_poll_interval, settings.job_watcher_queue_size)
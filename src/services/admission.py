@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import functools
+import time
+from typing import TYPE_CHECKING, Any
+
+from src.core.settings import AdmissionSettings, current_settings
+from src.utils.cache import TTLCache
+from src.utils.metrics import register_metrics_source
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a workspace submits faster than it is allowed to."""
+
+    def __init__(self, workspace: str, retry_after: float) -> None:
+        super().__init__(f"Too many submissions for workspace '{workspace}', retry in {retry_after:.0f}s.")
+        self.workspace = workspace
+        self.retry_after = retry_after
+
+
+@dataclasses.dataclass
+class _TokenBucket:
+    tokens: float
+    updated_at: float
+
+
+class SubmissionAdmission:
+    """Admission control for workflow submissions.
+
+    Each workspace has a token bucket refilled at `rate` tokens per second up to `burst` tokens. A submission takes
+    a token or is rejected with `AdmissionRejectedError` right away. At most `max_concurrency` admitted submissions
+    talk to ADES at once. The rest wait in per-workspace queues served round-robin, so one busy workspace cannot
+    starve the others. A submission is rejected if its workspace queue is full.
+
+    Args:
+        config: The admission limits.
+        timer: The monotonic clock to use.
+
+    """
+
+    def __init__(self, config: AdmissionSettings, timer: Callable[[], float] = time.monotonic) -> None:
+        self.config = config
+        self._timer = timer
+        # An idle bucket refills completely, after that it is the same as a new one
+        self._buckets: TTLCache[str, _TokenBucket] = TTLCache(maxsize=10_000, ttl=config.burst / config.rate)
+        self._queues: collections.OrderedDict[str, collections.deque[asyncio.Future[None]]] = collections.OrderedDict()
+        self._in_flight = 0
+        self._admitted = 0
+        self._rejected = 0
+
+    def _take_token(self, workspace: str) -> None:
+        now = self._timer()
+        bucket = self._buckets.get(workspace) or _TokenBucket(tokens=self.config.burst, updated_at=now)
+        bucket.tokens = min(self.config.burst, bucket.tokens + (now - bucket.updated_at) * self.config.rate)
+        bucket.updated_at = now
+        self._buckets.set(workspace, bucket)
+        if bucket.tokens < 1:
+            self._rejected += 1
+            raise AdmissionRejectedError(workspace, (1 - bucket.tokens) / self.config.rate)
+        bucket.tokens -= 1
+
+    def _has_free_slot(self) -> bool:
+        return self._in_flight < self.config.max_concurrency and not self._queues
+
+    def _check_queue(self, workspace: str) -> None:
+        queued = len(self._queues.get(workspace, ()))
+        if not self._has_free_slot() and queued >= self.config.max_queued_per_workspace:
+            self._rejected += 1
+            raise AdmissionRejectedError(workspace, 1 / self.config.rate)
+
+    def _enqueue(self, workspace: str) -> asyncio.Future[None]:
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        if self._has_free_slot():
+            self._in_flight += 1
+            waiter.set_result(None)
+            return waiter
+
+        self._queues.setdefault(workspace, collections.deque()).append(waiter)
+        return waiter
+
+    def _remove_waiter(self, workspace: str, waiter: asyncio.Future[None]) -> None:
+        if (queue := self._queues.get(workspace)) is None:
+            return
+        with contextlib.suppress(ValueError):
+            queue.remove(waiter)
+        if not queue:
+            del self._queues[workspace]
+
+    def _release_slot(self) -> None:
+        # Hand the slot over to the next workspace in round-robin order
+        while self._queues:
+            workspace, queue = self._queues.popitem(last=False)
+            waiter = queue.popleft()
+            if queue:
+                self._queues[workspace] = queue
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def reserve(self, workspace: str) -> AdmissionTicket:
+        """Reserves a place for a submission from the workspace without waiting for its turn.
+
+        Raises:
+            AdmissionRejectedError: If the workspace exceeded its submission rate or its queue is full.
+
+        """
+        # Submissions rejected because of a full queue must not use up the rate budget of the workspace
+        self._check_queue(workspace)
+        self._take_token(workspace)
+        return AdmissionTicket(self, workspace, self._enqueue(workspace))
+
+    @contextlib.asynccontextmanager
+    async def admit(self, workspace: str) -> AsyncIterator[None]:
+        """Admits a submission for the workspace, waiting for its turn if ADES is busy with other submissions.
+
+        Raises:
+            AdmissionRejectedError: If the workspace exceeded its submission rate or its queue is full.
+
+        """
+        async with self.reserve(workspace):
+            yield
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrency": self.config.max_concurrency,
+            "queued": sum(len(queue) for queue in self._queues.values()),
+            "queued_workspaces": len(self._queues),
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+        }
+
+
+class AdmissionTicket:
+    """A reserved place in the submission queue, entering it waits for the turn of the submission.
+
+    The ticket must be either entered or closed, otherwise its place is never given up.
+
+    """
+
+    def __init__(self, admission: SubmissionAdmission, workspace: str, waiter: asyncio.Future[None]) -> None:
+        self.workspace = workspace
+        self._admission = admission
+        self._waiter = waiter
+        self._closed = False
+
+    @property
+    def started(self) -> bool:
+        """Whether it is the turn of the submission."""
+        return self._waiter.done() and not self._waiter.cancelled()
+
+    def close(self) -> None:
+        """Gives up the place or the slot held by the ticket, idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.started:
+            self._admission._release_slot()  # noqa: SLF001
+        else:
+            self._waiter.cancel()
+            self._admission._remove_waiter(self.workspace, self._waiter)  # noqa: SLF001
+
+    async def __aenter__(self) -> None:
+        try:
+            await self._waiter
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation
+            self.close()
+            raise
+        self._admission._admitted += 1  # noqa: SLF001
+
+    async def __aexit__(self, *_: object) -> None:
+        self.close()
+
+
+@functools.lru_cache
+def _submission_admission() -> SubmissionAdmission:
+    admission = SubmissionAdmission(current_settings().admission)
+    register_metrics_source("submission_admission", admission.metrics)
+    return admission
+
+
+def submission_admission_factory() -> SubmissionAdmission:
+    return _submission_admission()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import time
+from typing import Any
+
+from src.core.settings import current_settings
+from src.utils.cache import TTLCache
+from src.utils.metrics import register_metrics_source
+
+
+def token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class VerifiedClaimsCache:
+    """LRU cache of already verified token claims, keyed by the token hash and held until the token expires."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._cache: TTLCache[str, dict[str, Any]] = TTLCache(maxsize=maxsize)
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        claims = self._cache.get(token_cache_key(token))
+        return None if claims is None else dict(claims)
+
+    def set(self, token: str, claims: dict[str, Any]) -> None:
+        # Tokens without expiry are never cached - there is no safe point in time to evict them
+        if not isinstance(exp := claims.get("exp"), int | float):
+            return
+        self._cache.set(token_cache_key(token), dict(claims), ttl=exp - time.time())
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def metrics(self) -> dict[str, Any]:
+        return self._cache.metrics()
+
+
+@functools.lru_cache
+def _verified_claims_cache(maxsize: int) -> VerifiedClaimsCache:
+    cache = VerifiedClaimsCache(maxsize=maxsize)
+    register_metrics_source("verified_claims_cache", cache.metrics)
+    return cache
+
+
+def verified_claims_cache_factory() -> VerifiedClaimsCache:
+    return _verified_claims_cache(current_settings().eodh.claims_cache_max_size)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import jwt
+import jwt.exceptions
+from jwt import PyJWKClient  # type: ignore[attr-defined]
+
+from src.core.settings import current_settings
+from src.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from jwt import PyJWK  # type: ignore[attr-defined]
+
+_logger = get_logger(__name__)
+
+_HEADERS = {"User-agent": "custom-user-agent"}
+
+
+class JWKSCache:
+    """Process-wide cache of the signing keys published on the Keycloak JWKS endpoint.
+
+    The key set is refreshed once it is older than `ttl` seconds. A token signed with an unknown `kid` forces an
+    immediate refetch (at most once every `min_refresh_interval` seconds), so that key rotation is picked up without
+    waiting for the TTL. If a refresh fails, the previously fetched keys keep being served for up to `stale_ttl`
+    seconds, so a slow or briefly unavailable Keycloak does not turn into a wave of 401 responses.
+
+    """
+
+    def __init__(
+        self,
+        certs_url: str,
+        *,
+        ttl: float = 300,
+        stale_ttl: float = 3600,
+        min_refresh_interval: float = 10,
+        fetch_timeout: float = 5,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.certs_url = certs_url
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._timer = timer
+        self._jwks_client = PyJWKClient(certs_url, cache_jwk_set=False, headers=_HEADERS, timeout=fetch_timeout)
+        self._keys: dict[str | None, PyJWK] = {}
+        self._fetched_at: float | None = None
+        self._last_refresh_attempt_at: float | None = None
+        self._lock = threading.Lock()
+
+    def _age(self, now: float) -> float:
+        return float("inf") if self._fetched_at is None else now - self._fetched_at
+
+    def _refresh_allowed(self, now: float) -> bool:
+        return self._last_refresh_attempt_at is None or now - self._last_refresh_attempt_at >= self.min_refresh_interval
+
+    def _refresh(self, *, force: bool) -> None:
+        now = self._timer()
+        # Another thread might have refreshed the keys while we were waiting for the lock
+        if not force and self._age(now) < self.ttl:
+            return
+        if force and not self._refresh_allowed(now):
+            return
+
+        self._last_refresh_attempt_at = now
+        try:
+            signing_keys = self._jwks_client.get_signing_keys(refresh=True)
+        except jwt.exceptions.PyJWKClientError:
+            if not self._keys or self._age(now) > self.stale_ttl:
+                raise
+            _logger.warning(
+                "Failed to refresh JWKS from %s, serving cached keys fetched %.0fs ago",
+                self.certs_url,
+                self._age(now),
+                exc_info=True,
+            )
+            return
+
+        self._keys = {key.key_id: key for key in signing_keys}
+        self._fetched_at = now
+
+    def get_signing_key(self, kid: str | None) -> PyJWK:
+        age = self._age(self._timer())
+        if age >= self.ttl:
+            # Do not make other requests wait for the refresh if there are keys that can still be served
+            blocking = not self._keys or age > self.stale_ttl
+            if self._lock.acquire(blocking=blocking):
+                try:
+                    self._refresh(force=False)
+                finally:
+                    self._lock.release()
+
+        if (key := self._keys.get(kid)) is not None:
+            return key
+
+        # Unknown kid - the keys might have been rotated
+        with self._lock:
+            if kid not in self._keys:
+                self._refresh(force=True)
+
+        if (key := self._keys.get(kid)) is None:
+            msg = f'Unable to find a signing key that matches: "{kid}"'
+            raise jwt.exceptions.PyJWKClientError(msg)
+        return key
+
+    def get_signing_key_from_jwt(self, token: str) -> PyJWK:
+        header = jwt.get_unverified_header(token)
+        return self.get_signing_key(header.get("kid"))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys = {}
+            self._fetched_at = None
+            self._last_refresh_attempt_at = None
+
+
+@functools.lru_cache
+def _jwks_cache(
+    certs_url: str,
+    ttl: float,
+    stale_ttl: float,
+    min_refresh_interval: float,
+    fetch_timeout: float,
+) -> JWKSCache:
+    return JWKSCache(
+        certs_url,
+        ttl=ttl,
+        stale_ttl=stale_ttl,
+        min_refresh_interval=min_refresh_interval,
+        fetch_timeout=fetch_timeout,
+    )
+
+
+def jwks_cache_factory() -> JWKSCache:
+    settings = current_settings()
+    return _jwks_cache(
+        settings.eodh.certs_url,
+        settings.eodh.jwks_cache_ttl,
+        settings.eodh.jwks_stale_ttl,
+        settings.eodh.jwks_min_refresh_interval,
+        settings.eodh.jwks_fetch_timeout,
+    )
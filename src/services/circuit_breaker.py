@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import enum
+import functools
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from starlette import status
+from yarl import URL
+
+from src.core.settings import CircuitBreakerSettings, current_settings
+from src.utils.logging import get_logger
+from src.utils.metrics import register_metrics_source
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+_logger = get_logger(__name__)
+
+
+class CircuitState(enum.StrEnum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"Upstream {name} is unavailable, retry in {retry_after:.0f}s.")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Stops calling an upstream that keeps failing or responding slowly.
+
+    Outcomes of the last `window_size` calls are tracked. Once at least `min_calls` were made and the share of failed
+    or slow calls reaches its threshold, the circuit opens and calls fail immediately with `CircuitOpenError` for
+    `open_duration` seconds. After that, the circuit is half-open - a single probe call is let through. The circuit
+    closes if the probe succeeds and opens again otherwise.
+
+    Args:
+        name: The name of the upstream.
+        config: The thresholds.
+        timer: The monotonic clock to use.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: CircuitBreakerSettings,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.config = config
+        self._timer = timer
+        self._state = CircuitState.closed
+        self._opened_at = 0.0
+        self._probe_started_at: float | None = None
+        # (failed, slow) outcome of each recent call
+        self._outcomes: collections.deque[tuple[bool, bool]] = collections.deque(maxlen=config.window_size)
+        self._opened_count = 0
+        self._rejected_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> CircuitState:
+        if self._state == CircuitState.open and self._timer() - self._opened_at >= self.config.open_duration:
+            self._state = CircuitState.half_open
+            self._probe_started_at = None
+        return self._state
+
+    def acquire(self) -> bool:
+        """Admits a call.
+
+        Returns:
+            `True` if the call is a half-open probe, `False` for a regular call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe already in flight.
+
+        """
+        with self._lock:
+            state = self._current_state()
+            now = self._timer()
+            if state == CircuitState.closed:
+                return False
+            # A probe that never reported back, e.g. because it was cancelled, does not block the circuit forever
+            if state == CircuitState.half_open and (
+                self._probe_started_at is None or now - self._probe_started_at >= self.config.open_duration
+            ):
+                self._probe_started_at = now
+                return True
+            self._rejected_count += 1
+            retry_after = max(self.config.open_duration - (now - self._opened_at), 0)
+            raise CircuitOpenError(self.name, retry_after)
+
+    def record(self, *, failed: bool, duration: float) -> None:
+        slow = duration >= self.config.slow_call_duration
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.half_open:
+                if failed or slow:
+                    self._open()
+                else:
+                    _logger.info("Circuit for %s closed", self.name)
+                    self._state = CircuitState.closed
+                    self._outcomes.clear()
+                return
+            if state == CircuitState.open:
+                return
+
+            self._outcomes.append((failed, slow))
+            if len(self._outcomes) < self.config.min_calls:
+                return
+            failure_rate = sum(f for f, _ in self._outcomes) / len(self._outcomes)
+            slow_rate = sum(s for _, s in self._outcomes) / len(self._outcomes)
+            if failure_rate >= self.config.failure_rate_threshold or slow_rate >= self.config.slow_call_rate_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        _logger.warning("Circuit for %s opened for %ss", self.name, self.config.open_duration)
+        self._state = CircuitState.open
+        self._opened_at = self._timer()
+        self._probe_started_at = None
+        self._outcomes.clear()
+        self._opened_count += 1
+
+    @contextlib.asynccontextmanager
+    async def guard(self) -> AsyncIterator[CallOutcome]:
+        """Admits a call and records its outcome.
+
+        The caller reports the response through the yielded outcome - its latency is measured up to that point.
+        Connection errors, timeouts and 5xx responses count as failures, including error responses raised by
+        `raise_for_status`. Client errors such as an expired token are answered by a healthy upstream, they and other
+        exceptions raised before a response was reported are not held against it.
+
+        """
+        outcome = CallOutcome(self._timer, probe=self.acquire())
+        try:
+            yield outcome
+        except aiohttp.ClientResponseError as ex:
+            self.record(failed=ex.status >= status.HTTP_500_INTERNAL_SERVER_ERROR, duration=outcome.elapsed())
+            raise
+        except (aiohttp.ClientError, TimeoutError):
+            self.record(failed=True, duration=outcome.elapsed())
+            raise
+        except BaseException:
+            if outcome.duration is not None:
+                self.record(failed=outcome.failed, duration=outcome.duration)
+            raise
+        else:
+            self.record(failed=outcome.failed, duration=outcome.elapsed())
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            outcomes = list(self._outcomes)
+            return {
+                "state": self._current_state().value,
+                "calls": len(outcomes),
+                "failed_calls": sum(f for f, _ in outcomes),
+                "slow_calls": sum(s for _, s in outcomes),
+                "opened": self._opened_count,
+                "rejected": self._rejected_count,
+            }
+
+
+class CallOutcome:
+    """Outcome of a single call admitted by a `CircuitBreaker`."""
+
+    def __init__(self, timer: Callable[[], float], *, probe: bool) -> None:
+        self.probe = probe
+        self.failed = False
+        self.duration: float | None = None
+        self._timer = timer
+        self._start = timer()
+
+    def responded(self, *, failed: bool) -> None:
+        self.failed = failed
+        self.duration = self._timer() - self._start
+
+    def elapsed(self) -> float:
+        return self._timer() - self._start if self.duration is None else self.duration
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers keyed by upstream origin."""
+
+    def __init__(self, config: CircuitBreakerSettings) -> None:
+        self.config = config
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str | URL) -> CircuitBreaker:
+        url = URL(url)
+        name = f"{url.scheme}://{url.host}:{url.port}"
+        with self._lock:
+            if (breaker := self._breakers.get(name)) is None:
+                breaker = self._breakers[name] = CircuitBreaker(name, self.config)
+            return breaker
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        metrics = [breaker.metrics() for breaker in breakers]
+        # Aggregated over upstreams, their origins are not published
+        return {
+            "circuits": len(metrics),
+            **{str(state): sum(m["state"] == state for m in metrics) for state in CircuitState},
+            "opened": sum(m["opened"] for m in metrics),
+            "rejected": sum(m["rejected"] for m in metrics),
+        }
+
+
+@functools.lru_cache
+def _circuit_breaker_registry() -> CircuitBreakerRegistry:
+    registry = CircuitBreakerRegistry(current_settings().circuit_breaker)
+    register_metrics_source("circuit_breakers", registry.metrics)
+    return registry
+
+
+def circuit_breaker_registry_factory() -> CircuitBreakerRegistry:
+    return _circuit_breaker_registry()
+
+
+def circuit_breaker_factory(url: str | URL) -> CircuitBreaker:
+    return circuit_breaker_registry_factory().get(url)
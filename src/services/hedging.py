@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import functools
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from yarl import URL
+
+from src.core.settings import HedgingSettings, current_settings
+from src.utils.metrics import register_metrics_source
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+    from contextlib import AbstractAsyncContextManager
+
+
+class Hedger:
+    """Sends a second, identical request when the first one takes longer than usual.
+
+    The hedging delay is the configured percentile of recent response times. The first attempt to succeed wins and
+    the other one is cancelled - an attempt that responds with an error does not win while the other one may still
+    succeed. Hedging is skipped until enough response times were observed, and whenever more than
+    `budget` of recent requests were hedged already, so it adds a bounded amount of load. Only idempotent requests may
+    be hedged.
+
+    Args:
+        name: The name of the hedged operation.
+        config: The hedging configuration.
+        timer: The monotonic clock to use.
+
+    """
+
+    def __init__(self, name: str, config: HedgingSettings, timer: Callable[[], float] = time.monotonic) -> None:
+        self.name = name
+        self.config = config
+        self._timer = timer
+        self._latencies: collections.deque[float] = collections.deque(maxlen=config.window_size)
+        self._hedged: collections.deque[bool] = collections.deque(maxlen=config.window_size)
+        self._hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def delay(self) -> float | None:
+        """Returns the time to wait for the first attempt before hedging, `None` if the request must not be hedged."""
+        with self._lock:
+            if not self.config.enabled or len(self._latencies) < self.config.min_samples:
+                return None
+            if self._hedged and sum(self._hedged) / len(self._hedged) >= self.config.budget:
+                return None
+            latencies = sorted(self._latencies)
+        idx = min(math.ceil(self.config.percentile * len(latencies)) - 1, len(latencies) - 1)
+        return max(latencies[max(idx, 0)], self.config.min_delay)
+
+    def record(self, latency: float, *, hedged: bool, hedge_won: bool = False) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._hedged.append(hedged)
+            self._hedge_wins += hedge_won
+
+    @contextlib.asynccontextmanager
+    async def hedged[T](
+        self,
+        attempt: Callable[[], AbstractAsyncContextManager[T]],
+        *,
+        failed: Callable[[T], bool] | None = None,
+    ) -> AsyncIterator[T]:
+        """Enters the context returned by `attempt`, hedging it with a second one if it does not complete in time.
+
+        The losing attempt is cancelled and its context is exited before the winner is yielded.
+
+        Args:
+            attempt: The factory of the attempt contexts.
+            failed: Tells whether a value, e.g. a 5xx response, is a failure that should not win over the other
+                attempt. If both attempts fail this way, the value of the first one is yielded.
+
+        """
+        delay = self.delay()
+        start = self._timer()
+        if delay is None:
+            async with attempt() as value:
+                self.record(self._timer() - start, hedged=False)
+                yield value
+            return
+
+        stacks: list[contextlib.AsyncExitStack] = []
+        tasks: list[asyncio.Task[T]] = []
+
+        def launch() -> None:
+            stack = contextlib.AsyncExitStack()
+            stacks.append(stack)
+            tasks.append(asyncio.create_task(stack.enter_async_context(attempt())))
+
+        launch()
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                launch()
+            winner = await _first_successful(tasks, failed or _never_failed)
+            for task, stack in zip(tasks, stacks, strict=True):
+                if task is not winner:
+                    await _discard(task, stack)
+            self.record(self._timer() - start, hedged=len(tasks) > 1, hedge_won=winner is not tasks[0])
+            async with stacks[tasks.index(winner)]:
+                yield winner.result()
+        finally:
+            # Attempts still running when the caller gave up, e.g. because it was cancelled
+            for task, stack in zip(tasks, stacks, strict=True):
+                await _discard(task, stack)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            hedged = sum(self._hedged)
+            samples = len(self._latencies)
+            hedge_wins = self._hedge_wins
+        return {
+            "samples": samples,
+            "hedged": hedged,
+            "hedge_wins": hedge_wins,
+            "delay": self.delay(),
+        }
+
+
+def _never_failed(_: object) -> bool:
+    return False
+
+
+async def _first_successful[T](tasks: list[asyncio.Task[T]], failed: Callable[[T], bool]) -> asyncio.Task[T]:
+    """Waits for the first task to succeed with a value that is not a failure.
+
+    If there is no such task, the first task that completed with a value is returned. The error of the first task is
+    raised if all of them raised.
+
+    """
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task in done and task.exception() is None and not failed(task.result()):
+                return task
+    for task in tasks:
+        if task.exception() is None:
+            return task
+    error = tasks[0].exception()
+    assert error is not None  # noqa: S101
+    raise error
+
+
+async def _discard[T](task: asyncio.Task[T], stack: contextlib.AsyncExitStack) -> None:
+    """Cancels the attempt and exits its context, idempotent."""
+    task.cancel()
+    await asyncio.wait([task])
+    if not task.cancelled():
+        task.exception()  # Retrieved so that it is not reported as unhandled
+    await stack.aclose()
+
+
+class HedgerRegistry:
+    """Hedgers keyed by upstream origin and operation name."""
+
+    def __init__(self, config: HedgingSettings) -> None:
+        self.config = config
+        self._hedgers: dict[str, Hedger] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str | URL, operation: str) -> Hedger:
+        url = URL(url)
+        name = f"{url.scheme}://{url.host}:{url.port} {operation}"
+        with self._lock:
+            if (hedger := self._hedgers.get(name)) is None:
+                hedger = self._hedgers[name] = Hedger(name, self.config)
+            return hedger
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            hedgers = list(self._hedgers.values())
+        metrics = [hedger.metrics() for hedger in hedgers]
+        # Aggregated over upstream operations, their origins are not published
+        return {
+            "operations": len(metrics),
+            "samples": sum(m["samples"] for m in metrics),
+            "hedged": sum(m["hedged"] for m in metrics),
+            "hedge_wins": sum(m["hedge_wins"] for m in metrics),
+        }
+
+
+@functools.lru_cache
+def _hedger_registry() -> HedgerRegistry:
+    registry = HedgerRegistry(current_settings().hedging)
+    register_metrics_source("hedging", registry.metrics)
+    return registry
+
+
+def hedger_factory(url: str | URL, operation: str) -> Hedger:
+    return _hedger_registry().get(url, operation)
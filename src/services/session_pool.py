@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from typing import Any
+
+from aiohttp import AsyncResolver, ClientSession, TCPConnector
+from yarl import URL
+
+from src.core.settings import HttpClientSettings, current_settings
+from src.utils.logging import get_logger
+from src.utils.metrics import register_metrics_source
+
+_logger = get_logger(__name__)
+
+TOrigin = tuple[str, str | None, int | None]
+
+
+class ClientSessionPool:
+    """Long-lived aiohttp sessions, one per upstream origin.
+
+    Each session owns its own keep-alive connection pool and DNS cache, so consecutive calls to the same upstream reuse
+    already established TCP/TLS connections. Sessions are bound to the event loop that created them - a session is
+    transparently re-created when it is requested from a different loop.
+
+    """
+
+    def __init__(self, config: HttpClientSettings) -> None:
+        self.config = config
+        self._sessions: dict[TOrigin, tuple[asyncio.AbstractEventLoop, ClientSession]] = {}
+
+    @staticmethod
+    def _origin(url: str | URL) -> TOrigin:
+        url = URL(url)
+        return url.scheme, url.host, url.port
+
+    def _create_session(self) -> ClientSession:
+        connector = TCPConnector(
+            limit=self.config.limit,
+            limit_per_host=self.config.limit_per_host,
+            keepalive_timeout=self.config.keepalive_timeout,
+            ttl_dns_cache=self.config.ttl_dns_cache,
+            resolver=AsyncResolver(),
+        )
+        return ClientSession(connector=connector)
+
+    def get(self, url: str | URL) -> ClientSession:
+        loop = asyncio.get_running_loop()
+        origin = self._origin(url)
+        if (entry := self._sessions.get(origin)) is not None:
+            session_loop, session = entry
+            if session_loop is loop and not session.closed:
+                return session
+            if not session.closed and not session_loop.is_closed():
+                _logger.warning("Replacing HTTP session for %s created on a different event loop", origin)
+        session = self._create_session()
+        self._sessions[origin] = loop, session
+        return session
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        sessions, self._sessions = self._sessions, {}
+        await asyncio.gather(*(s.close() for session_loop, s in sessions.values() if session_loop is loop))
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "limit": self.config.limit,
+            "limit_per_host": self.config.limit_per_host,
+        }
+
+
+@functools.lru_cache
+def _client_session_pool() -> ClientSessionPool:
+    pool = ClientSessionPool(current_settings().http_client)
+    register_metrics_source("http_session_pool", pool.metrics)
+    return pool
+
+
+def client_session_pool_factory() -> ClientSessionPool:
+    return _client_session_pool()
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import abc
 import asyncio
+import contextlib
+import time
 from datetime import UTC, datetime
 from itertools import starmap
 from typing import TYPE_CHECKING, Any, ClassVar, TypedDict
@@ -14,9 +16,17 @@ from stac_pydantic.api.extensions.sort import SortDirections, SortExtension
 from starlette import status
 
 from src.core.settings import current_settings
+from src.services.circuit_breaker import circuit_breaker_factory
+from src.services.hedging import hedger_factory
+from src.services.session_pool import client_session_pool_factory
 from src.services.stac.schemas import FetchItemResult, FieldsExtension, StacSearch
+from src.utils.cache import TTLCache
+from src.utils.metrics import register_metrics_source
+from src.utils.singleflight import SingleFlight
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
     from geojson_pydantic import Polygon
     from pystac import Item
     from requests import Response
@@ -64,6 +74,12 @@ DATASET_LOOKUP: dict[str, DatasetLookupRecord] = {
 }
 SUPPORTED_DATASETS: set[str] = set(DATASET_LOOKUP.keys())
 
+SENTINEL_HUB_TOKEN_EXPIRY_MARGIN = 30
+
+_sentinel_hub_tokens: TTLCache[str, str] = TTLCache(maxsize=8)
+_sentinel_hub_token_flights: SingleFlight[str, str] = SingleFlight()
+register_metrics_source("sentinel_hub_token_single_flight", _sentinel_hub_token_flights.metrics)
+
 
 class StacSearchClientBase(abc.ABC):
     @abc.abstractmethod
@@ -99,7 +115,7 @@ class StacSearchClient:
         return response
 
     @staticmethod
-    def _sentinel_hub_auth_token() -> str:
+    def _fetch_sentinel_hub_token() -> dict[str, Any]:
         settings = current_settings()
 
         client = BackendApplicationClient(client_id=settings.sentinel_hub.client_id)
@@ -107,14 +123,32 @@ class StacSearchClient:
 
         oauth.register_compliance_hook("access_token_response", StacSearchClient._sentinel_hub_compliance_hook)
 
-        token = oauth.fetch_token(
+        return oauth.fetch_token(  # type: ignore[no-any-return]
             token_url=settings.sentinel_hub.token_url,
             client_secret=settings.sentinel_hub.client_secret,
             include_client_id=True,
         )
 
+    @staticmethod
+    async def _fetch_and_cache_sentinel_hub_token(client_id: str) -> str:
+        # OAuth2Session is blocking - keep it off the event loop
+        token = await asyncio.to_thread(StacSearchClient._fetch_sentinel_hub_token)
+        if isinstance(expires_at := token.get("expires_at"), int | float):
+            ttl = expires_at - time.time() - SENTINEL_HUB_TOKEN_EXPIRY_MARGIN
+            _sentinel_hub_tokens.set(client_id, token["access_token"], ttl=ttl)
         return token["access_token"]  # type: ignore[no-any-return]
 
+    @staticmethod
+    async def _sentinel_hub_auth_token() -> str:
+        client_id = current_settings().sentinel_hub.client_id
+        if (token := _sentinel_hub_tokens.get(client_id)) is not None:
+            return token
+        # Concurrent searches share a single token request
+        return await _sentinel_hub_token_flights.do(
+            client_id,
+            lambda: StacSearchClient._fetch_and_cache_sentinel_hub_token(client_id),
+        )
+
     async def fetch_items(
         self,
         collection: str,
@@ -157,17 +191,17 @@ class StacSearchClient:
             # field easily. If not set as datetime filter - get all data until now
             search_model["datetime"] = search_model.pop("datetime", None) or f"/{datetime.now(UTC).isoformat()}"
 
-        async with (
-            aiohttp.ClientSession() as session,
-            session.post(
-                search_url,
-                headers={"Authorization": f"Bearer {self._sentinel_hub_auth_token()}", "Accept": "application/geo+json"}
-                if lookup["processor"] == "Synergise"
-                else None,
-                json=search_model,
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response,
-        ):
+        headers = (
+            {"Authorization": f"Bearer {await self._sentinel_hub_auth_token()}", "Accept": "application/geo+json"}
+            if lookup["processor"] == "Synergise"
+            else None
+        )
+
+        # Searches are idempotent, so they can be hedged
+        async with hedger_factory(search_url, "search").hedged(
+            lambda: _post_search(search_url, headers, search_model),
+            failed=lambda response: response.status >= status.HTTP_500_INTERNAL_SERVER_ERROR,
+        ) as response:
             if response.status != status.HTTP_200_OK:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -292,5 +326,26 @@ class FakeStacClient(StacSearchClientBase):
         return self.has_results
 
 
+@contextlib.asynccontextmanager
+async def _post_search(
+    search_url: str,
+    headers: dict[str, str] | None,
+    search_model: dict[str, Any],
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    async with (
+        circuit_breaker_factory(search_url).guard() as outcome,
+        client_session_pool_factory()
+        .get(search_url)
+        .post(
+            search_url,
+            headers=headers,
+            json=search_model,
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as response,
+    ):
+        outcome.responded(failed=response.status >= status.HTTP_500_INTERNAL_SERVER_ERROR)
+        yield response
+
+
 def stac_client_factory() -> StacSearchClient:
     return StacSearchClient()
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Iterable
+
+
+async def gather_with_concurrency[T](limit: int, aws: Iterable[Awaitable[T]]) -> list[T]:
+    """Awaits all awaitables with at most `limit` of them running at once, results are returned in input order."""
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def bounded(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(bounded(aw) for aw in aws))
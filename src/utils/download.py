@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, Mapping
+
+
+class DownloadTooLargeError(Exception):
+    """Raised when a downloaded file exceeds the allowed size."""
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__(f"File exceeds the maximum allowed size of {max_size} bytes.")
+        self.max_size = max_size
+
+
+@dataclasses.dataclass(frozen=True)
+class Validators:
+    """HTTP cache validators of a downloaded file."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> Validators | None:
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        return None if etag is None and last_modified is None else cls(etag=etag, last_modified=last_modified)
+
+    def request_headers(self) -> dict[str, str]:
+        """Returns conditional request headers that make the server answer with 304 if the file did not change."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+async def read_chunks(chunks: AsyncIterable[bytes], max_size: int) -> bytes:
+    """Reads the chunks into memory.
+
+    Raises:
+        DownloadTooLargeError: If the content exceeds `max_size` bytes.
+
+    """
+    content = bytearray()
+    async for chunk in chunks:
+        if len(content) + len(chunk) > max_size:
+            raise DownloadTooLargeError(max_size)
+        content += chunk
+    return bytes(content)
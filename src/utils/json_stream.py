@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator
+
+_WHITESPACE = frozenset(" \t\n\r")
+_decoder = json.JSONDecoder()
+
+
+class _StreamReader:
+    """Text buffer over a stream of UTF-8 encoded chunks that keeps only the unparsed remainder in memory."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]) -> None:
+        self._chunks = aiter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    async def _fill(self) -> bool:
+        if self._eof:
+            return False
+        try:
+            chunk = await anext(self._chunks)
+        except StopAsyncIteration:
+            self._eof = True
+            text = self._text_decoder.decode(b"", final=True)
+        else:
+            text = self._text_decoder.decode(chunk)
+        self._buf = self._buf[self._pos :] + text
+        self._pos = 0
+        return True
+
+    def _error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    async def peek(self) -> str:
+        """Returns the next non-whitespace character without consuming it."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not await self._fill():
+                msg = "Unexpected end of JSON input"
+                raise self._error(msg)
+
+    async def take(self, *expected: str) -> str:
+        char = await self.peek()
+        if char not in expected:
+            msg = f"Expecting one of {', '.join(map(repr, expected))}"
+            raise self._error(msg)
+        self._pos += 1
+        return char
+
+    async def value(self) -> Any:
+        await self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not await self._fill():
+                    raise
+                continue
+            # Scalars such as numbers might continue in the next chunk
+            if end == len(self._buf) and not self._eof and await self._fill():
+                continue
+            self._pos = end
+            return obj
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes], key: str) -> AsyncIterator[Any]:
+    """Yields items of the array stored under `key` in a top-level JSON object, one by one.
+
+    Only the item being parsed and the remainder of the current chunk are kept in memory, so the document can be
+    arbitrarily large. Members preceding the array are parsed and discarded, the ones following it are not read.
+    Nothing is yielded if the key is missing.
+
+    Args:
+        chunks: The document as raw UTF-8 encoded chunks, e.g. `response.content.iter_chunked(...)`.
+        key: The key of the array to iterate over.
+
+    Raises:
+        json.JSONDecodeError: When the document is malformed or the value under `key` is not an array.
+
+    """
+    reader = _StreamReader(chunks)
+    await reader.take("{")
+    if await reader.peek() == "}":
+        return
+
+    while True:
+        name = await reader.value()
+        await reader.take(":")
+        if name == key:
+            break
+        await reader.value()
+        if await reader.take(",", "}") == "}":
+            return
+
+    await reader.take("[")
+    if await reader.peek() == "]":
+        return
+
+    while True:
+        yield await reader.value()
+        if await reader.take(",", "]") == "]":
+            return
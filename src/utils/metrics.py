@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_METRICS_SOURCES: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def register_metrics_source(name: str, source: Callable[[], dict[str, Any]]) -> None:
+    """Registers a callable reporting the metrics of a component under given name.
+
+    Registering a source under an already used name replaces the previous one.
+
+    Args:
+        name: The name of the component.
+        source: The callable returning the current metrics as a JSON serializable dictionary.
+
+    """
+    _METRICS_SOURCES[name] = source
+
+
+def collect_metrics() -> dict[str, dict[str, Any]]:
+    return {name: source() for name, source in sorted(_METRICS_SOURCES.items())}
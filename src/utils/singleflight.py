@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine, Hashable
+
+
+@dataclasses.dataclass
+class SingleFlightStats:
+    calls: int = 0
+    executions: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        return self.calls - self.executions
+
+
+class SingleFlight[K: Hashable, V]:
+    """Coalesces concurrent calls for the same key into a single in-flight execution.
+
+    The first caller for a key starts the call as a task, every caller arriving before it completes awaits the same
+    task and receives the same result or exception. Cancelling one of the callers does not cancel the shared call.
+
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[K, asyncio.Task[V]] = {}
+        self._stats = SingleFlightStats()
+
+    async def do(self, key: K, fn: Callable[[], Coroutine[Any, Any, V]]) -> V:
+        self._stats.calls += 1
+        task = self._in_flight.get(key)
+        # Tasks are bound to the loop that created them - never share them across loops
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._stats.executions += 1
+            task = asyncio.create_task(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: K, task: asyncio.Task[V]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case all waiters were cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "in_flight": len(self._in_flight),
+            "calls": self._stats.calls,
+            "executions": self._stats.executions,
+            "coalesced": self._stats.coalesced,
+        }
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.requests import Request
+
+from src.api.auth.dependencies import AuthContext, auth_context
+from tests.fakes.ades import fake_ades_client_factory
+from tests.fakes.ws_token_client import FakeTokenClient
+
+CLAIMS = {"sub": "test", "preferred_username": "test-user", "workspaces": ["test-workspace"]}
+
+
+def _request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+
+
+@patch("src.api.auth.dependencies.decode_token")
+def test_auth_context_should_verify_token_once_per_request(decode_token_mock: MagicMock) -> None:
+    decode_token_mock.return_value = CLAIMS
+    request = _request()
+    credential = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
+
+    first = auth_context(request, credential)
+    second = auth_context(request, credential)
+
+    assert first is second
+    assert request.state.auth_context is first
+    assert first.claims == CLAIMS
+    assert "decode_token" in first.timings
+    decode_token_mock.assert_called_once_with("token")
+
+
+@patch("src.api.auth.dependencies.ades_client_factory", side_effect=fake_ades_client_factory)
+@patch("src.api.auth.dependencies.ws_token_session_auth_client_factory", return_value=FakeTokenClient())
+async def test_auth_context_should_reuse_ades_client_for_the_same_workspace(
+    token_client_factory_mock: MagicMock,
+    ades_client_factory_mock: MagicMock,
+) -> None:
+    ctx = AuthContext(
+        credential=HTTPAuthorizationCredentials(scheme="Bearer", credentials="token"),
+        claims=CLAIMS,
+    )
+
+    first = await ctx.ades_client()
+    second = await ctx.ades_client("test-workspace")
+
+    assert first is second
+    token_client_factory_mock.assert_called_once_with(
+        token="token",  # noqa: S106
+        workspace="test-workspace",
+        identity="test",
+    )
+    ades_client_factory_mock.assert_called_once_with(workspace="test-workspace", token="token123")  # noqa: S106
+    assert "workspace_token" in ctx.timings
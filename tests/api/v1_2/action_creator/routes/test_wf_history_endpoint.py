@@ -14,7 +14,8 @@ from src.api.v1_2.action_creator.schemas import (
     OrderDirection,
     PaginationResults,
 )
-from src.services.ades.schemas import JobList, JobType, StatusCode
+from src.services.ades.job_index import WorkspaceJobIndex
+from src.services.ades.schemas import JobType, StatusCode
 from tests.fakes.ades import GET_JOB_LIST_RESPONSE
 
 if TYPE_CHECKING:
@@ -48,7 +49,7 @@ def test_get_job_submissions_endpoint_returns_valid_response_no_params(
         assert pagination_results.results[i].submitted_at <= pagination_results.results[i + 1].submitted_at
 
 
-@patch("src.api.v1_2.action_creator.routes.ades_client_factory")
+@patch("src.api.auth.dependencies.ades_client_factory")
 def test_get_job_submissions_returns_empty_result_set_when_ades_job_history_is_empty(
     ades_factory_mock: MagicMock,
     mocked_token_client_factory: MagicMock,  # noqa: ARG001
@@ -57,8 +58,7 @@ def test_get_job_submissions_returns_empty_result_set_when_ades_job_history_is_e
 ) -> None:
     # Arrange
     ades_mock = MagicMock()
-    list_jobs_mock = AsyncMock(return_value=(None, JobList(jobs=[], links=[], numberTotal=0).model_dump(mode="json")))
-    ades_mock.list_job_submissions = list_jobs_mock
+    ades_mock.get_job_index = AsyncMock(return_value=(None, WorkspaceJobIndex([])))
     ades_factory_mock.return_value = ades_mock
 
     # Act
@@ -78,7 +78,7 @@ def test_get_job_submissions_returns_empty_result_set_when_ades_job_history_is_e
     assert len(pagination_results.results) == 0
 
 
-@patch("src.api.v1_2.action_creator.routes.ades_client_factory")
+@patch("src.api.auth.dependencies.ades_client_factory")
 def test_get_job_submissions_returns_correct_pagination_with_fewer_jobs_than_per_page(
     ades_factory_mock: MagicMock,
     mocked_token_client_factory: MagicMock,  # noqa: ARG001
@@ -101,9 +101,7 @@ def test_get_job_submissions_returns_correct_pagination_with_fewer_jobs_than_per
     ]
 
     fake_ades_client = MagicMock()
-    fake_ades_client.list_job_submissions = AsyncMock(
-        return_value=(None, {"jobs": jobs, "numberTotal": num_jobs, "links": []})
-    )
+    fake_ades_client.get_job_index = AsyncMock(return_value=(None, WorkspaceJobIndex(jobs)))
     ades_factory_mock.return_value = fake_ades_client
 
     # Act
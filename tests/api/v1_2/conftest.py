@@ -16,7 +16,7 @@ if TYPE_CHECKING:
 def mocked_ades_factory() -> Generator[MagicMock]:
     ades_client_factory_mock: MagicMock
     with patch(  # type: ignore[assignment]
-        "src.api.v1_2.action_creator.routes.ades_client_factory",
+        "src.api.auth.dependencies.ades_client_factory",
         fake_ades_client_factory,
     ) as ades_client_factory_mock:
         ades_client_factory_mock.return_value = FakeADESClient
@@ -38,7 +38,7 @@ def mocked_ades_factory_ws() -> Generator[MagicMock]:
 def mocked_token_client_factory() -> Generator[MagicMock]:
     token_client_factory_mock: MagicMock
     with patch(  # type: ignore[assignment]
-        "src.api.v1_2.action_creator.routes.ws_token_session_auth_client_factory",
+        "src.api.auth.dependencies.ws_token_session_auth_client_factory",
         fake_ws_token_session_auth_client_factory,
     ) as token_client_factory_mock:
         token_client_factory_mock.return_value = FakeTokenClient
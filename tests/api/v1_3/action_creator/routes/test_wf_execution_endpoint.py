@@ -8,8 +8,11 @@ import pytest
 from starlette import status
 
 from src.api.v1_3.action_creator.schemas.history import ActionCreatorJob
+from src.api.v1_3.action_creator.schemas.presets import SIMPLEST_NDVI_WORKFLOW_SPEC
+from src.services.ades.base_client import ErrorResponse
 from src.services.stac.client import FakeStacClient
-from tests.api.v1_3.conftest import TEST_WORKFLOWS
+from tests.api.v1_3.conftest import TEST_WORKFLOWS, wait_for_submission_status
+from tests.fakes.ades import FakeADESClient
 
 if TYPE_CHECKING:
     from unittest.mock import MagicMock
@@ -88,3 +91,67 @@ def test_job_submission_endpoint_returns_400_when_no_items_to_process_for_given_
             response_body["detail"][0]["msg"] == "No STAC items found for the selected configuration. "
             "Adjust area, data set, date range, or functions and try again."
         )
+
+
+@patch("src.api.v1_3.action_creator.routes.stac_client_factory")
+def test_workflow_submissions_are_tracked_by_their_local_ids(
+    stac_client_factory_mock: MagicMock,
+    client: TestClient,
+    auth_token_module_scoped: str,
+    mocked_token_client_factory: MagicMock,  # noqa: ARG001
+    mocked_ades_factory: MagicMock,  # noqa: ARG001
+) -> None:
+    # Arrange
+    stac_client_factory_mock.return_value = FakeStacClient(has_results=True)
+
+    # Act - the client keeps its event loop, and the background submission, running between requests
+    with client:
+        response = client.post(
+            "/api/v1.3/action-creator/workflow-submissions",
+            headers={"Authorization": f"Bearer {auth_token_module_scoped}"},
+            json=SIMPLEST_NDVI_WORKFLOW_SPEC,
+        )
+        submission_id = response.json()["job_id"]
+        summary = wait_for_submission_status(client, auth_token_module_scoped, submission_id, "successful")
+
+    # Assert - the ADES job is reported under the submission ID
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert summary["job_id"] == submission_id
+
+
+@patch("src.api.v1_3.action_creator.routes.stac_client_factory")
+def test_workflow_submissions_that_fail_before_reaching_ades_are_reported(
+    stac_client_factory_mock: MagicMock,
+    client: TestClient,
+    auth_token_module_scoped: str,
+    mocked_token_client_factory: MagicMock,  # noqa: ARG001
+    mocked_ades_factory: MagicMock,  # noqa: ARG001
+) -> None:
+    # Arrange
+    stac_client_factory_mock.return_value = FakeStacClient(has_results=True)
+    error = ErrorResponse(code=status.HTTP_400_BAD_REQUEST, detail="Invalid CWL")
+
+    # Act
+    with client, patch.object(FakeADESClient, "register_process_if_changed", return_value=(error, None)):
+        response = client.post(
+            "/api/v1.3/action-creator/workflow-submissions",
+            headers={"Authorization": f"Bearer {auth_token_module_scoped}"},
+            json=SIMPLEST_NDVI_WORKFLOW_SPEC,
+        )
+        submission_id = response.json()["job_id"]
+        summary = wait_for_submission_status(client, auth_token_module_scoped, submission_id, "failed")
+        history = client.get(
+            "/api/v1.3/action-creator/workflow-submissions",
+            headers={"Authorization": f"Bearer {auth_token_module_scoped}"},
+        ).json()
+        failed_history = client.get(
+            "/api/v1.3/action-creator/workflow-submissions",
+            headers={"Authorization": f"Bearer {auth_token_module_scoped}"},
+            params={"status": "failed"},
+        ).json()
+
+    # Assert
+    assert summary["error"] == error.model_dump()
+    assert summary["successful"] is False
+    for results in (history["results"], failed_history["results"]):
+        assert [job["job_id"] for job in results if job["error"] is not None] == [submission_id]
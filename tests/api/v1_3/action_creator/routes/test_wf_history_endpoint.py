@@ -14,7 +14,8 @@ from src.api.v1_3.action_creator.schemas.history import (
     OrderDirection,
     PaginationResults,
 )
-from src.services.ades.schemas import JobList, JobType, StatusCode
+from src.services.ades.job_index import WorkspaceJobIndex
+from src.services.ades.schemas import JobType, StatusCode
 from tests.fakes.ades import GET_JOB_LIST_RESPONSE
 
 if TYPE_CHECKING:
@@ -48,7 +49,7 @@ def test_get_job_submissions_endpoint_returns_valid_response_no_params(
         assert pagination_results.results[i].submitted_at <= pagination_results.results[i + 1].submitted_at
 
 
-@patch("src.api.v1_3.action_creator.routes.ades_client_factory")
+@patch("src.api.auth.dependencies.ades_client_factory")
 def test_get_job_submissions_returns_empty_result_set_when_ades_job_history_is_empty(
     ades_factory_mock: MagicMock,
     mocked_token_client_factory: MagicMock,  # noqa: ARG001
@@ -57,8 +58,8 @@ def test_get_job_submissions_returns_empty_result_set_when_ades_job_history_is_e
 ) -> None:
     # Arrange
     ades_mock = MagicMock()
-    list_jobs_mock = AsyncMock(return_value=(None, JobList(jobs=[], links=[], numberTotal=0).model_dump(mode="json")))
-    ades_mock.list_job_submissions = list_jobs_mock
+    ades_mock.workspace = "test-workspace"
+    ades_mock.get_job_index = AsyncMock(return_value=(None, WorkspaceJobIndex([])))
     ades_factory_mock.return_value = ades_mock
 
     # Act
@@ -78,7 +79,7 @@ def test_get_job_submissions_returns_empty_result_set_when_ades_job_history_is_e
     assert len(pagination_results.results) == 0
 
 
-@patch("src.api.v1_3.action_creator.routes.ades_client_factory")
+@patch("src.api.auth.dependencies.ades_client_factory")
 def test_get_job_submissions_returns_correct_pagination_with_fewer_jobs_than_per_page(
     ades_factory_mock: MagicMock,
     mocked_token_client_factory: MagicMock,  # noqa: ARG001
@@ -101,9 +102,8 @@ def test_get_job_submissions_returns_correct_pagination_with_fewer_jobs_than_per
     ]
 
     fake_ades_client = MagicMock()
-    fake_ades_client.list_job_submissions = AsyncMock(
-        return_value=(None, {"jobs": jobs, "numberTotal": num_jobs, "links": []})
-    )
+    fake_ades_client.workspace = "test-workspace"
+    fake_ades_client.get_job_index = AsyncMock(return_value=(None, WorkspaceJobIndex(jobs)))
     ades_factory_mock.return_value = fake_ades_client
 
     # Act
@@ -212,3 +212,47 @@ def test_get_job_submissions_with_custom_per_page_item_count_and_page_idx(
     else:
         assert pagination_results.results_on_current_page == 0
         assert len(pagination_results.results) == 0
+
+
+@pytest.mark.parametrize(
+    ("status_filter", "ades_status"),
+    [("submitted", StatusCode.accepted), ("cancelled", StatusCode.dismissed), ("running", StatusCode.running)],
+)
+@patch("src.api.auth.dependencies.ades_client_factory")
+def test_get_job_submissions_filters_and_reports_statuses_used_by_the_api(
+    ades_factory_mock: MagicMock,
+    mocked_token_client_factory: MagicMock,  # noqa: ARG001
+    client: TestClient,
+    auth_token_module_scoped: str,
+    status_filter: str,
+    ades_status: StatusCode,
+) -> None:
+    # Arrange
+    jobs = [
+        {
+            "jobID": f"job-{job_status}",
+            "processID": "process",
+            "status": job_status,
+            "created": datetime.now(tz=UTC),
+            "type": JobType.process,
+            "links": [],
+        }
+        for job_status in StatusCode
+    ]
+
+    fake_ades_client = MagicMock()
+    fake_ades_client.workspace = "test-workspace"
+    fake_ades_client.get_job_index = AsyncMock(return_value=(None, WorkspaceJobIndex(jobs)))
+    ades_factory_mock.return_value = fake_ades_client
+
+    # Act
+    response = client.get(
+        "/api/v1.3/action-creator/workflow-submissions",
+        headers={"Authorization": f"Bearer {auth_token_module_scoped}"},
+        params={"status": status_filter},
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [(job["job_id"], job["status"]) for job in results] == [(f"job-{ades_status}", status_filter)]
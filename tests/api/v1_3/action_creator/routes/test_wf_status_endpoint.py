@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import uuid
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
 
+import pytest
 from starlette import status
 
-from src.api.v1_3.action_creator.schemas.history import ActionCreatorJobSummary
+from src.api.v1_3.action_creator.schemas.history import (
+    MAX_BULK_STATUS_SUBMISSIONS,
+    ActionCreatorJobSummary,
+    BulkJobStatusResponse,
+)
+from src.services.ades.base_client import ErrorResponse
+from src.services.ades.schemas import StatusCode, StatusInfo
+from tests.fakes.ades import GET_JOB_IN_PROGRESS_STATUS_RESPONSE, FakeADESClient
 
 if TYPE_CHECKING:
     from unittest.mock import MagicMock
@@ -31,3 +40,74 @@ def test_get_job_submissions_status_endpoint_returns_successful_response(
     # Assert
     assert response.status_code == status.HTTP_200_OK
     ActionCreatorJobSummary(**response.json())
+
+
+@pytest.mark.parametrize(
+    ("ades_status", "expected_status"),
+    [(StatusCode.accepted, "submitted"), (StatusCode.dismissed, "cancelled"), (StatusCode.running, "running")],
+)
+def test_get_job_submissions_status_endpoint_reports_statuses_used_by_the_api(
+    client: TestClient,
+    mocked_ades_factory: MagicMock,  # noqa: ARG001
+    mocked_token_client_factory: MagicMock,  # noqa: ARG001
+    auth_token_module_scoped: str,
+    ades_status: StatusCode,
+    expected_status: str,
+) -> None:
+    # Arrange
+    job = StatusInfo.model_validate({**GET_JOB_IN_PROGRESS_STATUS_RESPONSE, "status": ades_status})
+
+    # Act
+    with patch.object(FakeADESClient, "get_job_details", return_value=(None, job)):
+        response = client.get(
+            f"/api/v1.3/action-creator/workflow-submissions/{uuid.uuid4()}",
+            headers={"Authorization": f"Bearer {auth_token_module_scoped}"},
+        )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == expected_status
+
+
+def test_bulk_job_status_endpoint_returns_results_and_per_job_errors(
+    client: TestClient,
+    mocked_ades_factory: MagicMock,  # noqa: ARG001
+    mocked_token_client_factory: MagicMock,  # noqa: ARG001
+    auth_token_module_scoped: str,
+) -> None:
+    # Arrange
+    found, missing = str(uuid.uuid4()), str(uuid.uuid4())
+    get_job_details = FakeADESClient.get_job_details
+
+    async def get_job_details_mock(self: FakeADESClient, job_id: str) -> Any:
+        if job_id == missing:
+            return ErrorResponse(code=status.HTTP_404_NOT_FOUND, detail=f"Job '{job_id}' does not exist."), None
+        return await get_job_details(self, job_id)
+
+    # Act
+    with patch.object(FakeADESClient, "get_job_details", get_job_details_mock):
+        response = client.post(
+            "/api/v1.3/action-creator/workflow-submissions/status",
+            headers={"Authorization": f"Bearer {auth_token_module_scoped}"},
+            json={"submission_ids": [found, missing, found]},
+        )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    result = BulkJobStatusResponse(**response.json())
+    assert list(result.results) == [found]
+    assert list(result.errors) == [missing]
+    assert result.errors[missing].code == status.HTTP_404_NOT_FOUND
+
+
+def test_bulk_job_status_endpoint_rejects_too_many_submissions(
+    client: TestClient,
+    auth_token_module_scoped: str,
+) -> None:
+    response = client.post(
+        "/api/v1.3/action-creator/workflow-submissions/status",
+        headers={"Authorization": f"Bearer {auth_token_module_scoped}"},
+        json={"submission_ids": [str(uuid.uuid4()) for _ in range(MAX_BULK_STATUS_SUBMISSIONS + 1)]},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
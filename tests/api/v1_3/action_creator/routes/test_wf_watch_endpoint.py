@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from starlette import status
+from starlette.websockets import WebSocketDisconnect
+
+from src.api.v1_3.action_creator.schemas.presets import SIMPLEST_NDVI_WORKFLOW_SPEC
+from src.services.ades.base_client import ErrorResponse
+from src.services.stac.client import FakeStacClient
+from tests.api.v1_3.conftest import wait_for_submission_status
+from tests.fakes.ades import GET_JOB_FINISHED_STATUS_RESPONSE, FakeADESClient
+
+if TYPE_CHECKING:
+    from unittest.mock import MagicMock
+
+    from starlette.testclient import TestClient
+
+WATCH_ENDPOINT = "/api/v1.3/action-creator/workflow-submissions/watch"
+
+
+def test_watch_endpoint_sends_snapshot_of_active_jobs(
+    client: TestClient,
+    mocked_ades_factory: MagicMock,  # noqa: ARG001
+    mocked_token_client_factory: MagicMock,  # noqa: ARG001
+    auth_token_module_scoped: str,
+) -> None:
+    with client.websocket_connect(WATCH_ENDPOINT) as websocket:
+        websocket.send_json({"token": f"Bearer {auth_token_module_scoped}"})
+        message = websocket.receive_json()
+
+    assert message["event"] == "status"
+    assert message["data"]["status"] == "running"
+    assert message["data"]["successful"] is None
+
+
+def test_watch_endpoint_sends_snapshot_of_requested_jobs(
+    client: TestClient,
+    mocked_ades_factory: MagicMock,  # noqa: ARG001
+    mocked_token_client_factory: MagicMock,  # noqa: ARG001
+    auth_token_module_scoped: str,
+) -> None:
+    job_id = GET_JOB_FINISHED_STATUS_RESPONSE["jobID"]
+
+    with client.websocket_connect(WATCH_ENDPOINT) as websocket:
+        websocket.send_json({"token": f"Bearer {auth_token_module_scoped}", "submission_ids": [job_id]})
+        message = websocket.receive_json()
+
+    assert message["event"] == "status"
+    assert message["data"]["job_id"] == job_id
+    assert message["data"]["status"] == "successful"
+    assert message["data"]["successful"] is True
+
+
+@pytest.mark.parametrize("subscription", [{"token": "Bearer invalid"}, {"token": "invalid"}, {"workspace": "ws"}])
+def test_watch_endpoint_closes_connection_when_subscription_is_invalid(
+    client: TestClient,
+    subscription: dict[str, str],
+) -> None:
+    with client.websocket_connect(WATCH_ENDPOINT) as websocket:
+        websocket.send_json(subscription)
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            websocket.receive_json()
+
+    assert exc_info.value.code in {status.WS_1007_INVALID_FRAME_PAYLOAD_DATA, status.WS_1008_POLICY_VIOLATION}
+
+
+@patch("src.api.v1_3.action_creator.routes.stac_client_factory")
+def test_watch_endpoint_sends_snapshot_of_submissions_that_have_not_reached_ades(
+    stac_client_factory_mock: MagicMock,
+    client: TestClient,
+    mocked_ades_factory: MagicMock,  # noqa: ARG001
+    mocked_token_client_factory: MagicMock,  # noqa: ARG001
+    auth_token_module_scoped: str,
+) -> None:
+    # Arrange
+    stac_client_factory_mock.return_value = FakeStacClient(has_results=True)
+    error = ErrorResponse(code=status.HTTP_400_BAD_REQUEST, detail="Invalid CWL")
+
+    with client, patch.object(FakeADESClient, "register_process_if_changed", return_value=(error, None)):
+        response = client.post(
+            "/api/v1.3/action-creator/workflow-submissions",
+            headers={"Authorization": f"Bearer {auth_token_module_scoped}"},
+            json=SIMPLEST_NDVI_WORKFLOW_SPEC,
+        )
+        submission_id = response.json()["job_id"]
+        wait_for_submission_status(client, auth_token_module_scoped, submission_id, "failed")
+
+        # Act
+        with client.websocket_connect(WATCH_ENDPOINT) as websocket:
+            websocket.send_json({"token": f"Bearer {auth_token_module_scoped}", "submission_ids": [submission_id]})
+            message = websocket.receive_json()
+
+    # Assert
+    assert message["event"] == "status"
+    assert message["data"]["job_id"] == submission_id
+    assert message["data"]["status"] == "failed"
+    assert message["data"]["error"] == error.model_dump()
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+from typing import TYPE_CHECKING, Any
 from unittest.mock import MagicMock, patch
 
 import pytest
+from starlette import status
 
 from src.api.v1_3.action_creator.schemas.presets import (
     ADVANCED_WATER_QUALITY_WORKFLOW_SPEC,
@@ -23,18 +25,34 @@ from src.api.v1_3.action_creator.schemas.presets import (
     WF_ID_COLLISION_PRESET,
     WF_OUTPUT_NOT_MAPPED_TO_TASK_RESULT_PRESET,
 )
+from src.core.settings import current_settings
+from src.services.ades.submissions import SubmissionPipeline, SubmissionStore
+from src.services.admission import SubmissionAdmission
 from tests.fakes.ades import FakeADESClient, fake_ades_client_factory
 from tests.fakes.ws_token_client import FakeTokenClient
 
 if TYPE_CHECKING:
     from collections.abc import Generator
 
+    from starlette.testclient import TestClient
+
+
+@pytest.fixture(autouse=True)
+def submission_pipeline() -> Generator[SubmissionPipeline]:
+    # Every test gets its own submissions, kept in memory, and its own submission rate limits
+    pipeline = SubmissionPipeline(
+        SubmissionStore(":memory:", retention=3600, stale_after=3600),
+        SubmissionAdmission(current_settings().admission),
+    )
+    with patch("src.api.v1_3.action_creator.routes.submission_pipeline_factory", return_value=pipeline):
+        yield pipeline
+
 
 @pytest.fixture
 def mocked_ades_factory() -> Generator[MagicMock]:
     ades_client_factory_mock: MagicMock
     with patch(  # type: ignore[assignment]
-        "src.api.v1_3.action_creator.routes.ades_client_factory",
+        "src.api.auth.dependencies.ades_client_factory",
         fake_ades_client_factory,
     ) as ades_client_factory_mock:
         ades_client_factory_mock.return_value = FakeADESClient
@@ -45,7 +63,7 @@ def mocked_ades_factory() -> Generator[MagicMock]:
 def mocked_token_client_factory() -> Generator[MagicMock]:
     token_client_factory_mock: MagicMock
     with patch(  # type: ignore[assignment]
-        "src.api.v1_3.action_creator.routes.ws_token_session_auth_client_factory",
+        "src.api.auth.dependencies.ws_token_session_auth_client_factory",
     ) as token_client_factory_mock:
         token_client_factory_mock.return_value = FakeTokenClient()
         yield token_client_factory_mock
@@ -133,3 +151,22 @@ TEST_WORKFLOWS = {
         "value": WF_ID_COLLISION_PRESET,
     },
 }
+
+
+def wait_for_submission_status(
+    client: TestClient,
+    token: str,
+    submission_id: str,
+    expected_status: str,
+) -> dict[str, Any]:
+    """Polls the status of a workflow submission made by a client with a running event loop."""
+    for _ in range(100):
+        response = client.get(
+            f"/api/v1.3/action-creator/workflow-submissions/{submission_id}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        if (summary := response.json())["status"] == expected_status:
+            return summary  # type: ignore[no-any-return]
+        client.portal.call(asyncio.sleep, 0.01)  # type: ignore[union-attr]
+    pytest.fail(f"Submission did not reach '{expected_status}' status")
@@ -17,6 +17,7 @@ if TYPE_CHECKING:
         ("get", "action-creator/workflow-submissions/dummy-id"),
         ("post", "action-creator/workflow-submissions"),
         ("delete", "action-creator/workflow-submissions/dummy-id"),
+        ("get", "health/metrics"),
     ],
     ids=[
         "GET-functions",
@@ -24,6 +25,7 @@ if TYPE_CHECKING:
         "GET-job-details",
         "POST-submissions",
         "DELETE-job",
+        "GET-metrics",
     ],
 )
 @pytest.mark.parametrize("api_version", ["/api/v1.3"], ids=["v1.3"])
@@ -45,6 +47,7 @@ def test_functions_endpoint_returns_forbidden_error_when_no_token_specified_v1_3
         ("get", "action-creator/workflow-submissions/dummy-id"),
         ("post", "action-creator/workflow-submissions"),
         ("delete", "action-creator/workflow-submissions/dummy-id"),
+        ("get", "health/metrics"),
     ],
     ids=[
         "GET-functions",
@@ -52,6 +55,7 @@ def test_functions_endpoint_returns_forbidden_error_when_no_token_specified_v1_3
         "GET-job-details",
         "POST-submissions",
         "DELETE-job",
+        "GET-metrics",
     ],
 )
 @pytest.mark.parametrize("api_version", ["/api/v1.3"], ids=["v1.3"])
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import contextlib
 from typing import TYPE_CHECKING, Any
 
 from src.services.ades.base_client import ADESClientBase, ErrorResponse
+from src.services.ades.job_index import TJobRecord, WorkspaceJobIndex, job_record
 from src.services.ades.schemas import JobList, Process, ProcessList, ProcessSummary, StatusCode, StatusInfo
 from src.utils.logging import get_logger
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
     from pathlib import Path
     from uuid import UUID
 
@@ -978,7 +981,8 @@ GET_JOB_LIST_RESPONSE = {
     "jobs": [
         *GET_ALL_FAILED_JOBS_RESPONSE,
         GET_JOB_FINISHED_STATUS_RESPONSE,
-        GET_JOB_IN_PROGRESS_STATUS_RESPONSE,
+        # ADES lists every job once - use a different job for the in-progress entry
+        {**GET_JOB_IN_PROGRESS_STATUS_RESPONSE, "jobID": "f1c2d3e4-8325-11ef-8d25-9625a5233070"},
     ],
     "links": [
         {
@@ -1072,6 +1076,8 @@ GET_JOB_RESULTS_RESPONSE = {
 
 
 class FakeADESClient(ADESClientBase):
+    workspace = "fake-workspace"
+
     async def get_job_details(self, job_id: str | UUID) -> tuple[ErrorResponse | None, StatusInfo | None]:
         return None, StatusInfo(**GET_JOB_FINISHED_STATUS_RESPONSE)
 
@@ -1087,6 +1093,27 @@ class FakeADESClient(ADESClientBase):
     ) -> tuple[ErrorResponse | None, JobList | dict[str, Any] | None]:
         return None, GET_JOB_LIST_RESPONSE if raw_output else JobList(**GET_JOB_LIST_RESPONSE)
 
+    @contextlib.asynccontextmanager
+    async def stream_job_submissions(
+        self,
+        *,
+        limit: int = 100,
+        skip: int = 0,
+        statuses: Iterable[str] = (),
+    ) -> AsyncIterator[tuple[ErrorResponse | None, AsyncIterator[TJobRecord] | None]]:
+        statuses = set(statuses)
+
+        async def records() -> AsyncIterator[TJobRecord]:  # noqa: RUF029
+            for job in GET_JOB_LIST_RESPONSE["jobs"][skip : skip + limit]:  # type: ignore[index]
+                if not statuses or job["status"] in statuses:
+                    yield job_record(job)
+
+        yield None, records()
+
+    async def get_job_index(self) -> tuple[ErrorResponse | None, WorkspaceJobIndex | None]:
+        err, jobs = await self.list_job_submissions(raw_output=True)
+        return err, None if jobs is None else WorkspaceJobIndex(jobs["jobs"])  # type: ignore[index]
+
     async def cancel_or_delete_job(self, job_id: str | UUID) -> tuple[ErrorResponse | None, StatusInfo | None]:
         job = StatusInfo(**GET_JOB_FINISHED_STATUS_RESPONSE)
         job.status = StatusCode.dismissed
@@ -1106,6 +1133,13 @@ class FakeADESClient(ADESClientBase):
     ) -> tuple[ErrorResponse | None, ProcessSummary | None]:
         return None, ProcessSummary(**REGISTER_PROCESS_RESPONSE)
 
+    async def register_process_if_changed(
+        self,
+        process_identifier: str,
+        cwl: dict[str, Any] | bytes,
+    ) -> tuple[ErrorResponse | None, ProcessSummary | None]:
+        return None, ProcessSummary.model_validate(REGISTER_PROCESS_RESPONSE)
+
     async def process_exists(self, process_identifier: str) -> tuple[ErrorResponse | None, bool | None]:
         return None, True
 
@@ -1144,5 +1178,7 @@ class FakeADESClient(ADESClientBase):
         return None, ProcessSummary(**REGISTER_PROCESS_RESPONSE)
 
 
-def fake_ades_client_factory(**kwargs: Any) -> FakeADESClient:  # noqa: ARG001
-    return FakeADESClient(url="https://fake.ades.com/api", logger=get_logger("fake_ades"))
+def fake_ades_client_factory(**kwargs: Any) -> FakeADESClient:
+    client = FakeADESClient(url="https://fake.ades.com/api", logger=get_logger("fake_ades"))
+    client.workspace = kwargs.get("workspace", client.workspace)
+    return client
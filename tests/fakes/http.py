@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+
+class _FakeStreamReader:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    async def read(self, n: int = -1) -> bytes:
+        chunk, self.data = (self.data, b"") if n < 0 else (self.data[:n], self.data[n:])
+        return chunk
+
+    async def iter_chunked(self, n: int) -> AsyncIterator[bytes]:
+        while chunk := await self.read(n):
+            yield chunk
+
+
+class FakeResponse:
+    def __init__(self, status: int = 200, payload: Any = None, headers: dict[str, str] | None = None) -> None:
+        self.status = status
+        self.payload = payload
+        self.headers = headers or {}
+        self.method = "GET"
+        self.url = "http://fake"
+
+    @property
+    def content(self) -> _FakeStreamReader:
+        payload = self.payload if isinstance(self.payload, str) else json.dumps(self.payload)
+        return _FakeStreamReader(payload.encode("utf-8"))
+
+    async def json(self) -> Any:
+        return self.payload
+
+    async def text(self) -> str:
+        return self.payload if isinstance(self.payload, str) else json.dumps(self.payload)
+
+    async def read(self) -> bytes:
+        return (await self.text()).encode("utf-8")
+
+
+class _FakeRequestContext:
+    def __init__(self, response: FakeResponse) -> None:
+        self.response = response
+
+    async def __aenter__(self) -> FakeResponse:
+        return self.response
+
+    async def __aexit__(self, *_: object) -> None:
+        return None
+
+
+class FakeRequester:
+    """Replacement for `APIClient._request` serving queued responses and recording calls."""
+
+    def __init__(self, *responses: FakeResponse | Callable[[str, str], FakeResponse]) -> None:
+        self.responses = list(responses)
+        self.calls: list[tuple[str, str, dict[str, Any]]] = []
+
+    def __call__(self, method: str, url: str, **kwargs: Any) -> _FakeRequestContext:
+        self.calls.append((method, url, kwargs))
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if callable(response):
+            response = response(method, url)
+        return _FakeRequestContext(response)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.testclient import TestClient
+
+from src.api.responses import CompressionMiddleware, negotiate_encoding
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+PAYLOAD = {"results": [{"job_id": str(i), "status": "successful"} for i in range(100)]}
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/large")
+    def large() -> dict[str, list[dict[str, str]]]:
+        return PAYLOAD
+
+    @app.get("/small")
+    def small() -> dict[str, str]:
+        return {"status": "ok"}
+
+    def chunks() -> Iterator[bytes]:
+        for _ in range(3):
+            yield b"data: " + b"x" * 100 + b"\n\n"
+
+    @app.get("/stream")
+    def stream(media_type: str) -> StreamingResponse:
+        return StreamingResponse(chunks(), media_type=media_type)
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip;q=0.8", "gzip"),
+        ("br;q=0, *", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding_should_prefer_brotli_unless_client_prefers_otherwise(
+    accept_encoding: str,
+    expected: str | None,
+) -> None:
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+def test_compression_middleware_should_compress_large_responses(client: TestClient, encoding: str) -> None:
+    response = client.get("/large", headers={"Accept-Encoding": encoding})
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    # Decoded by the test client
+    assert response.json() == PAYLOAD
+
+
+def test_compression_middleware_should_skip_small_responses(client: TestClient) -> None:
+    response = client.get("/small", headers={"Accept-Encoding": "br"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"status": "ok"}
+
+
+def test_compression_middleware_should_compress_streamed_responses_but_not_event_streams(client: TestClient) -> None:
+    streamed = client.get("/stream", params={"media_type": "text/plain"}, headers={"Accept-Encoding": "gzip"})
+    events = client.get("/stream", params={"media_type": "text/event-stream"}, headers={"Accept-Encoding": "gzip"})
+
+    assert streamed.headers["content-encoding"] == "gzip"
+    assert streamed.text == events.text
+    assert "content-encoding" not in events.headers
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from benchmarks.load_test import _is_error, find_regressions, latency_percentiles
+
+
+def _summary(p95: float, throughput: float, peak_rss_mb: float = 200) -> dict[str, Any]:
+    return {
+        "latency_ms": {"p50": p95 / 2, "p95": p95, "p99": p95},
+        "throughput_rps": throughput,
+        "peak_rss_mb": peak_rss_mb,
+    }
+
+
+def test_latency_percentiles_should_use_nearest_rank() -> None:
+    latencies = [i / 1000 for i in range(1, 101)]
+
+    result = latency_percentiles(latencies)
+
+    assert result["p50"] == pytest.approx(50)
+    assert result["p95"] == pytest.approx(95)
+    assert result["p99"] == pytest.approx(99)
+    assert result["max"] == pytest.approx(100)
+    assert latency_percentiles([]) == {}
+
+
+def test_find_regressions_should_report_metrics_worse_than_tolerated() -> None:
+    baseline = {"history": _summary(p95=100, throughput=50), "status": _summary(p95=100, throughput=50)}
+    results = {
+        "history": _summary(p95=130, throughput=45),
+        "status": _summary(p95=80, throughput=100, peak_rss_mb=210),
+        "submission": _summary(p95=1_000, throughput=1),
+    }
+
+    regressions = find_regressions(results, baseline, tolerance=0.2)
+
+    assert regressions == [
+        "history: p95 latency 100.00 -> 130.00 (+30% worse)",
+        "history: p99 latency 100.00 -> 130.00 (+30% worse)",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("status_code", "expected"),
+    [("200", False), ("202", False), ("404", True), ("429", False), ("500", True), ("ConnectError", True)],
+)
+def test_is_error_should_count_failures_apart_from_rejected_requests(status_code: str, *, expected: bool) -> None:
+    assert _is_error(status_code) is expected
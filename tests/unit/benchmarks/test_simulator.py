@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING
+
+import jwt
+import uvicorn
+from starlette.testclient import TestClient
+
+from benchmarks.simulator import DatasetSettings, SimulatorSettings, UpstreamProfile, create_app
+from src.api.auth.schemas import TokenResponse
+from src.services.ades.client import ADESClient
+from src.services.ades.schemas import JobList
+from src.services.ades.token_client import WorkspaceScopedTokenClient
+from src.services.session_pool import client_session_pool_factory
+from src.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from fastapi import FastAPI
+
+NO_LATENCY = UpstreamProfile(latency=0)
+OIDC_URL = "/keycloak/realms/eodhp/protocol/openid-connect"
+
+
+def _settings(**profiles: UpstreamProfile) -> SimulatorSettings:
+    return SimulatorSettings(
+        ades=profiles.get("ades", NO_LATENCY),
+        stac=profiles.get("stac", NO_LATENCY),
+        workspaces=profiles.get("workspaces", NO_LATENCY),
+        keycloak=profiles.get("keycloak", NO_LATENCY),
+        dataset=DatasetSettings(jobs_per_workspace=250, processes_per_workspace=3, stac_items=40),
+    )
+
+
+@contextlib.asynccontextmanager
+async def _serve(app: FastAPI) -> AsyncIterator[str]:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:  # noqa: ASYNC110
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await task
+        await client_session_pool_factory().close()
+
+
+def test_simulator_should_issue_tokens_verifiable_with_its_jwks() -> None:
+    client = TestClient(create_app(_settings()))
+
+    token = client.post(OIDC_URL + "/token", data={"grant_type": "password", "username": "alice"}).json()
+    jwks = jwt.PyJWKSet.from_dict(client.get(OIDC_URL + "/certs").json())
+    claims = jwt.decode(
+        token["access_token"],
+        jwks[jwt.get_unverified_header(token["access_token"])["kid"]].key,
+        algorithms=["RS256"],
+        audience="account",
+    )
+
+    assert claims["preferred_username"] == "alice"
+    assert claims["workspaces"] == ["alice"]
+    # The API validates token responses before passing them on
+    TokenResponse(**token)
+
+
+def test_simulator_should_paginate_stac_search() -> None:
+    client = TestClient(create_app(_settings()))
+
+    first = client.post("/stac/catalogs/ceda/search", json={"limit": 25}).json()
+    next_link = next(link for link in first["links"] if link["rel"] == "next")
+    second = client.post("/stac/catalogs/ceda/search", json=next_link["body"]).json()
+
+    assert len(first["features"]) == 25  # noqa: PLR2004
+    assert len(second["features"]) == 15  # noqa: PLR2004
+    assert all(link["rel"] != "next" for link in second["links"])
+
+
+def test_simulator_should_inject_errors_and_throttling_per_upstream() -> None:
+    client = TestClient(
+        create_app(
+            _settings(
+                ades=UpstreamProfile(latency=0, error_rate=1, error_statuses=[502]),
+                stac=UpstreamProfile(latency=0, throttle_interval=60, throttle_duration=60, throttle_retry_after=3),
+            )
+        )
+    )
+
+    ades_response = client.get("/ades/alice/ogc-api/jobs")
+    stac_response = client.post("/stac/catalogs/ceda/search", json={})
+    stats = client.get("/_simulator/stats").json()
+
+    assert ades_response.status_code == 502  # noqa: PLR2004
+    assert stac_response.status_code == 429  # noqa: PLR2004
+    assert stac_response.headers["Retry-After"] == "3"
+    assert stats["upstreams"]["/ades"] == {"requests": 1, "errors": 1}
+    assert stats["upstreams"]["/stac"] == {"requests": 1, "throttled": 1}
+
+
+async def test_simulator_should_serve_real_clients_over_http() -> None:
+    app = create_app(_settings())
+    async with _serve(app) as base_url:
+        user_token = app.state.simulator.issuer.user_token("alice")
+        token_client = WorkspaceScopedTokenClient(
+            url=f"{base_url}/workspaces",
+            workspace="alice",
+            token=user_token,
+            logger=get_logger("simulator"),
+        )
+        err, workspace_token = await token_client.get_token()
+        assert err is None
+        assert workspace_token is not None
+
+        ades = ADESClient(
+            url=f"{base_url}/ades",
+            ogc_processes_api_path="ogc-api/processes",
+            ogc_jobs_api_path="ogc-api/jobs",
+            workspace="alice",
+            token=workspace_token.access,
+            logger=get_logger("simulator"),
+        )
+        _, jobs = await ades.list_job_submissions(limit=100, skip=200)
+        _, executed = await ades.execute_process("workflow-1", {"aoi": "POLYGON EMPTY"})
+        assert executed is not None
+        _, details = await ades.get_job_details(executed.job_id)
+        err, _ = await ades.get_job_details("unknown")
+
+    assert isinstance(jobs, JobList)
+    assert len(jobs.jobs) == 50  # noqa: PLR2004
+    assert jobs.number_total == 250  # noqa: PLR2004
+    assert details is not None
+    assert details.status == "accepted"
+    assert err is not None
+    assert err.code == 404  # noqa: PLR2004
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+import jwt.exceptions
+import pytest
+from fastapi import HTTPException
+
+from src.api.auth.routes import decode_token
+from src.services.auth.claims import VerifiedClaimsCache, verified_claims_cache_factory
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+@pytest.fixture(autouse=True)
+def clear_claims_cache() -> Generator[None]:
+    verified_claims_cache_factory().clear()
+    yield
+    verified_claims_cache_factory().clear()
+
+
+def test_verified_claims_cache_should_not_cache_tokens_without_expiry() -> None:
+    cache = VerifiedClaimsCache(maxsize=10)
+
+    cache.set("token", {"sub": "test"})
+
+    assert cache.get("token") is None
+
+
+def test_verified_claims_cache_should_drop_claims_once_token_expires() -> None:
+    cache = VerifiedClaimsCache(maxsize=10)
+
+    cache.set("token", {"sub": "test", "exp": time.time() - 1})
+
+    assert cache.get("token") is None
+
+
+@patch("src.api.auth.routes.jwt.decode")
+@patch("src.api.auth.routes.jwks_cache_factory")
+def test_decode_token_should_verify_token_only_once(
+    jwks_cache_factory_mock: MagicMock,
+    jwt_decode_mock: MagicMock,
+) -> None:
+    claims = {"sub": "test", "exp": time.time() + 60}
+    jwt_decode_mock.return_value = claims
+
+    results = [decode_token("token") for _ in range(3)]
+
+    assert results == [claims] * 3
+    assert jwt_decode_mock.call_count == 1
+    assert jwks_cache_factory_mock.return_value.get_signing_key_from_jwt.call_count == 1
+    assert verified_claims_cache_factory().metrics()["hits"] >= 2  # noqa: PLR2004
+
+
+@patch("src.api.auth.routes.jwt.decode")
+@patch("src.api.auth.routes.jwks_cache_factory")
+def test_decode_token_should_not_cache_invalid_tokens(
+    jwks_cache_factory_mock: MagicMock,  # noqa: ARG001
+    jwt_decode_mock: MagicMock,
+) -> None:
+    jwt_decode_mock.side_effect = jwt.exceptions.ExpiredSignatureError("Signature has expired")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            decode_token("token")
+
+    assert jwt_decode_mock.call_count == 2  # noqa: PLR2004
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import jwt
+import jwt.exceptions
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import PyJWKClient  # type: ignore[attr-defined]
+from jwt.algorithms import RSAAlgorithm
+
+from src.services.auth.jwks import JWKSCache
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from unittest.mock import MagicMock
+
+CERTS_URL = "https://test.eodatahub.org.uk/keycloak/realms/eodhp/protocol/openid-connect/certs"
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_key(kid: str) -> tuple[rsa.RSAPrivateKey, dict[str, Any]]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk |= {"kid": kid, "use": "sig", "alg": "RS256"}
+    return private_key, jwk
+
+
+def _token(private_key: rsa.RSAPrivateKey, kid: str) -> str:
+    return jwt.encode({"sub": "test"}, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture(name="timer")
+def timer_fixture() -> FakeTimer:
+    return FakeTimer()
+
+
+@pytest.fixture(name="cache")
+def cache_fixture(timer: FakeTimer) -> JWKSCache:
+    return JWKSCache(CERTS_URL, ttl=300, stale_ttl=3600, min_refresh_interval=10, timer=timer)
+
+
+@pytest.fixture(name="fetch_data")
+def fetch_data_fixture() -> Generator[MagicMock]:
+    with patch.object(PyJWKClient, "fetch_data") as fetch_data_mock:
+        yield fetch_data_mock
+
+
+def test_jwks_cache_should_fetch_keys_once_within_ttl(
+    cache: JWKSCache,
+    fetch_data: MagicMock,
+    timer: FakeTimer,
+) -> None:
+    private_key, jwk = _make_key("key-1")
+    fetch_data.return_value = {"keys": [jwk]}
+
+    for _ in range(5):
+        cache.get_signing_key_from_jwt(_token(private_key, "key-1"))
+        timer.now += 10
+
+    assert fetch_data.call_count == 1
+
+
+def test_jwks_cache_should_refresh_keys_after_ttl(
+    cache: JWKSCache,
+    fetch_data: MagicMock,
+    timer: FakeTimer,
+) -> None:
+    private_key, jwk = _make_key("key-1")
+    fetch_data.return_value = {"keys": [jwk]}
+
+    cache.get_signing_key_from_jwt(_token(private_key, "key-1"))
+    timer.now += 301
+    cache.get_signing_key_from_jwt(_token(private_key, "key-1"))
+
+    assert fetch_data.call_count == 2  # noqa: PLR2004
+
+
+def test_jwks_cache_should_force_refresh_on_unknown_kid(
+    cache: JWKSCache,
+    fetch_data: MagicMock,
+    timer: FakeTimer,
+) -> None:
+    old_private_key, old_jwk = _make_key("key-1")
+    new_private_key, new_jwk = _make_key("key-2")
+    fetch_data.side_effect = [{"keys": [old_jwk]}, {"keys": [old_jwk, new_jwk]}]
+
+    cache.get_signing_key_from_jwt(_token(old_private_key, "key-1"))
+    timer.now += 11
+    key = cache.get_signing_key_from_jwt(_token(new_private_key, "key-2"))
+
+    assert key.key_id == "key-2"
+    assert fetch_data.call_count == 2  # noqa: PLR2004
+
+
+def test_jwks_cache_should_rate_limit_forced_refreshes(
+    cache: JWKSCache,
+    fetch_data: MagicMock,
+) -> None:
+    private_key, jwk = _make_key("key-1")
+    fetch_data.return_value = {"keys": [jwk]}
+    cache.get_signing_key_from_jwt(_token(private_key, "key-1"))
+
+    for _ in range(3):
+        with pytest.raises(jwt.exceptions.PyJWKClientError):
+            cache.get_signing_key_from_jwt(_token(private_key, "i-dont-exist"))
+
+    assert fetch_data.call_count == 1
+
+
+def test_jwks_cache_should_serve_stale_keys_when_refresh_fails(
+    cache: JWKSCache,
+    fetch_data: MagicMock,
+    timer: FakeTimer,
+) -> None:
+    private_key, jwk = _make_key("key-1")
+    fetch_data.side_effect = [{"keys": [jwk]}, jwt.exceptions.PyJWKClientConnectionError("Keycloak is down")]
+
+    cache.get_signing_key_from_jwt(_token(private_key, "key-1"))
+    timer.now += 301
+    key = cache.get_signing_key_from_jwt(_token(private_key, "key-1"))
+
+    assert key.key_id == "key-1"
+    assert fetch_data.call_count == 2  # noqa: PLR2004
+
+
+def test_jwks_cache_should_raise_when_cached_keys_are_too_old(
+    cache: JWKSCache,
+    fetch_data: MagicMock,
+    timer: FakeTimer,
+) -> None:
+    private_key, jwk = _make_key("key-1")
+    fetch_data.side_effect = [{"keys": [jwk]}, jwt.exceptions.PyJWKClientConnectionError("Keycloak is down")]
+
+    cache.get_signing_key_from_jwt(_token(private_key, "key-1"))
+    timer.now += 3601
+
+    with pytest.raises(jwt.exceptions.PyJWKClientConnectionError):
+        cache.get_signing_key_from_jwt(_token(private_key, "key-1"))
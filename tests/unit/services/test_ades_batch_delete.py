@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+from starlette import status
+
+from src.services.ades.base_client import ErrorResponse
+from src.services.ades.client import ADESClient
+from src.utils.logging import get_logger
+from tests.fakes.http import FakeRequester, FakeResponse
+
+MAX_CONCURRENCY = 4
+JOBS = {
+    "jobs": [
+        {"jobID": f"job-{i}", "processID": "wf", "status": "failed", "created": "2025-01-01T00:00:00Z"}
+        for i in range(12)
+    ]
+    + [{"jobID": "keep", "processID": "wf", "status": "successful", "created": "2025-01-01T00:00:00Z"}]
+}
+
+
+def _client() -> ADESClient:
+    return ADESClient(
+        url="https://ades.test",
+        ogc_processes_api_path="ogc-api/processes",
+        ogc_jobs_api_path="ogc-api/jobs",
+        workspace="ws",
+        token="token",  # noqa: S106
+        logger=get_logger(__name__),
+    )
+
+
+async def test_batch_cancel_or_delete_jobs_should_delete_concurrently_and_report_failures() -> None:
+    running = 0
+    peak = 0
+
+    async def cancel_or_delete_job(_: ADESClient, job_id: str) -> tuple[ErrorResponse | None, Any]:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        if job_id == "job-3":
+            return ErrorResponse(code=status.HTTP_500_INTERNAL_SERVER_ERROR), None
+        if job_id == "job-4":
+            return ErrorResponse(code=status.HTTP_404_NOT_FOUND), None
+        return None, None
+
+    with (
+        patch.object(ADESClient, "_request", FakeRequester(FakeResponse(payload=JOBS))),
+        patch.object(ADESClient, "cancel_or_delete_job", cancel_or_delete_job),
+    ):
+        err, result = await _client().batch_cancel_or_delete_jobs(
+            stac_endpoint="https://stac.test",
+            remove_statuses=["failed"],
+            max_concurrency=MAX_CONCURRENCY,
+        )
+
+    assert err is None
+    assert result is not None
+    assert result.failed_ids == ["job-3"]
+    assert result.removed_ids == [f"job-{i}" for i in range(12) if i != 3]  # noqa: PLR2004
+    assert peak == MAX_CONCURRENCY
+
+
+async def test_batch_cancel_or_delete_jobs_should_return_error_when_nothing_was_removed() -> None:
+    async def cancel_or_delete_job(_: ADESClient, __: str) -> tuple[ErrorResponse | None, Any]:
+        await asyncio.sleep(0)
+        return ErrorResponse(code=status.HTTP_401_UNAUTHORIZED), None
+
+    with (
+        patch.object(ADESClient, "_request", FakeRequester(FakeResponse(payload=JOBS))),
+        patch.object(ADESClient, "cancel_or_delete_job", cancel_or_delete_job),
+    ):
+        err, result = await _client().batch_cancel_or_delete_jobs(
+            stac_endpoint="https://stac.test",
+            remove_statuses=["failed"],
+        )
+
+    assert result is None
+    assert err is not None
+    assert err.code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from starlette import status
+
+from src.services.ades.cache import (
+    CWLPackageCache,
+    ProcessRegistryCache,
+    TerminalJobCache,
+    cwl_fingerprint,
+    serialize_cwl,
+)
+from src.services.ades.client import ADESClient
+from src.utils.logging import get_logger
+from tests.fakes.ades import (
+    GET_JOB_FINISHED_STATUS_RESPONSE,
+    GET_JOB_IN_PROGRESS_STATUS_RESPONSE,
+    GET_JOB_RESULTS_RESPONSE,
+    GET_PROCESS_LIST_RESPONSE,
+)
+from tests.fakes.http import FakeRequester, FakeResponse
+
+KEY = ("https://ades.test", "ws")
+APP_SPEC = {"cwlVersion": "v1.0", "$graph": [{"class": "Workflow", "id": "wf"}]}
+REGISTER_RESPONSE = {"id": "wf", "version": "0.0.1"}
+CWL_HREF = "https://cwl.test/wf.cwl"
+CWL_TEXT = "cwlVersion: v1.0\n$graph:\n- class: Workflow\n  id: wf\n  doc: <<AC_TEST_PLACEHOLDER>>\n"
+
+
+def _client(
+    registry: ProcessRegistryCache | None = None,
+    terminal_jobs: TerminalJobCache | None = None,
+    cwl_packages: CWLPackageCache | None = None,
+) -> ADESClient:
+    return ADESClient(
+        url="https://ades.test",
+        ogc_processes_api_path="ogc-api/processes",
+        ogc_jobs_api_path="ogc-api/jobs",
+        workspace="ws",
+        token="token",  # noqa: S106
+        logger=get_logger(__name__),
+        process_registry=registry,
+        terminal_jobs=terminal_jobs,
+        cwl_packages=cwl_packages,
+    )
+
+
+def test_process_registry_should_return_none_for_unknown_workspace() -> None:
+    registry = ProcessRegistryCache(maxsize=10, ttl=60)
+
+    assert registry.contains(KEY, "echo") is None
+    registry.add(KEY, "echo")
+    assert registry.contains(KEY, "echo") is None
+
+
+def test_process_registry_should_apply_write_through_updates() -> None:
+    registry = ProcessRegistryCache(maxsize=10, ttl=60)
+    registry.reconcile(KEY, ["display"])
+
+    registry.add(KEY, "echo")
+    registry.discard(KEY, "display")
+
+    assert registry.contains(KEY, "echo") is True
+    assert registry.contains(KEY, "display") is False
+    registry.invalidate(KEY)
+    assert registry.contains(KEY, "echo") is None
+
+
+async def test_process_exists_should_list_processes_only_once() -> None:
+    registry = ProcessRegistryCache(maxsize=10, ttl=60)
+    requester = FakeRequester(FakeResponse(payload=GET_PROCESS_LIST_RESPONSE))
+
+    with patch.object(ADESClient, "_request", requester):
+        assert await _client(registry).process_exists("echo") == (None, True)
+        assert await _client(registry).process_exists("display") == (None, True)
+        assert await _client(registry).process_exists("missing") == (None, False)
+
+    assert len(requester.calls) == 1
+
+
+async def test_unregister_process_should_remove_process_from_registry() -> None:
+    registry = ProcessRegistryCache(maxsize=10, ttl=60)
+    registry.reconcile(KEY, ["echo", "display"])
+    requester = FakeRequester(FakeResponse(status=204))
+
+    with patch.object(ADESClient, "_request", requester):
+        assert await _client(registry).unregister_process("echo") is None
+        assert await _client(registry).process_exists("echo") == (None, False)
+
+    assert len(requester.calls) == 1
+
+
+async def test_unregister_process_failure_should_invalidate_registry() -> None:
+    registry = ProcessRegistryCache(maxsize=10, ttl=60)
+    registry.reconcile(KEY, ["echo"])
+    requester = FakeRequester(FakeResponse(status=500))
+
+    with patch.object(ADESClient, "_request", requester):
+        err = await _client(registry).unregister_process("echo")
+
+    assert err is not None
+    assert registry.contains(KEY, "echo") is None
+
+
+def test_cwl_fingerprint_should_not_depend_on_key_order() -> None:
+    reordered = {"$graph": [{"id": "wf", "class": "Workflow"}], "cwlVersion": "v1.0"}
+
+    assert cwl_fingerprint(APP_SPEC) == cwl_fingerprint(reordered)
+    assert cwl_fingerprint(APP_SPEC) != cwl_fingerprint({**APP_SPEC, "cwlVersion": "v1.2"})
+
+
+def test_serialize_cwl_should_keep_timestamps_and_reject_unsupported_types() -> None:
+    spec = {**APP_SPEC, "s:dateCreated": datetime.date(2025, 10, 1)}
+
+    assert b'"s:dateCreated":"2025-10-01"' in serialize_cwl(spec)
+    with pytest.raises(TypeError, match="set is not JSON serializable"):
+        serialize_cwl({**APP_SPEC, "s:keywords": {"ndvi"}})
+
+
+async def test_register_process_if_changed_should_skip_identical_definition() -> None:
+    registry = ProcessRegistryCache(maxsize=10, ttl=60)
+    requester = FakeRequester(
+        FakeResponse(status=403),
+        FakeResponse(status=201, payload=REGISTER_RESPONSE),
+        FakeResponse(payload=REGISTER_RESPONSE),
+    )
+
+    with patch.object(ADESClient, "_request", requester):
+        err, summary = await _client(registry).register_process_if_changed("wf", APP_SPEC)
+        assert err is None
+        assert summary is not None
+        assert await _client(registry).register_process_if_changed("wf", APP_SPEC) == (None, None)
+
+    # The deployed process is checked before skipping the registration
+    assert [method for method, _, _ in requester.calls] == ["DELETE", "POST", "GET"]
+    assert requester.calls[1][2]["data"] == serialize_cwl(APP_SPEC)
+
+
+@pytest.mark.parametrize(
+    "deployed",
+    [
+        FakeResponse(status=404),
+        FakeResponse(status=401, payload={"detail": "Unauthorized"}),
+        FakeResponse(status=429, payload={"detail": "Too many requests"}),
+        FakeResponse(status=503, payload="Service Unavailable"),
+        FakeResponse(payload={**REGISTER_RESPONSE, "version": "0.0.2"}),
+    ],
+)
+async def test_register_process_if_changed_should_register_again_process_changed_on_ades(
+    deployed: FakeResponse,
+) -> None:
+    registry = ProcessRegistryCache(maxsize=10, ttl=60)
+    registry.reconcile(KEY, [])
+    requester = FakeRequester(
+        FakeResponse(status=201, payload=REGISTER_RESPONSE),
+        deployed,
+        FakeResponse(status=204),
+        FakeResponse(status=201, payload=REGISTER_RESPONSE),
+    )
+
+    with patch.object(ADESClient, "_request", requester):
+        await _client(registry).register_process_if_changed("wf", APP_SPEC)
+        err, summary = await _client(registry).register_process_if_changed("wf", APP_SPEC)
+
+    assert err is None
+    assert summary is not None
+    assert [method for method, _, _ in requester.calls] == ["POST", "GET", "DELETE", "POST"]
+
+
+async def test_register_process_if_changed_should_replace_changed_definition() -> None:
+    registry = ProcessRegistryCache(maxsize=10, ttl=60)
+    registry.reconcile(KEY, [])
+    requester = FakeRequester(
+        FakeResponse(status=201, payload=REGISTER_RESPONSE),
+        FakeResponse(status=204),
+        FakeResponse(status=201, payload=REGISTER_RESPONSE),
+    )
+
+    with patch.object(ADESClient, "_request", requester):
+        await _client(registry).register_process_if_changed("wf", APP_SPEC)
+        err, summary = await _client(registry).register_process_if_changed("wf", {**APP_SPEC, "cwlVersion": "v1.2"})
+
+    assert err is None
+    assert summary is not None
+    # Known missing process is registered without unregistering it first
+    assert [method for method, _, _ in requester.calls] == ["POST", "DELETE", "POST"]
+
+
+async def test_reregister_process_should_replace_process_registered_under_id_override() -> None:
+    registry = ProcessRegistryCache(maxsize=10, ttl=60)
+    requester = FakeRequester(
+        FakeResponse(status=204),
+        FakeResponse(status=201, payload={**REGISTER_RESPONSE, "id": "land-cover-change"}),
+        FakeResponse(payload={**REGISTER_RESPONSE, "id": "land-cover-change"}),
+    )
+    download_mock = AsyncMock(return_value=(None, b"cwl"))
+
+    with patch.object(ADESClient, "_request", requester), patch.object(ADESClient, "_download_cwl", download_mock):
+        for _ in range(2):
+            err, _ = await _client(registry).reregister_process(
+                "lulc-change",
+                wf_registry={"lulc-change": {"cwl_href": "https://cwl.test/lulc-change.cwl"}},
+                wf_id_override_lookup={"lulc-change": "land-cover-change"},
+            )
+            assert err is None
+
+    download_mock.assert_awaited_with("https://cwl.test/lulc-change.cwl", "land-cover-change")
+    assert [(method, url) for method, url, _ in requester.calls] == [
+        ("DELETE", "https://ades.test/ws/ogc-api/processes/land-cover-change"),
+        ("POST", "https://ades.test/ws/ogc-api/processes"),
+        ("GET", "https://ades.test/ws/ogc-api/processes/land-cover-change"),
+    ]
+
+
+async def test_get_job_details_should_cache_only_terminal_jobs() -> None:
+    terminal_jobs = TerminalJobCache(maxsize=10)
+    requester = FakeRequester(
+        FakeResponse(payload=GET_JOB_IN_PROGRESS_STATUS_RESPONSE),
+        FakeResponse(payload=GET_JOB_FINISHED_STATUS_RESPONSE),
+    )
+    job_id = str(GET_JOB_FINISHED_STATUS_RESPONSE["jobID"])
+
+    with patch.object(ADESClient, "_request", requester):
+        for _ in range(3):
+            err, _ = await _client(terminal_jobs=terminal_jobs).get_job_details(job_id)
+            assert err is None
+        _, job = await _client(terminal_jobs=terminal_jobs).get_job_details(job_id)
+
+    assert job is not None
+    assert job.status == "successful"
+    # In progress job is fetched again, the finished one is served from cache afterwards
+    assert [method for method, _, _ in requester.calls] == ["GET", "GET"]
+
+
+async def test_get_job_results_should_be_served_from_cache_until_job_is_deleted() -> None:
+    terminal_jobs = TerminalJobCache(maxsize=10)
+    requester = FakeRequester(
+        FakeResponse(payload=GET_JOB_FINISHED_STATUS_RESPONSE),
+        FakeResponse(payload=GET_JOB_RESULTS_RESPONSE),
+        FakeResponse(payload=GET_JOB_FINISHED_STATUS_RESPONSE),
+        FakeResponse(payload=GET_JOB_RESULTS_RESPONSE),
+    )
+    job_id = str(GET_JOB_FINISHED_STATUS_RESPONSE["jobID"])
+
+    with patch.object(ADESClient, "_request", requester):
+        await _client(terminal_jobs=terminal_jobs).get_job_details(job_id)
+        for _ in range(3):
+            assert await _client(terminal_jobs=terminal_jobs).get_job_results(job_id) == (
+                None,
+                GET_JOB_RESULTS_RESPONSE,
+            )
+        await _client(terminal_jobs=terminal_jobs).cancel_or_delete_job(job_id)
+        await _client(terminal_jobs=terminal_jobs).get_job_results(job_id)
+
+    assert [(method, url.rsplit("/", 1)[-1]) for method, url, _ in requester.calls] == [
+        ("GET", job_id),
+        ("GET", "results"),
+        ("DELETE", job_id),
+        ("GET", "results"),
+    ]
+
+
+async def test_get_job_results_should_not_check_status_of_jobs_not_known_to_be_finished() -> None:
+    terminal_jobs = TerminalJobCache(maxsize=10)
+    requester = FakeRequester(
+        FakeResponse(payload=GET_JOB_RESULTS_RESPONSE),
+        FakeResponse(payload=GET_JOB_RESULTS_RESPONSE),
+    )
+    job_id = str(GET_JOB_FINISHED_STATUS_RESPONSE["jobID"])
+
+    with patch.object(ADESClient, "_request", requester):
+        for _ in range(2):
+            assert await _client(terminal_jobs=terminal_jobs).get_job_results(job_id) == (
+                None,
+                GET_JOB_RESULTS_RESPONSE,
+            )
+
+    # Only the results are requested and they are not cached without knowing the job finished
+    assert [(method, url.rsplit("/", 1)[-1]) for method, url, _ in requester.calls] == [
+        ("GET", "results"),
+        ("GET", "results"),
+    ]
+
+
+async def test_download_cwl_should_reuse_prepared_package_until_source_or_environment_changes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("AC_TEST_PLACEHOLDER", "first")
+    now = [0.0]
+    cwl_packages = CWLPackageCache(maxsize=10, max_age=60, timer=lambda: now[0])
+    requester = FakeRequester(
+        FakeResponse(payload=CWL_TEXT, headers={"ETag": '"v1"'}),
+        FakeResponse(status=304, payload=""),
+        FakeResponse(payload=CWL_TEXT, headers={"ETag": '"v1"'}),
+    )
+
+    with patch.object(ADESClient, "_request", requester):
+        _, first = await _client(cwl_packages=cwl_packages)._download_cwl(CWL_HREF, "wf-override")  # noqa: SLF001
+        _, fresh = await _client(cwl_packages=cwl_packages)._download_cwl(CWL_HREF, "wf-override")  # noqa: SLF001
+        now[0] = 61
+        _, revalidated = await _client(cwl_packages=cwl_packages)._download_cwl(CWL_HREF, "wf-override")  # noqa: SLF001
+        monkeypatch.setenv("AC_TEST_PLACEHOLDER", "second")
+        _, changed = await _client(cwl_packages=cwl_packages)._download_cwl(CWL_HREF, "wf-override")  # noqa: SLF001
+
+    assert first is not None
+    assert b"wf-override" in first
+    assert b"first" in first
+    assert fresh == revalidated == first
+    assert changed is not None
+    assert b"second" in changed
+    assert [kwargs.get("headers") for _, _, kwargs in requester.calls] == [{}, {"If-None-Match": '"v1"'}, {}]
+
+
+async def test_download_cwl_should_reject_files_over_max_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("src.services.ades.client.DOWNLOAD_MAX_SIZE", 10)
+    requester = FakeRequester(FakeResponse(payload=CWL_TEXT))
+
+    with patch.object(ADESClient, "_request", requester):
+        err, data = await _client()._download_cwl(CWL_HREF, None)  # noqa: SLF001
+
+    assert data is None
+    assert err is not None
+    assert err.code == status.HTTP_502_BAD_GATEWAY
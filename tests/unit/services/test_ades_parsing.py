@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+from pydantic import ValidationError
+
+from src.services.ades.parsing import parse_collection
+from src.services.ades.schemas import JobList, StatusCode
+from tests.fakes.ades import GET_JOB_FINISHED_STATUS_RESPONSE
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+def _job_list(*jobs: Mapping[str, object]) -> bytes:
+    return json.dumps({"jobs": list(jobs), "links": [], "numberTotal": len(jobs)}).encode()
+
+
+def test_parse_collection_should_build_same_response_in_both_modes() -> None:
+    body = _job_list(GET_JOB_FINISHED_STATUS_RESPONSE, {**GET_JOB_FINISHED_STATUS_RESPONSE, "jobID": "job-2"})
+
+    validated = parse_collection(JobList, body, "jobs")
+    trusted = parse_collection(JobList, body, "jobs", trusted=True)
+
+    assert trusted == validated
+    assert isinstance(trusted.jobs, list)
+    assert trusted.jobs[-1].status == StatusCode.successful
+    assert trusted.model_dump() == validated.model_dump()
+
+
+def test_parse_collection_should_validate_trusted_items() -> None:
+    body = _job_list(GET_JOB_FINISHED_STATUS_RESPONSE, {"jobID": "invalid"})
+
+    with pytest.raises(ValidationError):
+        parse_collection(JobList, body, "jobs", trusted=True)
+    with pytest.raises(ValidationError):
+        parse_collection(JobList, body, "jobs")
+
+
+def test_parse_collection_should_validate_malformed_trusted_response() -> None:
+    with pytest.raises(ValidationError):
+        parse_collection(JobList, b'{"jobs": {}, "links": []}', "jobs", trusted=True)
@@ -11,7 +11,11 @@ import pytest
 import yaml
 
 from src import consts
-from src.services.ades.client import override_id_in_cwl_if_necessary, replace_placeholders_in_cwl_file
+from src.services.ades.client import (
+    override_id_in_cwl_if_necessary,
+    prepare_cwl_package,
+    replace_placeholders_in_cwl_file,
+)
 from src.services.ades.factory import ades_client_factory
 
 if TYPE_CHECKING:
@@ -133,3 +137,18 @@ def test_id_override(tmp_cwl_file: Path) -> None:
         if obj["class"] == "Workflow":
             assert obj["id"] == override_id
             break
+
+
+def test_prepare_cwl_package_should_replace_placeholders_and_override_id(monkeypatch: MonkeyPatch) -> None:
+    # Arrange
+    monkeypatch.setenv("EODH__STAC_API_ENDPOINT", "https://test.eodatahub.org.uk/api/catalogue/stac")
+    override_id = str(uuid.uuid4())
+
+    # Act
+    package = prepare_cwl_package(TEST_CWL_FP.read_bytes(), override_id)
+
+    # Assert
+    assert not re.findall(r"<<([A-Za-z\-_ ]+)>>", package.data.decode("utf-8"))
+    assert ("EODH__STAC_API_ENDPOINT", "https://test.eodatahub.org.uk/api/catalogue/stac") in package.environment
+    data = yaml.safe_load(package.data)
+    assert next(obj for obj in data["$graph"] if obj["class"] == "Workflow")["id"] == override_id
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.core.settings import AdmissionSettings
+from src.services.admission import AdmissionRejectedError, SubmissionAdmission
+
+CONFIG = AdmissionSettings(rate=0.5, burst=2, max_concurrency=1, max_queued_per_workspace=2)
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _submit(admission: SubmissionAdmission, workspace: str, order: list[str], release: asyncio.Event) -> None:
+    async with admission.admit(workspace):
+        order.append(workspace)
+        await release.wait()
+
+
+async def _admit(admission: SubmissionAdmission, workspace: str) -> None:
+    async with admission.admit(workspace):
+        pass
+
+
+async def test_admission_should_reject_workspace_exceeding_its_rate() -> None:
+    timer = FakeTimer()
+    admission = SubmissionAdmission(CONFIG, timer=timer)
+
+    await _admit(admission, "ws-a")
+    await _admit(admission, "ws-a")
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        await _admit(admission, "ws-a")
+    assert exc_info.value.retry_after == 1 / CONFIG.rate
+
+    # Other workspaces have their own bucket and the bucket refills over time
+    await _admit(admission, "ws-b")
+    timer.now = 1 / CONFIG.rate
+    await _admit(admission, "ws-a")
+
+
+async def test_admission_should_serve_queued_workspaces_round_robin() -> None:
+    admission = SubmissionAdmission(CONFIG.model_copy(update={"burst": 10}))
+    order: list[str] = []
+    releases = [asyncio.Event() for _ in range(4)]
+
+    tasks = []
+    for workspace, release in zip(("ws-a", "ws-a", "ws-a", "ws-b"), releases, strict=True):
+        tasks.append(asyncio.create_task(_submit(admission, workspace, order, release)))
+        await asyncio.sleep(0)
+    assert admission.metrics()["queued"] == 3  # noqa: PLR2004
+    assert admission.metrics()["queued_workspaces"] == 2  # noqa: PLR2004
+
+    for release in releases:
+        release.set()
+    await asyncio.gather(*tasks)
+
+    # ws-b does not wait for the whole ws-a backlog
+    assert order == ["ws-a", "ws-a", "ws-b", "ws-a"]
+    assert admission.metrics()["in_flight"] == 0
+
+
+async def test_admission_should_reject_when_workspace_queue_is_full() -> None:
+    admission = SubmissionAdmission(CONFIG.model_copy(update={"burst": 10}))
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(_submit(admission, "ws-a", [], release)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError):
+        await _submit(admission, "ws-a", [], release)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert admission.metrics()["rejected"] == 1
+
+
+async def test_admission_should_not_take_tokens_of_submissions_rejected_by_full_queue() -> None:
+    timer = FakeTimer()
+    admission = SubmissionAdmission(CONFIG.model_copy(update={"burst": 4}), timer=timer)
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(_submit(admission, "ws-a", [], release)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    for _ in range(3):
+        with pytest.raises(AdmissionRejectedError):
+            await _submit(admission, "ws-a", [], release)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    # The last token of the burst is still available
+    await _admit(admission, "ws-a")
+
+
+async def test_admission_should_forget_cancelled_waiters() -> None:
+    admission = SubmissionAdmission(CONFIG.model_copy(update={"burst": 10}))
+    release = asyncio.Event()
+    running = asyncio.create_task(_submit(admission, "ws-a", [], release))
+    waiting = asyncio.create_task(_submit(admission, "ws-b", [], release))
+    await asyncio.sleep(0)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert admission.metrics()["queued"] == 0
+
+    release.set()
+    await running
+    assert admission.metrics()["in_flight"] == 0
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import aiohttp
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from src.core.settings import CircuitBreakerSettings
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+CONFIG = CircuitBreakerSettings(
+    window_size=4,
+    min_calls=4,
+    failure_rate_threshold=0.5,
+    slow_call_duration=1,
+    slow_call_rate_threshold=0.75,
+    open_duration=30,
+)
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(timer: FakeTimer) -> CircuitBreaker:
+    return CircuitBreaker("https://ades.test:443", CONFIG, timer=timer)
+
+
+def test_circuit_breaker_should_open_once_failure_rate_reaches_threshold() -> None:
+    breaker = _breaker(FakeTimer())
+
+    for failed in (False, True, False):
+        breaker.record(failed=failed, duration=0.1)
+    assert breaker.state == CircuitState.closed
+
+    breaker.record(failed=True, duration=0.1)
+    assert breaker.state == CircuitState.open
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.acquire()
+    assert exc_info.value.retry_after == CONFIG.open_duration
+
+
+def test_circuit_breaker_should_open_on_slow_calls() -> None:
+    breaker = _breaker(FakeTimer())
+
+    for duration in (0.1, 2, 2, 2):
+        breaker.record(failed=False, duration=duration)
+
+    assert breaker.state == CircuitState.open
+
+
+def test_circuit_breaker_should_let_single_probe_through_when_half_open() -> None:
+    timer = FakeTimer()
+    breaker = _breaker(timer)
+    for _ in range(4):
+        breaker.record(failed=True, duration=0.1)
+
+    timer.now = CONFIG.open_duration
+    assert breaker.state == CircuitState.half_open
+    assert breaker.acquire() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    breaker.record(failed=False, duration=0.1)
+    assert breaker.state == CircuitState.closed
+    assert breaker.acquire() is False
+
+
+def test_circuit_breaker_should_reopen_when_probe_fails() -> None:
+    timer = FakeTimer()
+    breaker = _breaker(timer)
+    for _ in range(4):
+        breaker.record(failed=True, duration=0.1)
+
+    timer.now = CONFIG.open_duration
+    breaker.acquire()
+    breaker.record(failed=True, duration=0.1)
+
+    assert breaker.state == CircuitState.open
+    assert breaker.metrics()["opened"] == 2  # noqa: PLR2004
+
+
+async def test_circuit_breaker_guard_should_record_connection_errors_and_responses() -> None:
+    breaker = _breaker(FakeTimer())
+
+    for _ in range(2):
+        with pytest.raises(aiohttp.ClientConnectionError):
+            async with breaker.guard():
+                raise aiohttp.ClientConnectionError
+    for status_code in (200, 503):
+        async with breaker.guard() as outcome:
+            outcome.responded(failed=status_code >= 500)  # noqa: PLR2004
+
+    assert breaker.state == CircuitState.open
+
+
+async def test_circuit_breaker_guard_should_ignore_errors_raised_before_response() -> None:
+    breaker = _breaker(FakeTimer())
+    msg = "boom"
+
+    with pytest.raises(ValueError, match=msg):
+        async with breaker.guard():
+            raise ValueError(msg)
+
+    assert breaker.metrics()["calls"] == 0
+
+
+@pytest.mark.parametrize(("status_code", "expected_state"), [(401, CircuitState.closed), (502, CircuitState.open)])
+async def test_circuit_breaker_guard_should_only_record_server_error_responses_as_failures(
+    status_code: int,
+    expected_state: CircuitState,
+) -> None:
+    breaker = _breaker(FakeTimer())
+    request_info = aiohttp.RequestInfo(URL("https://ades.test/jobs"), "GET", CIMultiDictProxy(CIMultiDict()))
+
+    # Responses raised by `raise_for_status`
+    for _ in range(CONFIG.window_size):
+        with pytest.raises(aiohttp.ClientResponseError):
+            async with breaker.guard():
+                raise aiohttp.ClientResponseError(request_info, (), status=status_code)
+
+    assert breaker.state == expected_state
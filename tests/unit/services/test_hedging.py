@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING
+
+import pytest
+
+from src.core.settings import HedgingSettings
+from src.services.hedging import Hedger
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+CONFIG = HedgingSettings(enabled=True, percentile=0.95, min_delay=0.01, window_size=10, min_samples=2, budget=0.5)
+
+
+class Attempts:
+    """Attempt factory whose n-th attempt responds after the n-th delay."""
+
+    def __init__(self, *delays: float, errors: tuple[bool, ...] = ()) -> None:
+        self.delays = list(delays)
+        self.errors = list(errors)
+        self.started: list[int] = []
+        self.closed: list[int] = []
+
+    def __call__(self) -> contextlib.AbstractAsyncContextManager[int]:
+        return self._attempt(len(self.started))
+
+    @contextlib.asynccontextmanager
+    async def _attempt(self, n: int) -> AsyncIterator[int]:
+        self.started.append(n)
+        try:
+            await asyncio.sleep(self.delays[n])
+            if n < len(self.errors) and self.errors[n]:
+                msg = f"attempt {n} failed"
+                raise ConnectionError(msg)
+            yield n
+        finally:
+            self.closed.append(n)
+
+
+def _hedger(*latencies: float) -> Hedger:
+    hedger = Hedger("https://ades.test:443 get_job_details", CONFIG)
+    for latency in latencies:
+        hedger.record(latency, hedged=False)
+    return hedger
+
+
+async def _run(
+    hedger: Hedger,
+    attempt: Callable[[], contextlib.AbstractAsyncContextManager[int]],
+    failed: Callable[[int], bool] | None = None,
+) -> int:
+    async with hedger.hedged(attempt, failed=failed) as value:
+        return value
+
+
+async def test_hedger_should_not_hedge_until_enough_samples_were_observed() -> None:
+    attempts = Attempts(0.05)
+
+    assert await _run(_hedger(0.01), attempts) == 0
+    assert attempts.started == [0]
+
+
+async def test_hedger_should_send_second_request_when_first_is_slow() -> None:
+    hedger = _hedger(0.01, 0.01)
+    attempts = Attempts(1, 0)
+
+    assert await _run(hedger, attempts) == 1
+    assert attempts.started == [0, 1]
+    # The losing attempt is cancelled and cleaned up
+    assert sorted(attempts.closed) == [0, 1]
+    assert hedger.metrics()["hedge_wins"] == 1
+
+
+async def test_hedger_should_keep_first_response_when_it_arrives_before_delay() -> None:
+    attempts = Attempts(0, 1)
+
+    assert await _run(_hedger(0.05, 0.05), attempts) == 0
+    assert attempts.started == [0]
+
+
+async def test_hedger_should_fall_back_to_other_attempt_when_one_fails() -> None:
+    attempts = Attempts(0.05, 0.1, errors=(True, False))
+
+    assert await _run(_hedger(0.01, 0.01), attempts) == 1
+
+
+async def test_hedger_should_not_let_failed_response_win() -> None:
+    hedger = _hedger(0.01, 0.01)
+    attempts = Attempts(0.05, 0.1)
+
+    # The first attempt responds first, but with an error response
+    assert await _run(hedger, attempts, failed=lambda n: n == 0) == 1
+    assert sorted(attempts.closed) == [0, 1]
+    assert hedger.metrics()["hedge_wins"] == 1
+
+
+async def test_hedger_should_return_first_response_when_all_responses_failed() -> None:
+    attempts = Attempts(0.05, 0.1)
+
+    assert await _run(_hedger(0.01, 0.01), attempts, failed=lambda _: True) == 0
+
+
+async def test_hedger_should_raise_first_error_when_all_attempts_fail() -> None:
+    attempts = Attempts(0.05, 0.05, errors=(True, True))
+
+    with pytest.raises(ConnectionError, match="attempt 0 failed"):
+        await _run(_hedger(0.01, 0.01), attempts)
+
+
+def test_hedger_should_be_disabled_by_default() -> None:
+    hedger = Hedger("https://ades.test:443 get_job_details", HedgingSettings())
+    for _ in range(HedgingSettings().min_samples):
+        hedger.record(0.01, hedged=False)
+
+    assert hedger.delay() is None
+
+
+def test_hedger_should_respect_budget() -> None:
+    hedger = _hedger(0.01, 0.01)
+    hedger.record(0.01, hedged=True)
+
+    assert hedger.delay() is not None
+    hedger.record(0.01, hedged=True)
+    assert hedger.delay() is None
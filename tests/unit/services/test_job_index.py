@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+from src.services.ades.client import ADESClient
+from src.services.ades.job_index import JobIndexStore, WorkspaceJobIndex
+from src.utils.logging import get_logger
+from tests.fakes.http import FakeRequester, FakeResponse
+
+
+def _job(job_id: str, status: str, created: str | None, process_id: str = "wf") -> dict[str, Any]:
+    return {"jobID": job_id, "processID": process_id, "type": "process", "status": status, "created": created}
+
+
+JOBS = [
+    _job("a", "successful", "2024-10-01T10:00:00Z"),
+    _job("b", "running", "2024-10-03T10:00:00Z"),
+    _job("c", "failed", None),
+]
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _store() -> JobIndexStore:
+    return JobIndexStore(
+        maxsize=10,
+        full_sync_interval=300,
+        refresh_interval=5,
+        max_jobs=100,
+        refresh_concurrency=2,
+    )
+
+
+def _client(store: JobIndexStore) -> ADESClient:
+    return ADESClient(
+        url="https://ades.test",
+        ogc_processes_api_path="ogc-api/processes",
+        ogc_jobs_api_path="ogc-api/jobs",
+        workspace="ws",
+        token="token",  # noqa: S106
+        logger=get_logger(__name__),
+        job_index=store,
+    )
+
+
+def test_job_index_should_sort_and_filter_jobs() -> None:
+    index = WorkspaceJobIndex(JOBS)
+
+    assert [job["job_id"] for job in index.query("submitted_at")] == ["a", "b", "c"]
+    assert [job["job_id"] for job in index.query("submitted_at", descending=True)] == ["c", "b", "a"]
+    assert [job["job_id"] for job in index.query("job_id", statuses=["failed", "running"])] == ["b", "c"]
+    assert index.query("job_id")[0]["successful"] is True
+
+
+def test_job_index_should_drop_sorted_views_on_change() -> None:
+    index = WorkspaceJobIndex(JOBS)
+    view = index.sorted("job_id")
+
+    assert index.sorted("job_id") is view
+    index.upsert(_job("b", "running", "2024-10-03T10:00:00Z"))
+    assert index.sorted("job_id") is view
+
+    index.upsert(_job("b", "successful", "2024-10-05T10:00:00Z"))
+    assert index.sorted("job_id") is not view
+    # Submission time of the already known job is preserved
+    assert index.query("job_id")[1]["submitted_at"] == "2024-10-03T10:00:00Z"
+
+    index.remove("a")
+    assert [job["job_id"] for job in index.sorted("job_id")] == ["b", "c"]
+
+
+def test_job_index_should_need_refresh_only_with_pending_jobs() -> None:
+    clock = _Clock()
+    index = WorkspaceJobIndex(JOBS, timer=clock)
+
+    assert not index.needs_refresh(5)
+    clock.now = 5
+    assert index.needs_refresh(5)
+    assert index.pending_job_ids() == ["b"]
+
+    index.upsert(_job("b", "successful", "2024-10-03T10:00:00Z"))
+    assert not index.needs_refresh(5)
+
+
+async def test_get_job_index_should_list_jobs_once_and_refresh_pending_jobs_only() -> None:
+    store = _store()
+    requester = FakeRequester(
+        FakeResponse(payload={"jobs": JOBS}),
+        FakeResponse(payload=_job("b", "successful", "2024-10-03T10:00:00Z")),
+    )
+
+    with patch.object(ADESClient, "_request", requester):
+        err, index = await _client(store).get_job_index()
+        assert err is None
+        assert index is not None
+        assert (await _client(store).get_job_index())[1] is index
+
+        index.refreshed_at -= 5
+        await _client(store).get_job_index()
+
+    assert [url for _, url, _ in requester.calls] == [
+        "https://ades.test/ws/ogc-api/jobs?limit=100&skip=0",
+        "https://ades.test/ws/ogc-api/jobs/b",
+    ]
+    assert index.pending_job_ids() == []
+
+
+async def test_job_changes_should_be_written_through_to_job_index() -> None:
+    store = _store()
+    requester = FakeRequester(
+        FakeResponse(payload={"jobs": JOBS}),
+        FakeResponse(status=201, payload=_job("d", "accepted", "2024-10-04T10:00:00Z")),
+        FakeResponse(payload=_job("a", "dismissed", "2024-10-01T10:00:00Z")),
+    )
+
+    with patch.object(ADESClient, "_request", requester):
+        _, index = await _client(store).get_job_index()
+        await _client(store).execute_process("wf", {"inputs": {}})
+        await _client(store).cancel_or_delete_job("a")
+
+    assert index is not None
+    assert [job["job_id"] for job in index.query("submitted_at", descending=True)] == ["c", "d", "b"]
+
+
+async def test_stream_job_submissions_should_filter_and_project_jobs() -> None:
+    requester = FakeRequester(FakeResponse(payload={"jobs": JOBS, "numberTotal": len(JOBS)}))
+
+    with patch.object(ADESClient, "_request", requester):
+        async with _client(_store()).stream_job_submissions(statuses=["failed", "running"]) as (err, records):
+            assert err is None
+            assert records is not None
+            jobs = [record async for record in records]
+
+    assert [(job["job_id"], job["successful"]) for job in jobs] == [("b", None), ("c", False)]
+
+
+async def test_stream_job_submissions_should_return_error_response() -> None:
+    requester = FakeRequester(FakeResponse(status=500, payload={"detail": "boom"}))
+
+    with patch.object(ADESClient, "_request", requester):
+        async with _client(_store()).stream_job_submissions() as (err, records):
+            assert err is not None
+            assert records is None
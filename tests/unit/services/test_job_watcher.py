@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock
+
+from src.services.ades.base_client import ErrorResponse
+from src.services.ades.job_index import WorkspaceJobIndex
+from src.services.ades.watcher import JobStatusEvent, JobStatusWatcher
+
+
+def _job(job_id: str, status: str) -> dict[str, Any]:
+    return {"jobID": job_id, "processID": "wf", "type": "process", "status": status, "created": "2024-10-01T10:00:00Z"}
+
+
+class _FakeADES:
+    def __init__(self, index: WorkspaceJobIndex) -> None:
+        self.index = index
+        self.err: ErrorResponse | None = None
+        self.calls = 0
+
+    async def get_job_index(self) -> tuple[ErrorResponse | None, WorkspaceJobIndex | None]:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.err, None if self.err else self.index
+
+
+async def _next(queue: asyncio.Queue[JobStatusEvent]) -> JobStatusEvent:
+    return await asyncio.wait_for(queue.get(), timeout=1)
+
+
+async def test_watcher_should_poll_once_per_workspace_and_push_changes() -> None:
+    ades = _FakeADES(WorkspaceJobIndex([_job("a", "running"), _job("b", "successful")]))
+    provider = AsyncMock(return_value=ades)
+
+    watcher = JobStatusWatcher(poll_interval=0.01, queue_size=10)
+
+    async with (
+        watcher.subscribe("ws", provider) as everything,
+        watcher.subscribe("ws", provider, job_ids=["b"]) as only_b,
+    ):
+        # Snapshots - active jobs for workspace wide subscriptions, requested jobs otherwise
+        assert (await _next(everything)).job["job_id"] == "a"  # type: ignore[index]
+        assert (await _next(only_b)).job["job_id"] == "b"  # type: ignore[index]
+        assert watcher.metrics()["workspaces"] == 1
+        assert watcher.metrics()["subscribers"] == len([everything, only_b])
+
+        ades.index.upsert(_job("a", "successful"))
+        event = await _next(everything)
+        assert event.job is not None
+        assert (event.job["job_id"], event.job["status"]) == ("a", "successful")
+        assert only_b.empty()
+
+        polls = watcher.metrics()["polls"]
+        await asyncio.sleep(0.05)
+        assert ades.calls == watcher.metrics()["polls"] > polls
+        assert everything.empty()
+
+    assert watcher.metrics() == {"workspaces": 0, "subscribers": 0, "polls": ades.calls}
+    await asyncio.sleep(0.05)
+    # Poll loop is stopped once the last subscriber leaves
+    assert watcher.metrics()["polls"] == ades.calls
+
+
+async def test_watcher_should_push_errors_and_snapshot_to_late_subscribers() -> None:
+    ades = _FakeADES(WorkspaceJobIndex([_job("a", "running")]))
+    provider = AsyncMock(return_value=ades)
+
+    watcher = JobStatusWatcher(poll_interval=0.01, queue_size=10)
+
+    async with watcher.subscribe("ws", provider) as first:
+        await _next(first)
+        async with watcher.subscribe("ws", provider) as second:
+            assert (await _next(second)).job["job_id"] == "a"  # type: ignore[index]
+
+            ades.err = ErrorResponse(code=502, detail="boom")
+            assert (await _next(second)).error == ades.err
+
+
+async def test_watcher_should_add_jobs_to_subscriptions() -> None:
+    ades = _FakeADES(WorkspaceJobIndex([_job("a", "running"), _job("b", "running")]))
+    provider = AsyncMock(return_value=ades)
+
+    watcher = JobStatusWatcher(poll_interval=0.01, queue_size=10)
+
+    async with watcher.subscribe("ws", provider, job_ids=["a"]) as only_a:
+        assert (await _next(only_a)).job["job_id"] == "a"  # type: ignore[index]
+
+        watcher.watch_jobs("ws", only_a, ["b"])
+        assert (await _next(only_a)).job["job_id"] == "b"  # type: ignore[index]
+
+        ades.index.upsert(_job("b", "successful"))
+        event = await _next(only_a)
+        assert event.job is not None
+        assert (event.job["job_id"], event.job["status"]) == ("b", "successful")
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+
+from src.core.settings import HttpClientSettings
+from src.services.session_pool import ClientSessionPool
+
+
+async def test_session_pool_should_reuse_session_per_origin() -> None:
+    pool = ClientSessionPool(HttpClientSettings())
+
+    first = pool.get("https://ades.example.com/ws/processes")
+    second = pool.get("https://ades.example.com/ws/jobs?limit=10")
+    other = pool.get("https://stac.example.com/search")
+
+    assert first is second
+    assert first is not other
+    assert pool.metrics()["sessions"] == 2  # noqa: PLR2004
+
+    await pool.close()
+
+    assert first.closed
+    assert other.closed
+    assert pool.metrics()["sessions"] == 0
+
+
+async def test_session_pool_should_recreate_closed_sessions() -> None:
+    pool = ClientSessionPool(HttpClientSettings())
+
+    first = pool.get("https://ades.example.com")
+    await first.close()
+    second = pool.get("https://ades.example.com")
+
+    assert second is not first
+    assert not second.closed
+    await pool.close()
+
+
+def test_session_pool_should_not_share_sessions_between_event_loops() -> None:
+    pool = ClientSessionPool(HttpClientSettings())
+
+    async def get_session() -> object:
+        await asyncio.sleep(0)
+        return pool.get("https://ades.example.com")
+
+    first = asyncio.run(get_session())
+    second = asyncio.run(get_session())
+
+    assert first is not second
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from src.core.settings import AdmissionSettings
+from src.services.ades.base_client import ErrorResponse
+from src.services.ades.submissions import Submission, SubmissionPipeline, SubmissionState, SubmissionStore
+from src.services.admission import SubmissionAdmission
+from src.utils.logging import get_logger
+from tests.fakes.ades import EXECUTE_PROCESS_RESPONSE, FakeADESClient
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from src.services.ades.schemas import ProcessSummary, StatusInfo
+
+WORKSPACE = "test-workspace"
+
+
+class GatedADESClient(FakeADESClient):
+    """Fake ADES client whose process registration waits until released."""
+
+    def __init__(self, register_error: ErrorResponse | None = None) -> None:
+        super().__init__(url="https://fake.ades.com/api", logger=get_logger("fake_ades"))
+        self.release = asyncio.Event()
+        self.registering = asyncio.Event()
+        self.register_error = register_error
+        self.executed: list[str] = []
+
+    async def register_process_if_changed(
+        self,
+        process_identifier: str,
+        cwl: dict[str, Any] | bytes,
+    ) -> tuple[ErrorResponse | None, ProcessSummary | None]:
+        self.registering.set()
+        await self.release.wait()
+        if self.register_error is not None:
+            return self.register_error, None
+        return await super().register_process_if_changed(process_identifier, cwl)
+
+    async def execute_process(
+        self,
+        process_identifier: str,
+        process_inputs: dict[str, Any],
+    ) -> tuple[ErrorResponse | None, StatusInfo | None]:
+        self.executed.append(process_identifier)
+        return await super().execute_process(process_identifier, process_inputs)
+
+
+def _store(database: str = ":memory:", timer: Callable[[], float] = time.time) -> SubmissionStore:
+    return SubmissionStore(database, retention=3600, stale_after=60, timer=timer)
+
+
+def _pipeline(max_concurrency: int = 10, store: SubmissionStore | None = None) -> SubmissionPipeline:
+    return SubmissionPipeline(
+        store or _store(),
+        SubmissionAdmission(AdmissionSettings(max_concurrency=max_concurrency)),
+    )
+
+
+async def test_pipeline_should_return_queued_submission_before_registering_workflow() -> None:
+    pipeline = _pipeline()
+    ades = GatedADESClient()
+
+    submission = await pipeline.submit(ades, WORKSPACE, "wf", {}, {})
+    await ades.registering.wait()
+
+    assert submission.state == SubmissionState.queued
+    assert submission.job_id is None
+    assert await pipeline.get(submission.submission_id, WORKSPACE) == submission
+    assert await pipeline.get(submission.submission_id, "other-workspace") is None
+
+    ades.release.set()
+    submitted = await pipeline.wait(submission.submission_id, WORKSPACE, poll_interval=0.01)
+
+    assert submitted is not None
+    assert submitted.state == SubmissionState.submitted
+    assert submitted.job_id == EXECUTE_PROCESS_RESPONSE["jobID"]
+    assert await pipeline.local_ids([submitted.job_id, "other-job"], WORKSPACE) == {
+        submitted.job_id: submission.submission_id
+    }
+    assert await pipeline.unresolved(WORKSPACE) == []
+    assert pipeline.metrics() == {"in_progress": 0, "submitted": 1, "failed": 0, "cancelled": 0}
+
+
+async def test_pipeline_should_record_ades_errors() -> None:
+    pipeline = _pipeline()
+    ades = GatedADESClient(register_error=ErrorResponse(code=400, detail="Invalid CWL"))
+    ades.release.set()
+
+    submission = await pipeline.submit(ades, WORKSPACE, "wf", {}, {})
+    failed = await pipeline.wait(submission.submission_id, WORKSPACE, poll_interval=0.01)
+
+    assert failed is not None
+    assert failed.state == SubmissionState.failed
+    assert failed.error == ErrorResponse(code=400, detail="Invalid CWL")
+    assert failed.job_record()["status"] == "failed"
+    assert await pipeline.unresolved(WORKSPACE) == [failed]
+    assert ades.executed == []
+    assert pipeline.metrics()["failed"] == 1
+
+
+async def test_pipeline_should_cancel_queued_submissions_and_complete_admitted_ones() -> None:
+    pipeline = _pipeline(max_concurrency=1)
+    ades = GatedADESClient()
+    running = await pipeline.submit(ades, WORKSPACE, "wf-1", {}, {})
+    waiting = await pipeline.submit(ades, WORKSPACE, "wf-2", {}, {})
+    queued = await pipeline.submit(ades, WORKSPACE, "wf-3", {}, {})
+    await ades.registering.wait()
+
+    cancelled = await pipeline.cancel(waiting.submission_id, WORKSPACE)
+    ades.release.set()
+    await pipeline.close()
+
+    # The submission still waiting for its turn is dropped, the one talking to ADES is executed
+    assert cancelled is not None
+    assert cancelled.job_id is None
+    assert await pipeline.get(waiting.submission_id, WORKSPACE) is None
+    assert (await pipeline.get(queued.submission_id, WORKSPACE)).state == SubmissionState.cancelled  # type: ignore[union-attr]
+    assert (await pipeline.get(running.submission_id, WORKSPACE)).state == SubmissionState.submitted  # type: ignore[union-attr]
+    assert ades.executed == ["wf-1"]
+    assert pipeline.metrics() == {"in_progress": 0, "submitted": 1, "failed": 0, "cancelled": 2}
+    assert pipeline.admission.metrics()["in_flight"] == 0
+
+
+async def test_pipeline_should_resolve_submissions_made_by_other_workers(tmp_path: Path) -> None:
+    database = str(tmp_path / "submissions.db")
+    pipeline = _pipeline(store=_store(database))
+    ades = GatedADESClient()
+    ades.release.set()
+    submission = await pipeline.submit(ades, WORKSPACE, "wf", {}, {})
+    await pipeline.wait(submission.submission_id, WORKSPACE, poll_interval=0.01)
+
+    other_worker = _pipeline(store=_store(database))
+
+    resolved = await other_worker.get(submission.submission_id, WORKSPACE)
+    assert resolved is not None
+    assert resolved.job_id == EXECUTE_PROCESS_RESPONSE["jobID"]
+    assert await other_worker.local_ids([resolved.job_id], WORKSPACE) == {resolved.job_id: submission.submission_id}
+
+
+def test_store_should_report_submissions_left_queued_as_failed() -> None:
+    now = time.time()
+    store = _store(timer=lambda: now)
+    submission = Submission(
+        submission_id="local-id",
+        workspace=WORKSPACE,
+        workflow_identifier="wf",
+        submitted_at=datetime.fromtimestamp(now, UTC),
+    )
+    store.add(submission)
+    assert store.get_many(WORKSPACE, ["local-id"])["local-id"].state == SubmissionState.queued
+
+    now += 61
+
+    # The worker that accepted the submission is gone
+    lost = store.get_many(WORKSPACE, ["local-id"])["local-id"]
+    assert lost.state == SubmissionState.failed
+    assert lost.error is not None
+    assert lost.error.code == 500  # noqa: PLR2004
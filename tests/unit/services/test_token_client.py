@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+from unittest.mock import AsyncMock, patch
+
+import jwt
+
+from src.services.ades.base_client import ErrorResponse
+from src.services.ades.token_client import WorkspaceScopedTokenClient, WorkspaceTokenResponse
+from src.utils.cache import TTLCache
+from src.utils.logging import get_logger
+from tests.fakes.http import FakeRequester, FakeResponse
+
+
+def _token_response(access: str, expires_in: float) -> WorkspaceTokenResponse:
+    now = dt.datetime.now(tz=dt.UTC)
+    return WorkspaceTokenResponse(
+        access=access,
+        accessExpiry=now + dt.timedelta(seconds=expires_in),
+        refresh=f"{access}-refresh",
+        refreshExpiry=now + dt.timedelta(seconds=expires_in * 2),
+        scope="openid workspaces",
+    )
+
+
+TCache = TTLCache[tuple[str, str, str, str], WorkspaceTokenResponse]
+EXPECTED_SESSION_CALLS = 2
+
+
+def _client(cache: TCache, identity: str = "sub-1") -> WorkspaceScopedTokenClient:
+    return WorkspaceScopedTokenClient(
+        url="http://workspaces",
+        workspace="ws",
+        token=f"user-token-{identity}",
+        logger=get_logger(__name__),
+        identity=identity,
+        refresh_url="http://keycloak/token",
+        refresh_margin=60,
+        min_validity=10,
+        cache=cache,
+    )
+
+
+async def test_get_token_should_reuse_cached_token_until_expiry() -> None:
+    cache: TCache = TTLCache(maxsize=10)
+    create_mock = AsyncMock(return_value=(None, _token_response("a1", 300)))
+
+    with patch.object(WorkspaceScopedTokenClient, "_create_session", create_mock):
+        _, first = await _client(cache).get_token()
+        _, second = await _client(cache).get_token()
+
+    assert first is not None
+    assert second is first
+    create_mock.assert_awaited_once_with("me")
+
+
+async def test_get_token_should_not_share_tokens_between_identities() -> None:
+    cache: TCache = TTLCache(maxsize=10)
+    create_mock = AsyncMock(side_effect=[(None, _token_response("a1", 300)), (None, _token_response("b1", 300))])
+
+    with patch.object(WorkspaceScopedTokenClient, "_create_session", create_mock):
+        _, first = await _client(cache, "sub-1").get_token()
+        _, second = await _client(cache, "sub-2").get_token()
+
+    assert first.access == "a1"  # type: ignore[union-attr]
+    assert second.access == "b1"  # type: ignore[union-attr]
+
+
+async def test_get_token_should_refresh_in_background_near_expiry() -> None:
+    cache: TCache = TTLCache(maxsize=10)
+    client = _client(cache)
+    create_mock = AsyncMock(return_value=(None, _token_response("a1", 30)))
+    refresh_mock = AsyncMock(return_value=(None, _token_response("a2", 300)))
+
+    with (
+        patch.object(WorkspaceScopedTokenClient, "_create_session", create_mock),
+        patch.object(WorkspaceScopedTokenClient, "_refresh_session", refresh_mock),
+    ):
+        await client.get_token()
+        _, served = await client.get_token()
+        _, served_again = await client.get_token()
+        await asyncio.sleep(0)
+        _, refreshed = await client.get_token()
+
+    assert served.access == "a1"  # type: ignore[union-attr]
+    assert served_again.access == "a1"  # type: ignore[union-attr]
+    assert refreshed.access == "a2"  # type: ignore[union-attr]
+    refresh_mock.assert_awaited_once()
+    create_mock.assert_awaited_once()
+
+
+async def test_get_token_should_fall_back_to_new_session_when_refresh_fails() -> None:
+    cache: TCache = TTLCache(maxsize=10)
+    client = _client(cache)
+    create_mock = AsyncMock(side_effect=[(None, _token_response("a1", 30)), (None, _token_response("a2", 300))])
+    refresh_mock = AsyncMock(return_value=(ErrorResponse(code=400, detail="invalid_grant"), None))
+
+    with (
+        patch.object(WorkspaceScopedTokenClient, "_create_session", create_mock),
+        patch.object(WorkspaceScopedTokenClient, "_refresh_session", refresh_mock),
+    ):
+        await client.get_token()
+        await client.get_token()
+        await asyncio.sleep(0)
+        _, token = await client.get_token()
+
+    assert token.access == "a2"  # type: ignore[union-attr]
+    assert create_mock.await_count == EXPECTED_SESSION_CALLS
+
+
+async def test_get_token_should_create_new_session_once_refresh_age_is_exceeded() -> None:
+    cache: TCache = TTLCache(maxsize=10)
+    client = _client(cache)
+    session = _token_response("a1", 30)
+    session.authorized_at -= dt.timedelta(seconds=client.max_refresh_age)
+    create_mock = AsyncMock(side_effect=[(None, session), (None, _token_response("a2", 300))])
+    refresh_mock = AsyncMock(return_value=(None, _token_response("a3", 300)))
+
+    with (
+        patch.object(WorkspaceScopedTokenClient, "_create_session", create_mock),
+        patch.object(WorkspaceScopedTokenClient, "_refresh_session", refresh_mock),
+    ):
+        await client.get_token()
+        await client.get_token()
+        await asyncio.sleep(0)
+        _, token = await client.get_token()
+
+    # Workspace membership is re-checked by creating a new session instead of refreshing the old one
+    assert token.access == "a2"  # type: ignore[union-attr]
+    assert create_mock.await_count == EXPECTED_SESSION_CALLS
+    refresh_mock.assert_not_awaited()
+
+
+async def test_refresh_session_should_keep_time_of_session_authorization() -> None:
+    session = _token_response("a1", 30)
+    session.refresh = jwt.encode({"azp": "workspaces-client"}, "secret", algorithm="HS256")
+    session.authorized_at -= dt.timedelta(seconds=600)
+    requester = FakeRequester(FakeResponse(payload={"access_token": "a2", "expires_in": 300}))
+
+    with patch.object(WorkspaceScopedTokenClient, "_request", requester):
+        err, refreshed = await _client(TTLCache(maxsize=10))._refresh_session(session)  # noqa: SLF001
+
+    assert err is None
+    assert refreshed is not None
+    assert refreshed.access == "a2"
+    assert refreshed.authorized_at == session.authorized_at
+    assert requester.calls[0][2]["data"]["client_id"] == "workspaces-client"
+
+
+async def test_get_token_should_not_cache_errors() -> None:
+    cache: TCache = TTLCache(maxsize=10)
+    client = _client(cache)
+    create_mock = AsyncMock(return_value=(ErrorResponse(code=401, detail="Unauthorized"), None))
+
+    with patch.object(WorkspaceScopedTokenClient, "_create_session", create_mock):
+        await client.get_token()
+        await client.get_token()
+
+    assert create_mock.await_count == EXPECTED_SESSION_CALLS
+    assert len(cache) == 0
+
+
+async def test_get_token_should_coalesce_concurrent_session_requests() -> None:
+    cache: TCache = TTLCache(maxsize=10)
+
+    async def create_session(*_: object) -> tuple[None, WorkspaceTokenResponse]:
+        await asyncio.sleep(0)
+        return None, _token_response("a1", 300)
+
+    create_mock = AsyncMock(side_effect=create_session)
+
+    with patch.object(WorkspaceScopedTokenClient, "_create_session", create_mock):
+        results = await asyncio.gather(*(_client(cache).get_token() for _ in range(5)))
+
+    assert {token.access for _, token in results} == {"a1"}  # type: ignore[union-attr]
+    create_mock.assert_awaited_once()
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import asyncio
+
+from src.utils.aio import gather_with_concurrency
+
+LIMIT = 3
+
+
+async def test_gather_with_concurrency_should_limit_running_awaitables_and_keep_order() -> None:
+    running = 0
+    peak = 0
+
+    async def work(i: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return i
+
+    results = await gather_with_concurrency(LIMIT, (work(i) for i in range(20)))
+
+    assert results == list(range(20))
+    assert peak == LIMIT
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+from src.utils.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(name="timer")
+def timer_fixture() -> FakeTimer:
+    return FakeTimer()
+
+
+def test_ttl_cache_should_return_stored_value(timer: FakeTimer) -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10, timer=timer)
+
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert "a" in cache
+    assert cache.stats.hits == 1
+
+
+def test_ttl_cache_should_expire_entries(timer: FakeTimer) -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10, timer=timer)
+
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=20)
+    timer.now += 15
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2  # noqa: PLR2004
+    assert cache.stats.expirations == 1
+    assert cache.stats.misses == 1
+
+
+def test_ttl_cache_should_evict_least_recently_used_entry(timer: FakeTimer) -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, timer=timer)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3  # noqa: PLR2004
+    assert cache.stats.evictions == 1
+
+
+def test_ttl_cache_should_not_store_already_expired_entries(timer: FakeTimer) -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, timer=timer)
+
+    cache.set("a", 1, ttl=-5)
+
+    assert len(cache) == 0
+
+
+def test_ttl_cache_metrics(timer: FakeTimer) -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, timer=timer)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.metrics() == {
+        "size": 1,
+        "maxsize": 2,
+        "hit_ratio": 0.5,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 0,
+    }
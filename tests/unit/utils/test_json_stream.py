@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from src.utils.json_stream import iter_json_array
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+DOCUMENT = {
+    "links": [{"rel": "self", "href": "https://ades.test/jobs?limit=2"}],
+    "numberTotal": 12345,
+    "jobs": [
+        {"jobID": "a", "status": "successful", "message": "Zażółć gęślą jaźń"},
+        {"jobID": "b", "status": "running", "progress": 15, "nested": {"items": [1, 2.5, None, True]}},
+        [],
+        'text with "quotes" and ] brackets',
+        42,
+    ],
+    "trailing": "ignored",
+}
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for i in range(0, len(data), size):
+        # Let other tasks run between chunks, as with a network stream
+        await asyncio.sleep(0)
+        yield data[i : i + size]
+
+
+async def _collect(data: bytes, key: str, size: int = 1) -> list[Any]:
+    return [item async for item in iter_json_array(_chunks(data, size), key)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1_000_000])
+async def test_iter_json_array_should_yield_all_items_regardless_of_chunk_size(chunk_size: int) -> None:
+    data = json.dumps(DOCUMENT, ensure_ascii=False, indent=2).encode("utf-8")
+
+    assert await _collect(data, "jobs", chunk_size) == DOCUMENT["jobs"]
+
+
+@pytest.mark.parametrize(
+    ("document", "expected"),
+    [
+        (b"{}", []),
+        (b'{"jobs": []}', []),
+        (b' { "other" : 1 } ', []),
+        (b'{"count": 1234, "jobs": [5678]}', [5678]),
+    ],
+)
+async def test_iter_json_array_should_handle_edge_cases(document: bytes, expected: list[Any]) -> None:
+    assert await _collect(document, "jobs") == expected
+
+
+@pytest.mark.parametrize("document", [b'{"jobs": [1, 2', b'{"jobs": {"a": 1}}', b"[]", b'{"jobs": [1 2]}'])
+async def test_iter_json_array_should_raise_on_malformed_input(document: bytes) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        await _collect(document, "jobs")
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.utils.singleflight import SingleFlight
+
+CONCURRENT_CALLERS = 5
+
+
+async def test_single_flight_should_coalesce_concurrent_calls() -> None:
+    flights: SingleFlight[str, int] = SingleFlight()
+    executions = 0
+    release = asyncio.Event()
+
+    async def fn() -> int:
+        nonlocal executions
+        executions += 1
+        await release.wait()
+        return 42
+
+    waiters = [asyncio.create_task(flights.do("key", fn)) for _ in range(CONCURRENT_CALLERS)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [42] * CONCURRENT_CALLERS
+    assert executions == 1
+    assert len(flights) == 0
+    assert flights.metrics()["coalesced"] == CONCURRENT_CALLERS - 1
+
+
+async def test_single_flight_should_not_coalesce_different_keys_or_sequential_calls() -> None:
+    flights: SingleFlight[str, str] = SingleFlight()
+
+    async def fn(value: str) -> str:
+        await asyncio.sleep(0)
+        return value
+
+    assert await asyncio.gather(flights.do("a", lambda: fn("a")), flights.do("b", lambda: fn("b"))) == ["a", "b"]
+    assert await flights.do("a", lambda: fn("c")) == "c"
+    assert flights.metrics()["coalesced"] == 0
+
+
+async def test_single_flight_should_propagate_errors_to_all_callers() -> None:
+    flights: SingleFlight[str, int] = SingleFlight()
+
+    async def fn() -> int:
+        await asyncio.sleep(0)
+        msg = "boom"
+        raise ValueError(msg)
+
+    results = await asyncio.gather(flights.do("key", fn), flights.do("key", fn), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+    with pytest.raises(ValueError, match="boom"):
+        await flights.do("key", fn)
+
+
+async def test_single_flight_should_not_cancel_shared_call_when_one_caller_is_cancelled() -> None:
+    flights: SingleFlight[str, int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def fn() -> int:
+        await release.wait()
+        return 1
+
+    first = asyncio.create_task(flights.do("key", fn))
+    second = asyncio.create_task(flights.do("key", fn))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == 1
+    assert first.cancelled()